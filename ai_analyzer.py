@@ -6,8 +6,22 @@ import base64
 from io import BytesIO
 import json
 
+from image_buffers import BufferPool
+from image_concurrency import image_job
+from style_pipeline import StylePipelines, cluster_colors
+from styles import STYLE_IDS
+
+# Scratch memory a filter chain may use before it runs strip by strip
+DEFAULT_MEMORY_BUDGET_MB = 256
+
 class AIAnalyzer:
-    def __init__(self):
+    def __init__(self, memory_budget=None):
+        if memory_budget is None:
+            memory_budget = int(float(os.environ.get('ARTAI_IMAGE_MEMORY_MB', DEFAULT_MEMORY_BUDGET_MB)) * 1024 * 1024)
+        self.memory_budget = memory_budget
+        # Intermediate arrays of the filter chains, reused from render to render
+        self.buffers = BufferPool(memory_budget)
+        
         # Analysis templates for different aspects
         self.composition_templates = {
             'rule_of_thirds': 'The composition follows the rule of thirds well, creating a balanced and visually appealing layout.',
@@ -60,12 +74,17 @@ class AIAnalyzer:
             'desert': ['#DEB887', '#F4A460', '#CD853F', '#D2691E', '#8B4513'],
             'neon': ['#FF1493', '#00FF00', '#00BFFF', '#FFD700', '#FF4500']
         }
+        
+        # Style and redraw filter chains, declared in styles.py
+        self.pipelines = StylePipelines(memory_budget, self.buffers)
 
-    def analyze_artwork(self, image_path):
-        """Analyze artwork and provide feedback"""
+    @image_job
+    def analyze_artwork(self, image_path, image=None):
+        """Analyze artwork and provide feedback; pass the decoded BGR image if it is already in memory"""
         try:
             # Load image
-            image = cv2.imread(image_path)
+            if image is None:
+                image = cv2.imread(image_path)
             if image is None:
                 return {
                     'score': 0,
@@ -113,20 +132,17 @@ class AIAnalyzer:
                 'tips': ['Please try uploading a different image.']
             }
 
-    def redraw_artwork(self, image_path):
-        """Apply artistic filters to create a redrawn version"""
+    @image_job
+    def redraw_artwork(self, image_path, max_side=None):
+        """Apply artistic filters to create a redrawn version, scaled down to max_side if given"""
         try:
             # Load image
-            image = cv2.imread(image_path)
+            image = self._load_image(image_path, max_side)
             if image is None:
                 return None, "Unable to load image for redrawing."
             
             # Apply artistic filters
-            redrawn_image = self._apply_artistic_filters(image)
-            
-            # Save redrawn image
-            output_path = image_path.replace('.', '_redrawn.')
-            cv2.imwrite(output_path, redrawn_image)
+            redrawn_image = self.pipelines.render(image, 'redraw')
             
             # Convert to base64 for display
             _, buffer = cv2.imencode('.jpg', redrawn_image)
@@ -137,33 +153,19 @@ class AIAnalyzer:
         except Exception as e:
             return None, f"Error during redrawing: {str(e)}"
 
-    def apply_style_transfer(self, image_path, style_name):
-        """Apply artistic style transfer to an image"""
+    @image_job
+    def apply_style_transfer(self, image_path, style_name, max_side=None):
+        """Apply artistic style transfer to an image, scaled down to max_side if given"""
         try:
             # Load image
-            image = cv2.imread(image_path)
+            image = self._load_image(image_path, max_side)
             if image is None:
                 return None, "Unable to load image for style transfer."
             
-            # Apply different artistic styles based on style_name
-            if style_name == 'van_gogh':
-                styled_image = self._apply_van_gogh_style(image)
-            elif style_name == 'picasso':
-                styled_image = self._apply_picasso_style(image)
-            elif style_name == 'monet':
-                styled_image = self._apply_monet_style(image)
-            elif style_name == 'dali':
-                styled_image = self._apply_dali_style(image)
-            elif style_name == 'watercolor':
-                styled_image = self._apply_watercolor_style(image)
-            elif style_name == 'oil_painting':
-                styled_image = self._apply_oil_painting_style(image)
-            elif style_name == 'sketch':
-                styled_image = self._apply_sketch_style(image)
-            elif style_name == 'anime':
-                styled_image = self._apply_anime_style(image)
-            else:
+            # Apply the artistic style named by style_name
+            if style_name not in STYLE_IDS:
                 return None, f"Unknown style: {style_name}"
+            styled_image = self.pipelines.render(image, style_name)
             
             # Convert to base64 for display
             _, buffer = cv2.imencode('.jpg', styled_image)
@@ -174,6 +176,70 @@ class AIAnalyzer:
         except Exception as e:
             return None, f"Error during style transfer: {str(e)}"
 
+    @image_job
+    def render_to_file(self, image_path, output_path, style_name=None):
+        """Render a style (the redraw filters if style_name is None) at full resolution into output_path"""
+        try:
+            image = cv2.imread(image_path)
+            if image is None:
+                return None, "Unable to load image for rendering."
+            
+            if style_name is None:
+                rendered = self.pipelines.render(image, 'redraw')
+            else:
+                if style_name not in STYLE_IDS:
+                    return None, f"Unknown style: {style_name}"
+                rendered = self.pipelines.render(image, style_name)
+            
+            if not cv2.imwrite(output_path, rendered, [cv2.IMWRITE_JPEG_QUALITY, 95]):
+                return None, "Unable to save the rendered image."
+            return output_path, "Full-resolution image ready."
+            
+        except Exception as e:
+            return None, f"Error during rendering: {str(e)}"
+
+    def _load_image(self, image_path, max_side=None):
+        """Load an image at full size, or scaled down for a preview"""
+        if max_side is None:
+            return cv2.imread(image_path)
+        return self.load_preview(image_path, max_side)
+
+    def load_preview(self, image_path, max_side=512):
+        """Load an image scaled down so its longer side is at most max_side"""
+        try:
+            with Image.open(image_path) as header:
+                longest = max(header.size)
+        except Exception:
+            return None
+        
+        # Let the JPEG decoder skip detail we would throw away anyway
+        flag = cv2.IMREAD_COLOR
+        for factor, reduced in ((8, cv2.IMREAD_REDUCED_COLOR_8), (4, cv2.IMREAD_REDUCED_COLOR_4),
+                                (2, cv2.IMREAD_REDUCED_COLOR_2)):
+            if longest // factor >= max_side:
+                flag = reduced
+                break
+        image = cv2.imread(image_path, flag)
+        if image is None:
+            return None
+        
+        scale = max_side / max(image.shape[:2])
+        if scale < 1:
+            image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        return image
+
+    @image_job
+    def style_preview(self, image, style_name):
+        """Render a style on an already loaded (preview-sized) image"""
+        if style_name not in STYLE_IDS:
+            return None, f"Unknown style: {style_name}"
+        try:
+            _, buffer = cv2.imencode('.jpg', self.pipelines.render(image, style_name), [cv2.IMWRITE_JPEG_QUALITY, 80])
+            img_base64 = base64.b64encode(buffer).decode('utf-8')
+            return img_base64, f"{style_name.replace('_', ' ').title()} preview"
+        except Exception as e:
+            return None, f"Error during style preview: {str(e)}"
+
     def _analyze_composition(self, image):
         """Analyze composition aspects"""
         height, width = image.shape[:2]
@@ -311,214 +377,7 @@ class AIAnalyzer:
         else:
             return "basic"
 
-    def _apply_artistic_filters(self, image):
-        """Apply artistic filters to create redrawn version"""
-        # Apply multiple filters for artistic effect
-        result = image.copy()
-        
-        # 1. Enhance contrast
-        lab = cv2.cvtColor(result, cv2.COLOR_BGR2LAB)
-        l, a, b = cv2.split(lab)
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
-        l = clahe.apply(l)
-        lab = cv2.merge([l, a, b])
-        result = cv2.cvtColor(lab, cv2.COLOR_LAB2BGR)
-        
-        # 2. Add slight blur for painterly effect
-        result = cv2.GaussianBlur(result, (3, 3), 0)
-        
-        # 3. Enhance saturation
-        hsv = cv2.cvtColor(result, cv2.COLOR_BGR2HSV)
-        hsv[:, :, 1] = cv2.multiply(hsv[:, :, 1], 1.2)  # Increase saturation
-        result = cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)
-        
-        # 4. Add subtle vignette effect
-        rows, cols = result.shape[:2]
-        kernel_x = cv2.getGaussianKernel(cols, cols/4)
-        kernel_y = cv2.getGaussianKernel(rows, rows/4)
-        kernel = kernel_y * kernel_x.T
-        mask = kernel / kernel.max()
-        
-        for i in range(3):
-            result[:, :, i] = result[:, :, i] * mask
-        
-        return result
-
-    def _apply_van_gogh_style(self, image):
-        """Apply Van Gogh swirling brush stroke style"""
-        # Blur the image slightly
-        blurred = cv2.GaussianBlur(image, (3, 3), 0)
-        
-        # Apply artistic edge enhancement
-        gray = cv2.cvtColor(blurred, cv2.COLOR_BGR2GRAY)
-        edges = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_MEAN_C, cv2.THRESH_BINARY, 7, 7)
-        edges = cv2.cvtColor(edges, cv2.COLOR_GRAY_BGR)
-        
-        # Create swirling effect
-        rows, cols = image.shape[:2]
-        center_x, center_y = cols // 2, rows // 2
-        
-        # Apply color enhancement (Van Gogh loved bold colors)
-        hsv = cv2.cvtColor(blurred, cv2.COLOR_BGR2HSV)
-        hsv[:,:,1] = cv2.multiply(hsv[:,:,1], 1.3)  # Increase saturation
-        hsv[:,:,2] = cv2.multiply(hsv[:,:,2], 1.1)  # Increase brightness
-        enhanced = cv2.cvtColor(hsv, cv2.COLOR_HSV_BGR)
-        
-        # Combine with edges for brush stroke effect
-        result = cv2.bitwise_and(enhanced, edges)
-        result = cv2.addWeighted(enhanced, 0.8, result, 0.2, 0)
-        
-        return result
-
-    def _apply_picasso_style(self, image):
-        """Apply Picasso cubist geometric style"""
-        # Convert to different color spaces for geometric effects
-        lab = cv2.cvtColor(image, cv2.COLOR_BGR2LAB)
-        
-        # Apply bilateral filter for cartoon-like effect
-        cartoon = cv2.bilateralFilter(image, 15, 80, 80)
-        
-        # Create geometric edges
-        gray = cv2.cvtColor(cartoon, cv2.COLOR_BGR2GRAY)
-        edges = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_MEAN_C, cv2.THRESH_BINARY, 9, 9)
-        edges = cv2.cvtColor(edges, cv2.COLOR_GRAY_BGR)
-        
-        # Apply color quantization for geometric color blocks
-        data = cartoon.reshape((-1, 3))
-        data = np.float32(data)
-        criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 8, 1.0)
-        _, labels, centers = cv2.kmeans(data, 8, None, criteria, 10, cv2.KMEANS_RANDOM_CENTERS)
-        centers = np.uint8(centers)
-        quantized = centers[labels.flatten()].reshape(cartoon.shape)
-        
-        # Combine quantized colors with edges
-        result = cv2.bitwise_and(quantized, edges)
-        result = cv2.addWeighted(quantized, 0.9, result, 0.1, 0)
-        
-        return result
-
-    def _apply_monet_style(self, image):
-        """Apply Monet impressionist style"""
-        # Apply Gaussian blur for soft impressionist effect
-        soft = cv2.GaussianBlur(image, (5, 5), 0)
-        
-        # Enhance colors for impressionist palette
-        hsv = cv2.cvtColor(soft, cv2.COLOR_BGR2HSV)
-        hsv[:,:,1] = cv2.multiply(hsv[:,:,1], 1.2)  # Increase saturation
-        hsv[:,:,2] = cv2.add(hsv[:,:,2], 20)  # Increase brightness
-        enhanced = cv2.cvtColor(hsv, cv2.COLOR_HSV_BGR)
-        
-        # Apply light impressionist texture
-        kernel = np.array([[-1,-1,-1], [-1,9,-1], [-1,-1,-1]])
-        sharpened = cv2.filter2D(enhanced, -1, kernel)
-        
-        # Blend for soft impressionist look
-        result = cv2.addWeighted(enhanced, 0.7, sharpened, 0.3, 0)
-        
-        return result
-
-    def _apply_watercolor_style(self, image):
-        """Apply watercolor painting style"""
-        # Apply multiple bilateral filters for watercolor effect
-        watercolor = image.copy()
-        for _ in range(3):
-            watercolor = cv2.bilateralFilter(watercolor, 9, 200, 200)
-        
-        # Create soft edges
-        gray = cv2.cvtColor(watercolor, cv2.COLOR_BGR2GRAY)
-        edges = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_MEAN_C, cv2.THRESH_BINARY, 7, 7)
-        edges = cv2.cvtColor(edges, cv2.COLOR_GRAY_BGR)
-        
-        # Apply watercolor blending
-        result = cv2.bitwise_and(watercolor, edges)
-        result = cv2.addWeighted(watercolor, 0.85, result, 0.15, 0)
-        
-        return result
-
-    def _apply_sketch_style(self, image):
-        """Apply pencil sketch style"""
-        # Convert to grayscale
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        
-        # Invert the image
-        inverted = 255 - gray
-        
-        # Apply Gaussian blur
-        blurred = cv2.GaussianBlur(inverted, (25, 25), 0)
-        
-        # Create sketch by dividing
-        sketch = cv2.divide(gray, 255 - blurred, scale=256)
-        
-        # Convert back to BGR for consistency
-        result = cv2.cvtColor(sketch, cv2.COLOR_GRAY_BGR)
-        
-        return result
-
-    def _apply_dali_style(self, image):
-        """Apply Salvador Dali surrealist style"""
-        # Apply dream-like distortions
-        rows, cols = image.shape[:2]
-        
-        # Create wave distortion effect
-        map_x = np.zeros((rows, cols), dtype=np.float32)
-        map_y = np.zeros((rows, cols), dtype=np.float32)
-        
-        for i in range(rows):
-            for j in range(cols):
-                map_x[i, j] = j + 10 * np.sin(i / 20.0)
-                map_y[i, j] = i + 10 * np.cos(j / 20.0)
-        
-        distorted = cv2.remap(image, map_x, map_y, cv2.INTER_LINEAR)
-        
-        # Apply surreal color enhancement
-        hsv = cv2.cvtColor(distorted, cv2.COLOR_BGR2HSV)
-        hsv[:,:,0] = cv2.add(hsv[:,:,0], 20)  # Shift hue
-        hsv[:,:,1] = cv2.multiply(hsv[:,:,1], 1.4)  # Increase saturation
-        result = cv2.cvtColor(hsv, cv2.COLOR_HSV_BGR)
-        
-        return result
-
-    def _apply_oil_painting_style(self, image):
-        """Apply oil painting style"""
-        # Apply oil painting effect using bilateral filter
-        oil_painting = image.copy()
-        
-        # Multiple iterations for oil painting texture
-        for _ in range(2):
-            oil_painting = cv2.bilateralFilter(oil_painting, 9, 100, 100)
-        
-        # Apply texture enhancement
-        kernel = np.array([[0,-1,0], [-1,5,-1], [0,-1,0]])
-        textured = cv2.filter2D(oil_painting, -1, kernel)
-        
-        # Blend for oil painting effect
-        result = cv2.addWeighted(oil_painting, 0.8, textured, 0.2, 0)
-        
-        return result
-
-    def _apply_anime_style(self, image):
-        """Apply anime-style filter"""
-        # Convert to LAB color space for better color manipulation
-        lab = cv2.cvtColor(image, cv2.COLOR_BGR2LAB)
-        
-        # Apply bilateral filter for soft, painterly effect
-        cartoon = cv2.bilateralFilter(image, 15, 80, 80)
-        
-        # Enhance colors for anime palette
-        hsv = cv2.cvtColor(cartoon, cv2.COLOR_BGR2HSV)
-        hsv[:,:,1] = cv2.multiply(hsv[:,:,1], 1.3)  # Increase saturation
-        hsv[:,:,2] = cv2.multiply(hsv[:,:,2], 1.1)  # Increase brightness
-        enhanced = cv2.cvtColor(hsv, cv2.COLOR_HSV_BGR)
-        
-        # Apply light anime texture
-        kernel = np.array([[-1,-1,-1], [-1,9,-1], [-1,-1,-1]])
-        sharpened = cv2.filter2D(enhanced, -1, kernel)
-        
-        # Blend for soft anime look
-        result = cv2.addWeighted(enhanced, 0.7, sharpened, 0.3, 0)
-        
-        return result
-
+    @image_job
     def generate_color_palette(self, image_path, palette_type='harmonious'):
         """Generate color palettes based on mood/theme"""
         try:
@@ -526,13 +385,8 @@ class AIAnalyzer:
             if image is None:
                 return None, "Unable to load image for palette generation."
             
-            # Extract dominant colors
-            data = image.reshape((-1, 3))
-            data = np.float32(data)
-            
             # Use K-means to find dominant colors
-            criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 8, 1.0)
-            _, labels, centers = cv2.kmeans(data, 5, None, criteria, 10, cv2.KMEANS_RANDOM_CENTERS)
+            centers = cluster_colors(image, 5)
             
             # Convert to hex colors
             colors = []
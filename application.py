@@ -0,0 +1,135 @@
+"""
+ArtAI application factory
+
+create_app() builds the Flask app with its extensions and registers the
+blueprints it is asked for. A worker pool that only serves some of the
+site (see POOL_BLUEPRINTS in wsgi.py) imports and routes only those
+blueprints; links to pages of the others are still built by url_for, from
+a link-only URL map that is put together the first time one is needed.
+"""
+
+import importlib
+import os
+import threading
+
+from flask import Flask, has_request_context, render_template, request
+from werkzeug.urls import quote
+
+from extensions import (db, login_manager, static_assets, query_auditor, request_profiler, metrics, image_service,
+                        uploads, similarity_index)
+
+# Blueprint name -> module defining `bp`, in registration order
+BLUEPRINTS = {
+    'main': 'blueprints.main',
+    'gallery': 'blueprints.gallery',
+    'forum': 'blueprints.forum',
+    'learning': 'blueprints.learning',
+    'battles': 'blueprints.battles',
+    'admin': 'blueprints.admin',
+    'ai': 'blueprints.ai',
+}
+
+
+def load_blueprint(name):
+    """Import a blueprint module and return its blueprint"""
+    return importlib.import_module(BLUEPRINTS[name]).bp
+
+
+def create_app(blueprints=None):
+    """Create the ArtAI app with the named blueprints (all of them by default)"""
+    app = Flask(__name__)
+    app.config['SECRET_KEY'] = 'your-secret-key-change-this-in-production'
+    app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///art_app.db')
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['UPLOAD_FOLDER'] = 'static/uploads'
+    app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+    app.config['IMAGE_SERVICE_SOCKET'] = os.environ.get('IMAGE_SERVICE_SOCKET')
+
+    # Ensure upload directory exists
+    os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+
+    db.init_app(app)
+    login_manager.init_app(app)
+    login_manager.login_view = 'main.login'
+    static_assets.init_app(app)
+    query_auditor.init_app(app)
+    request_profiler.init_app(app)
+    metrics.init_app(app)
+    image_service.init_app(app)
+    uploads.init_app(app)
+    similarity_index.init_app(app)
+
+    # Models register their tables and the login user_loader on import
+    import models  # noqa: F401
+
+    register_template_filters(app)
+    register_error_handlers(app)
+
+    for name in (BLUEPRINTS if blueprints is None else blueprints):
+        if name not in BLUEPRINTS:
+            raise ValueError(f"Unknown blueprint '{name}', expected one of: {', '.join(BLUEPRINTS)}")
+        app.register_blueprint(load_blueprint(name))
+    app.url_build_error_handlers.append(LinkBuilder(app))
+
+    return app
+
+
+def register_template_filters(app):
+    @app.template_filter('nl2br')
+    def nl2br_filter(text):
+        return text.replace('\n', '<br>\n') if text else ''
+
+
+def register_error_handlers(app):
+    @app.errorhandler(414)
+    def request_uri_too_long(error):
+        return render_template('error.html',
+                             error_code=414,
+                             error_message="Request URI too long"), 414
+
+    @app.errorhandler(404)
+    def not_found(error):
+        return render_template('error.html',
+                             error_code=404,
+                             error_message="Page not found"), 404
+
+
+class LinkBuilder:
+    """url_for fallback for endpoints of blueprints the app didn't register"""
+
+    def __init__(self, app):
+        self.app = app
+        self.url_map = None
+        self.lock = threading.Lock()
+
+    def __call__(self, error, endpoint, values):
+        name = endpoint.partition('.')[0]
+        if name not in BLUEPRINTS or name in self.app.blueprints:
+            return None
+
+        anchor = values.pop('_anchor', None)
+        method = values.pop('_method', None)
+        scheme = values.pop('_scheme', None)
+        external = values.pop('_external', None)
+        rv = self.adapter().build(endpoint, values, method=method, url_scheme=scheme,
+                                  force_external=bool(external))
+        if anchor is not None:
+            rv = f"{rv}#{quote(anchor, safe='%!#$&()*+,/:;=?@')}"
+        return rv
+
+    def adapter(self):
+        with self.lock:
+            if self.url_map is None:
+                self.url_map = self._build_url_map()
+        if has_request_context():
+            return self.url_map.bind_to_environ(request.environ, server_name=self.app.config['SERVER_NAME'])
+        return self.url_map.bind(self.app.config['SERVER_NAME'] or 'localhost',
+                                 self.app.config['APPLICATION_ROOT'],
+                                 url_scheme=self.app.config['PREFERRED_URL_SCHEME'])
+
+    def _build_url_map(self):
+        links = Flask(__name__, static_folder=None)
+        for name in BLUEPRINTS:
+            if name not in self.app.blueprints:
+                links.register_blueprint(load_blueprint(name))
+        return links.url_map
@@ -0,0 +1 @@
+"""Performance benchmarks for ArtAI (run with python -m benchmarks.<name>)"""
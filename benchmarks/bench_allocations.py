@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Allocation cost of the filter chains, with and without the buffer pool
+
+Renders the redraw chain and every style on a deterministic synthetic
+image, first with the BufferPool disabled (every intermediate array is a
+fresh allocation) and then with it enabled, and reports per render:
+
+- minor page faults: fresh large arrays are mmap'd, so each one faults
+  its pages in again; this is where the allocation time goes
+- peak RSS growth above the RSS before the render (Linux, VmHWM); the
+  pooled buffers are resident already, their size is shown as pool_mb
+- peak traced NumPy allocation (tracemalloc)
+- p50 time
+
+    python -m benchmarks.bench_allocations
+    python -m benchmarks.bench_allocations --sizes 2400x1800 --only redraw van_gogh
+"""
+
+import argparse
+import resource
+import sys
+
+from benchmarks.common import make_synthetic_image, peak_memory, percentile, print_table, time_call, uncached_analyzer
+from styles import STYLE_IDS
+
+DEFAULT_SIZES = ['1024x768', '2400x1800']
+
+
+def read_status(field):
+    """A kB field of /proc/self/status, in bytes"""
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith(field + ':'):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def peak_rss_growth(fn):
+    """How far RSS rose above its starting point during one call of fn (Linux only)"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')  # reset VmHWM to the current RSS
+    except OSError:
+        return None
+    before = read_status('VmRSS')
+    fn()
+    return read_status('VmHWM') - before
+
+
+def minor_faults(fn, repeats):
+    """Average minor page faults per call of fn"""
+    started = resource.getrusage(resource.RUSAGE_SELF).ru_minflt
+    for _ in range(repeats):
+        fn()
+    return (resource.getrusage(resource.RUSAGE_SELF).ru_minflt - started) / repeats
+
+
+def measure_case(fn, repeats):
+    fn()  # warm up, and fill the pool
+    rss = peak_rss_growth(fn)
+    return {
+        'faults': round(minor_faults(fn, repeats)),
+        'rss_mb': round(rss / (1024 * 1024), 2) if rss is not None else '',
+        'traced_mb': round(peak_memory(fn) / (1024 * 1024), 2),
+        'p50_ms': round(percentile(time_call(fn, repeats, warmup=0), 50) * 1000, 2),
+    }
+
+
+def run(sizes, repeats, only=None):
+    analyzer = uncached_analyzer()
+    cases = {name: lambda image, name=name: analyzer.pipelines.render(image, name)
+             for name in ['redraw'] + STYLE_IDS}
+    if only:
+        cases = {name: fn for name, fn in cases.items() if any(pattern in name for pattern in only)}
+
+    rows = []
+    for size in sizes:
+        width, height = (int(v) for v in size.split('x'))
+        image = make_synthetic_image(width, height)
+        for name, render in cases.items():
+            row = {'case': f'{name}@{size}'}
+            for mode, capacity in (('fresh', 0), ('pooled', analyzer.memory_budget)):
+                analyzer.buffers.capacity = capacity
+                analyzer.buffers.clear()
+                for metric, value in measure_case(lambda: render(image), repeats).items():
+                    row[f'{mode}_{metric}'] = value
+            row['pool_mb'] = round(analyzer.buffers.held() / (1024 * 1024), 2)
+            rows.append(row)
+            print(f"  {row['case']:<24} faults {row['fresh_faults']} -> {row['pooled_faults']}", file=sys.stderr)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure filter chain allocations with and without the buffer pool')
+    parser.add_argument('--sizes', nargs='+', default=DEFAULT_SIZES, help='image sizes as WIDTHxHEIGHT')
+    parser.add_argument('--repeats', type=int, default=5, help='measured renders per case')
+    parser.add_argument('--only', nargs='+', help='run only cases whose name contains one of these strings')
+    args = parser.parse_args()
+
+    print(f"🧪 Filter chain allocations: sizes={' '.join(args.sizes)} repeats={args.repeats}", file=sys.stderr)
+    rows = run(args.sizes, args.repeats, args.only)
+    columns = ['case']
+    for metric in ('faults', 'rss_mb', 'traced_mb', 'p50_ms'):
+        columns += [f'fresh_{metric}', f'pooled_{metric}']
+    columns.append('pool_mb')
+    print_table(rows, columns)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+AIAnalyzer benchmark suite
+
+Times every style transfer, the redraw filter chain, palette extraction
+and artwork analysis on deterministic synthetic images at several
+resolutions, reporting p50/p95 latency and peak memory per case.
+Stages are recomputed on every run; the "cached:" cases time styles whose
+shared stages (cache=True in styles.py) come from the stage cache.
+
+    python -m benchmarks.bench_analyzer                       # run and print
+    python -m benchmarks.bench_analyzer --save                # also store a result file
+    python -m benchmarks.bench_analyzer --compare benchmarks/baselines/<file>.json
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+import cv2
+
+from ai_analyzer import AIAnalyzer
+from benchmarks.common import (compare_results, load_results, make_synthetic_image, measure, print_table, save_results,
+                               uncached_analyzer)
+from styles import STYLE_IDS
+
+DEFAULT_SIZES = ['256x256', '512x512', '1024x768']
+
+
+def build_cases(analyzer, cached_analyzer):
+    """Map case name -> callable(image_path) for every benchmarked operation"""
+    cases = {
+        'analyze': lambda path: analyzer.analyze_artwork(path),
+        'redraw': lambda path: analyzer.redraw_artwork(path),
+        'palette': lambda path: analyzer.generate_color_palette(path),
+    }
+    for style in STYLE_IDS:
+        cases[f'style:{style}'] = lambda path, style=style: analyzer.apply_style_transfer(path, style)
+    for style in STYLE_IDS:
+        plan = cached_analyzer.pipelines.plans[style]
+        if any(segment['steps'][-1]['cache'] for segment in plan):
+            cases[f'cached:style:{style}'] = (lambda path, style=style:
+                                              cached_analyzer.apply_style_transfer(path, style))
+    return cases
+
+
+def check_result(case, result):
+    """Fail loudly instead of timing an error path"""
+    if case == 'analyze':
+        if result['score'] == 0:
+            raise RuntimeError(result['feedback'])
+    elif result[0] is None:
+        raise RuntimeError(result[1])
+
+
+def run(sizes, repeats, only=None, workdir=None):
+    cases = build_cases(uncached_analyzer(), AIAnalyzer())
+    if only:
+        cases = {name: fn for name, fn in cases.items() if any(pattern in name for pattern in only)}
+
+    results = {}
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        for size in sizes:
+            width, height = (int(v) for v in size.split('x'))
+            image_path = os.path.join(tmp, f'synthetic_{size}.png')
+            cv2.imwrite(image_path, make_synthetic_image(width, height))
+
+            for name, fn in cases.items():
+                key = f'{name}@{size}'
+                try:
+                    check_result(name, fn(image_path))
+                    results[key] = measure(lambda: fn(image_path), repeats)
+                except Exception as e:
+                    results[key] = {'error': str(e)}
+                print(f"  {key:<28} {format_summary(results[key])}", file=sys.stderr)
+    return results
+
+
+def format_summary(summary):
+    if 'error' in summary:
+        return f"ERROR: {summary['error']}"
+    return f"p50 {summary['p50_ms']:>9.2f} ms  p95 {summary['p95_ms']:>9.2f} ms  peak {summary['peak_mem_mb']:>7.2f} MB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark AIAnalyzer image operations')
+    parser.add_argument('--sizes', nargs='+', default=DEFAULT_SIZES, help='image sizes as WIDTHxHEIGHT')
+    parser.add_argument('--repeats', type=int, default=5, help='timed runs per case')
+    parser.add_argument('--only', nargs='+', help='run only cases whose name contains one of these strings')
+    parser.add_argument('--save', nargs='?', const='', help='store results (optionally at the given path)')
+    parser.add_argument('--compare', help='baseline result file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10, help='relative p50 change flagged as a regression')
+    args = parser.parse_args()
+
+    print(f"🧪 Benchmarking AIAnalyzer: sizes={' '.join(args.sizes)} repeats={args.repeats}", file=sys.stderr)
+    results = run(args.sizes, args.repeats, args.only)
+
+    rows = [dict(case=case, **summary) for case, summary in results.items()]
+    print_table(rows, ['case', 'p50_ms', 'p95_ms', 'mean_ms', 'peak_mem_mb', 'error'])
+
+    if args.save is not None:
+        path = save_results('analyzer', results, args.save or None,
+                            settings={'sizes': args.sizes, 'repeats': args.repeats})
+        print(f"\n✅ Results saved to {path}")
+
+    if args.compare:
+        baseline = load_results(args.compare)['results']
+        comparison = compare_results(results, baseline, threshold=args.threshold)
+        print(f"\nComparison with {args.compare} (p50, threshold {args.threshold:.0%}):")
+        print_table(comparison, ['case', 'baseline', 'current', 'change_pct', 'status'])
+        if any(row['status'] == 'regression' for row in comparison):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
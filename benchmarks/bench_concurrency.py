@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Throughput of concurrent style renders with and without OpenCV thread control
+
+Models a pool of gunicorn image workers: --processes worker processes
+share --clients concurrent requests, each request rendering a style on a
+deterministic synthetic image. Every combination runs twice:
+
+- default: OpenCV uses every core in every process, with no limit on
+  concurrent jobs (the behaviour before image_concurrency)
+- managed: each process gets its share of the cores from
+  image_concurrency, split between the jobs it is running
+
+and reports jobs per second plus p50/p95 latency per job. The gain shows
+up when processes x clients exceeds the cores; on a single core both
+modes run one thread.
+
+    python -m benchmarks.bench_concurrency
+    python -m benchmarks.bench_concurrency --processes 1 4 --clients 1 4 8 --jobs 32 --size 2400x1800
+"""
+
+import argparse
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import make_synthetic_image, percentile, print_table
+from image_concurrency import cpu_count
+
+# Styles without cached stages, so every job does its full work
+DEFAULT_STYLES = ['van_gogh', 'monet', 'watercolor', 'oil_painting', 'sketch']
+
+
+def serve(mode, processes, clients, jobs, size, styles, ready, results):
+    """One worker process: render `jobs` styles on `clients` threads and report each job's latency"""
+    import cv2
+    from ai_analyzer import AIAnalyzer
+    from image_concurrency import concurrency
+
+    analyzer = AIAnalyzer()
+    if mode == 'managed':
+        concurrency.configure(processes=processes, max_jobs=clients)
+    else:
+        cv2.setNumThreads(cpu_count())
+    width, height = (int(v) for v in size.split('x'))
+    image = make_synthetic_image(width, height)
+    for style in styles:
+        analyzer.pipelines.render(image, style)  # warm up the buffers and tables
+
+    def job(index):
+        started = time.perf_counter()
+        if mode == 'managed':
+            with concurrency.job():
+                analyzer.pipelines.render(image, styles[index % len(styles)])
+        else:
+            analyzer.pipelines.render(image, styles[index % len(styles)])
+        return time.perf_counter() - started
+
+    ready.wait()
+    with ThreadPoolExecutor(clients) as pool:
+        results.put(list(pool.map(job, range(jobs))))
+
+
+def run_case(mode, processes, clients, jobs, size, styles):
+    context = multiprocessing.get_context('fork')
+    ready = context.Barrier(processes + 1)
+    results = context.Queue()
+    # Spread the clients and jobs over the processes
+    workers = [context.Process(target=serve, args=(mode, processes, max(1, clients // processes),
+                                                   max(1, jobs // processes), size, styles, ready, results))
+               for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    ready.wait()
+    started = time.perf_counter()
+    latencies = []
+    for _ in workers:
+        latencies += results.get()
+    elapsed = time.perf_counter() - started
+    for worker in workers:
+        worker.join()
+    return {'jobs_per_s': round(len(latencies) / elapsed, 2),
+            'p50_ms': round(percentile(latencies, 50) * 1000, 1),
+            'p95_ms': round(percentile(latencies, 95) * 1000, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure concurrent render throughput with and without thread control')
+    parser.add_argument('--processes', type=int, nargs='+', default=[1, 3], help='worker processes to model')
+    parser.add_argument('--clients', type=int, nargs='+', default=[1, 4], help='concurrent requests in total')
+    parser.add_argument('--jobs', type=int, default=24, help='renders per case')
+    parser.add_argument('--size', default='1024x768', help='image size as WIDTHxHEIGHT')
+    parser.add_argument('--styles', nargs='+', default=DEFAULT_STYLES, help='styles the jobs cycle through')
+    args = parser.parse_args()
+
+    print(f"🧪 Concurrent renders on {cpu_count()} cores: size={args.size} jobs={args.jobs}", file=sys.stderr)
+    rows = []
+    for processes in args.processes:
+        for clients in args.clients:
+            if clients < processes:
+                continue
+            for mode in ('default', 'managed'):
+                row = {'case': f'{processes} proc x {clients} clients', 'mode': mode}
+                row.update(run_case(mode, processes, clients, args.jobs, args.size, args.styles))
+                rows.append(row)
+                print(f"  {row['case']:<24} {mode:<8} {row['jobs_per_s']} jobs/s", file=sys.stderr)
+    print_table(rows, ['case', 'mode', 'jobs_per_s', 'p50_ms', 'p95_ms'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Perceptual-hash robustness and similar-artwork search speed
+
+Two checks for image_similarity:
+
+- robustness: the Hamming distance between the pHash of a synthetic image
+  and of re-encoded, resized, blurred and brightened copies (should stay
+  within the duplicate distance), and of a different image (should not)
+- search: --queries lookups within the similar and duplicate distances
+  over galleries of --sizes random hashes (a tenth of them near copies of
+  others), in the multi-index and by comparing against every hash
+
+    python -m benchmarks.bench_similarity
+    python -m benchmarks.bench_similarity --sizes 1000 100000 --queries 500
+"""
+
+import argparse
+import random
+import sys
+import time
+
+import cv2
+
+from benchmarks.common import make_synthetic_image, print_table
+from image_similarity import MultiIndex, hamming, perceptual_hash
+
+
+def variants(image):
+    """Edits a copy of an artwork might have gone through"""
+    encoded = cv2.imdecode(cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, 60])[1], cv2.IMREAD_COLOR)
+    height, width = image.shape[:2]
+    return {
+        'jpeg q60': encoded,
+        'resized 50%': cv2.resize(image, (width // 2, height // 2), interpolation=cv2.INTER_AREA),
+        'blurred': cv2.GaussianBlur(image, (5, 5), 0),
+        'brighter': cv2.convertScaleAbs(image, alpha=1.1, beta=20),
+        'cropped 5%': image[height // 40:-height // 40, width // 40:-width // 40],
+        'different image': make_synthetic_image(width, height, seed=7),
+    }
+
+
+def make_gallery(size, rng):
+    """Random 64-bit hashes, a tenth of them a few bits away from an earlier one"""
+    hashes = []
+    for _ in range(size):
+        if hashes and rng.random() < 0.1:
+            value = rng.choice(hashes)
+            for bit in rng.sample(range(64), rng.randint(1, 8)):
+                value ^= 1 << bit
+        else:
+            value = rng.getrandbits(64)
+        hashes.append(value)
+    return hashes
+
+
+def time_search(search, queries):
+    started = time.perf_counter()
+    found = sum(len(search(query)) for query in queries)
+    return (time.perf_counter() - started) / len(queries) * 1000, found
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure perceptual-hash robustness and similarity search speed')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000], help='hashes in the gallery')
+    parser.add_argument('--queries', type=int, default=200, help='lookups per case')
+    parser.add_argument('--distances', type=int, nargs='+', default=[6, 12], help='search radii')
+    parser.add_argument('--size', default='1024x768', help='robustness image size as WIDTHxHEIGHT')
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.size.split('x'))
+    image = make_synthetic_image(width, height)
+    original = perceptual_hash(image)
+    print_table([{'variant': name, 'distance': hamming(original, perceptual_hash(copy))}
+                 for name, copy in variants(image).items()], ['variant', 'distance'])
+
+    rng = random.Random(0)
+    rows = []
+    for size in args.sizes:
+        hashes = make_gallery(size, rng)
+        index = MultiIndex()
+        for item, value in enumerate(hashes):
+            index.add(value, item)
+        queries = rng.sample(hashes, min(args.queries, size))
+        for distance in args.distances:
+            index_ms, index_found = time_search(lambda q: index.search(q, distance), queries)
+            scan_ms, scan_found = time_search(
+                lambda q: [i for i, value in enumerate(hashes) if hamming(q, value) <= distance], queries)
+            if index_found != scan_found:
+                sys.exit(f"❌ The multi-index found {index_found} matches, the scan {scan_found} "
+                         f"(size={size}, distance={distance})")
+            rows.append({'gallery': size, 'distance': distance, 'matches': round(index_found / len(queries), 1),
+                         'index_ms': round(index_ms, 3), 'scan_ms': round(scan_ms, 3),
+                         'speedup': round(scan_ms / index_ms, 1)})
+            print(f"  {size:>7} hashes, distance {distance:>2}: {rows[-1]['speedup']}x", file=sys.stderr)
+    print_table(rows, ['gallery', 'distance', 'matches', 'index_ms', 'scan_ms', 'speedup'])
+
+
+if __name__ == '__main__':
+    main()
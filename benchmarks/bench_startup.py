@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Application startup benchmark
+
+Measures, each time in a fresh interpreter, how long `import app` takes,
+how long the first request to a few routes takes afterwards, and what the
+deferred imaging stack (AIAnalyzer with OpenCV/NumPy/Pillow) costs when
+the first image request builds it. Also reports which heavy modules the
+plain import pulled in.
+
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --repeats 10 --save
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.common import compare_results, load_results, print_table, save_results, summarize
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ['cv2', 'numpy', 'PIL']
+DEFAULT_ROUTES = ['/', '/gallery', '/forum', '/login']
+
+# Runs in the child interpreter; prints one JSON document of timings in seconds
+CHILD_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+import app as artai
+timings = {'import_app': time.perf_counter() - started}
+heavy = [name for name in %(heavy)r if name in sys.modules]
+
+with artai.app.app_context():
+    artai.db.create_all()
+
+client = artai.app.test_client()
+for route in %(routes)r:
+    started = time.perf_counter()
+    response = client.get(route)
+    timings['first_request ' + route] = time.perf_counter() - started
+    if response.status_code >= 500:
+        raise SystemExit('%%s returned %%s' %% (route, response.status_code))
+
+started = time.perf_counter()
+artai.ai_analyzer.load()
+timings['load_ai_analyzer'] = time.perf_counter() - started
+
+print(json.dumps({'timings': timings, 'heavy_modules': heavy}))
+"""
+
+
+def run_once(routes, workdir):
+    env = {key: value for key, value in os.environ.items() if key != 'PROMETHEUS_MULTIPROC_DIR'}
+    env['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'startup.db')}"
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [REPO_ROOT, os.environ.get('PYTHONPATH')]))
+    script = CHILD_SCRIPT % {'heavy': HEAVY_MODULES, 'routes': routes}
+    output = subprocess.run([sys.executable, '-c', script], cwd=workdir, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run(repeats, routes):
+    samples = {}
+    heavy_modules = set()
+    for _ in range(repeats):
+        with tempfile.TemporaryDirectory() as workdir:
+            result = run_once(routes, workdir)
+        heavy_modules.update(result['heavy_modules'])
+        for case, seconds in result['timings'].items():
+            samples.setdefault(case, []).append(seconds)
+    return {case: summarize(values) for case, values in samples.items()}, sorted(heavy_modules)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark ArtAI import and first-request latency')
+    parser.add_argument('--repeats', type=int, default=5, help='fresh interpreters to start')
+    parser.add_argument('--routes', nargs='+', default=DEFAULT_ROUTES, help='routes requested after import')
+    parser.add_argument('--save', nargs='?', const='', help='store results (optionally at the given path)')
+    parser.add_argument('--compare', help='baseline result file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10, help='relative p50 change flagged as a regression')
+    args = parser.parse_args()
+
+    print(f"🧪 Starting {args.repeats} fresh interpreters", file=sys.stderr)
+    results, heavy_modules = run(args.repeats, args.routes)
+
+    rows = [dict(case=case, **summary) for case, summary in results.items()]
+    print_table(rows, ['case', 'p50_ms', 'p95_ms', 'mean_ms', 'min_ms'])
+    if heavy_modules:
+        print(f"\n⚠️  Imported by `import app`: {', '.join(heavy_modules)}")
+    else:
+        print(f"\n✅ `import app` loads none of: {', '.join(HEAVY_MODULES)}")
+
+    if args.save is not None:
+        path = save_results('startup', results, args.save or None,
+                            settings={'repeats': args.repeats, 'routes': args.routes,
+                                      'heavy_modules': heavy_modules})
+        print(f"\n✅ Results saved to {path}")
+
+    if args.compare:
+        baseline = load_results(args.compare)['results']
+        comparison = compare_results(results, baseline, threshold=args.threshold)
+        print(f"\nComparison with {args.compare} (p50, threshold {args.threshold:.0%}):")
+        print_table(comparison, ['case', 'baseline', 'current', 'change_pct', 'status'])
+        if any(row['status'] == 'regression' for row in comparison):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Strip-by-strip (memory-bounded) rendering vs. rendering in one piece
+
+Renders the redraw chain and every style twice on a deterministic
+synthetic image: once with an unlimited memory budget and once with a
+small one that forces strip processing. Prints the time and peak memory
+of both and checks that the outputs are identical. The budget is lowered
+for each size so the image is cut into at least --min-strips strips, so
+odd and small sizes (333x517) exercise the strip edges and the halos of
+the blur, bilateral and edge stages too.
+
+    python -m benchmarks.bench_tiling
+    python -m benchmarks.bench_tiling --sizes 4000x3000 --budget-mb 32
+    python -m benchmarks.bench_tiling --check    # outputs only, no timing
+
+Exits non-zero if a strip output differs.
+"""
+
+import argparse
+import sys
+
+import numpy as np
+
+from benchmarks.common import make_synthetic_image, measure, print_table, uncached_analyzer
+from image_tiles import SCRATCH_BYTES_PER_PIXEL, strip_rows
+from styles import STYLE_IDS
+
+DEFAULT_SIZES = ['333x517', '1024x768', '3000x2000']
+
+
+def build_cases(analyzer):
+    """Map case name -> callable(image) rendering it with this analyzer"""
+    return {name: lambda image, name=name: analyzer.pipelines.render(image, name)
+            for name in ['redraw'] + STYLE_IDS}
+
+
+def size_budget(width, height, budget, min_strips):
+    """The budget, lowered if needed so a halo-free chain needs at least min_strips strips"""
+    return min(budget, width * height * SCRATCH_BYTES_PER_PIXEL // min_strips)
+
+
+def run(sizes, budget, repeats, only=None, min_strips=4):
+    whole_analyzer = uncached_analyzer(memory_budget=sys.maxsize)
+    whole = build_cases(whole_analyzer)
+    rows = []
+    for size in sizes:
+        width, height = (int(v) for v in size.split('x'))
+        image = make_synthetic_image(width, height)
+        case_budget = size_budget(width, height, budget, min_strips)
+        strips = build_cases(uncached_analyzer(memory_budget=case_budget))
+        print(f"  {size}: {case_budget / (1024 * 1024):.2f} MB budget, "
+              f"{strip_rows(image.shape, case_budget)} rows per strip without halo", file=sys.stderr)
+        for name in whole:
+            if only and not any(pattern in name for pattern in only):
+                continue
+            expected = whole[name](image)
+            actual = strips[name](image)
+            if expected.shape != actual.shape:
+                status, max_diff, mean_diff = 'DIFFERENT', -1, -1
+            else:
+                difference = np.abs(expected.astype(np.int16) - actual.astype(np.int16))
+                status = 'identical' if not difference.any() else 'DIFFERENT'
+                max_diff, mean_diff = int(difference.max()), round(float(difference.mean()), 3)
+            row = {'case': f'{name}@{size}', 'status': status, 'max_diff': max_diff, 'mean_diff': mean_diff,
+                   'halo': max(segment['halo'] for segment in whole_analyzer.pipelines.plans[name])}
+            if repeats:
+                whole_run = measure(lambda: whole[name](image), repeats)
+                strip_run = measure(lambda: strips[name](image), repeats)
+                row.update({'whole_ms': whole_run['p50_ms'], 'strips_ms': strip_run['p50_ms'],
+                            'whole_mb': whole_run['peak_mem_mb'], 'strips_mb': strip_run['peak_mem_mb']})
+            rows.append(row)
+            print(f"  {row['case']:<28} {status}", file=sys.stderr)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare strip-by-strip rendering with whole-image rendering')
+    parser.add_argument('--sizes', nargs='+', default=DEFAULT_SIZES, help='image sizes as WIDTHxHEIGHT')
+    parser.add_argument('--budget-mb', type=float, default=16, help='memory budget that forces strips')
+    parser.add_argument('--min-strips', type=int, default=4, help='lower the budget until each size needs this many')
+    parser.add_argument('--repeats', type=int, default=3, help='timed runs per case')
+    parser.add_argument('--check', action='store_true', help='only compare the outputs, without timing')
+    parser.add_argument('--only', nargs='+', help='run only cases whose name contains one of these strings')
+    args = parser.parse_args()
+
+    print(f"🧪 Strips vs whole image: sizes={' '.join(args.sizes)} budget={args.budget_mb:g} MB", file=sys.stderr)
+    repeats = 0 if args.check else args.repeats
+    rows = run(args.sizes, int(args.budget_mb * 1024 * 1024), repeats, args.only, args.min_strips)
+    columns = ['case', 'status', 'halo', 'max_diff', 'mean_diff']
+    print_table(rows, columns + (['whole_ms', 'strips_ms', 'whole_mb', 'strips_mb'] if repeats else []))
+
+    different = [row['case'] for row in rows if row['status'] == 'DIFFERENT']
+    if different:
+        print(f"\n❌ Strip output differs from whole-image output: {', '.join(different)}")
+        sys.exit(1)
+    print("\n✅ Strip output matches whole-image output")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+"""
+Shared helpers for the ArtAI benchmark suites
+
+Timing/percentile summaries, peak-memory measurement, synthetic test
+images and JSON result files that can be compared against a baseline.
+"""
+
+import gc
+import json
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+
+
+def percentile(samples, pct):
+    """Linear-interpolated percentile of a list of numbers"""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    k = (len(ordered) - 1) * pct / 100.0
+    lower = int(k)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (k - lower)
+
+
+def summarize(samples):
+    """Summarize timing samples (seconds) in milliseconds"""
+    return {
+        'runs': len(samples),
+        'p50_ms': round(percentile(samples, 50) * 1000, 3),
+        'p95_ms': round(percentile(samples, 95) * 1000, 3),
+        'mean_ms': round(statistics.mean(samples) * 1000, 3) if samples else 0.0,
+        'min_ms': round(min(samples) * 1000, 3) if samples else 0.0,
+    }
+
+
+def time_call(fn, repeats, warmup=1):
+    """Run fn warmup + repeats times and return the timing samples"""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeats):
+        gc.collect()
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def peak_memory(fn):
+    """Peak Python/NumPy heap allocation (bytes) during one call of fn"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def measure(fn, repeats, warmup=1):
+    """Timing summary plus peak memory for fn; memory is measured in a separate run"""
+    result = summarize(time_call(fn, repeats, warmup))
+    result['peak_mem_mb'] = round(peak_memory(fn) / (1024 * 1024), 2)
+    return result
+
+
+def uncached_analyzer(**kwargs):
+    """AIAnalyzer that recomputes every stage, so repeated renders of one image time the full work"""
+    from ai_analyzer import AIAnalyzer
+    from style_pipeline import StageCache
+
+    analyzer = AIAnalyzer(**kwargs)
+    # Stages marked cache=True would otherwise be cache hits from the second render on
+    analyzer.pipelines.cache = StageCache(0)
+    return analyzer
+
+
+def make_synthetic_image(width, height, seed=0):
+    """Deterministic 'artwork-like' BGR image: gradients, shapes, texture and noise"""
+    import cv2
+
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    image = np.empty((height, width, 3), dtype=np.uint8)
+    image[..., 0] = (127 + 127 * np.sin(x / max(width, 1) * 6.0)).astype(np.uint8)
+    image[..., 1] = (255 * y / max(height - 1, 1)).astype(np.uint8)
+    image[..., 2] = (127 + 127 * np.cos((x + y) / max(width + height, 1) * 9.0)).astype(np.uint8)
+
+    scale = max(min(width, height) // 16, 2)
+    for _ in range(24):
+        color = tuple(int(c) for c in rng.integers(0, 256, 3))
+        center = (int(rng.integers(0, width)), int(rng.integers(0, height)))
+        if rng.random() < 0.5:
+            cv2.circle(image, center, int(rng.integers(scale, scale * 4)), color, -1)
+        else:
+            corner = (center[0] + int(rng.integers(scale, scale * 5)), center[1] + int(rng.integers(scale, scale * 5)))
+            cv2.rectangle(image, center, corner, color, -1)
+        cv2.line(image, center, (int(rng.integers(0, width)), int(rng.integers(0, height))), color, max(scale // 8, 1))
+
+    noise = rng.normal(0, 8, image.shape)
+    return np.clip(image.astype(np.float32) + noise, 0, 255).astype(np.uint8)
+
+
+def environment_info():
+    """Describe the machine and library versions a result was produced with"""
+    import cv2
+
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'opencv': cv2.__version__,
+        'opencv_threads': cv2.getNumThreads(),
+    }
+
+
+def save_results(suite, results, path=None, settings=None):
+    """Write a result file and return its path"""
+    document = {
+        'suite': suite,
+        'created_at': datetime.utcnow().isoformat(timespec='seconds'),
+        'environment': environment_info(),
+        'settings': settings or {},
+        'results': results,
+    }
+    if path is None:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        path = os.path.join(BASELINE_DIR, f"{suite}-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.json")
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+    return path
+
+
+def load_results(path):
+    """Load a result file written by save_results"""
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare_results(current, baseline, metric='p50_ms', threshold=0.10):
+    """Compare two {case: summary} dicts; returns rows flagged as regressions/improvements"""
+    rows = []
+    for case, summary in current.items():
+        previous = baseline.get(case)
+        if not previous or metric not in previous or metric not in summary or not previous[metric]:
+            continue
+        change = (summary[metric] - previous[metric]) / previous[metric]
+        status = 'regression' if change > threshold else 'improvement' if change < -threshold else 'same'
+        rows.append({'case': case, 'baseline': previous[metric], 'current': summary[metric],
+                     'change_pct': round(change * 100, 1), 'status': status})
+    return rows
+
+
+def print_table(rows, columns):
+    """Print a list of dicts as an aligned text table"""
+    widths = {c: max(len(c), *(len(str(row.get(c, ''))) for row in rows)) if rows else len(c) for c in columns}
+    print('  '.join(c.ljust(widths[c]) for c in columns))
+    print('  '.join('-' * widths[c] for c in columns))
+    for row in rows:
+        print('  '.join(str(row.get(c, '')).ljust(widths[c]) for c in columns))
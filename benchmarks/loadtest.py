@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+HTTP load test for ArtAI
+
+Seeds a throwaway SQLite database, starts gunicorn with the production
+configuration from gunicorn.conf.py (bound to a local TCP port instead of
+the nginx socket) and drives it with a population of logged-in virtual
+users that browse the gallery, read artworks and forum posts, like posts,
+vote in battles, complete lessons and upload artwork. Reports throughput
+and p50/p95/p99 latency per route.
+
+    python -m benchmarks.loadtest                             # 20 users for 30 s
+    python -m benchmarks.loadtest --users 50 --duration 120 --scale medium --save
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+from benchmarks.common import percentile, print_table, save_results
+from benchmarks.seed_data import SCALES, SEED_PASSWORD
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Relative frequency of each action, roughly what the access logs show:
+# mostly browsing, some interaction, few uploads
+ACTIONS = {
+    'gallery': 25,
+    'artwork_detail': 20,
+    'index': 10,
+    'forum': 8,
+    'forum_post': 10,
+    'like_post': 8,
+    'vote_battle': 7,
+    'complete_lesson': 5,
+    'activity_feed': 4,
+    'notifications': 2,
+    'upload': 1,
+}
+
+
+class VirtualUser(threading.Thread):
+    """One logged-in visitor issuing weighted random requests until the deadline"""
+
+    def __init__(self, base_url, user, data, deadline, think_time, results, seed):
+        super().__init__(daemon=True)
+        self.base_url = base_url
+        self.user_id, self.username = user
+        self.data = data
+        self.deadline = deadline
+        self.think_time = think_time
+        self.results = results
+        self.rng = random.Random(seed)
+        self.session = requests.Session()
+        self.votable = [(battle_id, submission_id) for battle_id, submission_id, owner in data['battle_targets']
+                        if owner != self.user_id]
+
+    def run(self):
+        self.login()
+        names, weights = zip(*ACTIONS.items())
+        while time.monotonic() < self.deadline:
+            action = self.rng.choices(names, weights)[0]
+            getattr(self, action)()
+            if self.think_time:
+                time.sleep(self.rng.uniform(0, self.think_time * 2))
+        self.session.close()
+
+    def request(self, route, method, path, check_json=False, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, self.base_url + path, timeout=60, **kwargs)
+            ok = response.status_code < 400
+            if ok and check_json:
+                ok = response.json().get('success', False)
+        except (requests.RequestException, ValueError):
+            ok = False
+        self.results.append((route, time.perf_counter() - started, ok))
+
+    def login(self):
+        self.request('login', 'POST', '/login',
+                     data={'username': self.username, 'password': SEED_PASSWORD})
+
+    def gallery(self):
+        self.request('gallery', 'GET', f'/gallery?page={self.rng.randint(1, 5)}')
+
+    def artwork_detail(self):
+        self.request('artwork_detail', 'GET', f"/artwork/{self.rng.choice(self.data['artwork_ids'])}")
+
+    def index(self):
+        self.request('index', 'GET', '/')
+
+    def forum(self):
+        self.request('forum', 'GET', '/forum')
+
+    def forum_post(self):
+        self.request('forum_post', 'GET', f"/forum/post/{self.rng.choice(self.data['post_ids'])}")
+
+    def like_post(self):
+        self.request('like_post', 'POST', f"/forum/post/{self.rng.choice(self.data['post_ids'])}/like",
+                     check_json=True)
+
+    def vote_battle(self):
+        if self.votable:
+            battle_id, submission_id = self.rng.choice(self.votable)
+            self.request('vote_battle', 'POST', f'/battle/{battle_id}/vote/{submission_id}', check_json=True)
+
+    def complete_lesson(self):
+        if self.data['lesson_ids']:
+            self.request('complete_lesson', 'POST',
+                         f"/learning/lesson/{self.rng.choice(self.data['lesson_ids'])}/complete", check_json=True)
+
+    def activity_feed(self):
+        self.request('activity_feed', 'GET', '/activity_feed')
+
+    def notifications(self):
+        self.request('notifications', 'GET', '/notifications')
+
+    def upload(self):
+        if not self.data['image_files']:
+            return
+        path = self.rng.choice(self.data['image_files'])
+        with open(path, 'rb') as f:
+            self.request('upload', 'POST', '/upload',
+                         data={'title': 'Load test upload', 'description': 'Uploaded by the load test',
+                               'category': 'Digital Art'},
+                         files={'artwork': (os.path.basename(path), f, 'image/jpeg')})
+
+
+def seed_database(workdir, scale, env):
+    """Seed a fresh database inside workdir and return the seeded ids"""
+    summary_path = os.path.join(workdir, 'seed_summary.json')
+    # Metrics are only collected from the server; the seeder writes no samples
+    env = {key: value for key, value in env.items() if key != 'PROMETHEUS_MULTIPROC_DIR'}
+    subprocess.run([sys.executable, '-m', 'benchmarks.seed_data', '--scale', scale, '--summary', summary_path],
+                   cwd=workdir, env=env, check=True)
+    with open(summary_path) as f:
+        return json.load(f)
+
+
+def start_server(workdir, port, workers, env):
+    """Start gunicorn with the deploy configuration on a local TCP port"""
+    command = [sys.executable, '-m', 'gunicorn',
+               '--config', os.path.join(REPO_ROOT, 'gunicorn.conf.py'),
+               '--bind', f'127.0.0.1:{port}',
+               '--chdir', workdir,
+               '--pythonpath', REPO_ROOT]
+    if workers:
+        command += ['--workers', str(workers)]
+    log = open(os.path.join(workdir, 'gunicorn.log'), 'w')
+    return subprocess.Popen(command, cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+
+def wait_until_ready(base_url, server, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError('gunicorn exited during startup')
+        try:
+            requests.get(base_url + '/login', timeout=2)
+            return
+        except requests.RequestException:
+            time.sleep(0.25)
+    raise RuntimeError(f'server did not answer within {timeout}s')
+
+
+def summarize_routes(results, elapsed):
+    """Per-route throughput and latency percentiles, plus an overall row"""
+    by_route = {}
+    for route, duration, ok in results:
+        by_route.setdefault(route, []).append((duration, ok))
+
+    rows = []
+    for route in sorted(by_route) + ['TOTAL']:
+        samples = by_route.get(route) or [(d, ok) for _, d, ok in results]
+        durations = [d for d, _ in samples]
+        rows.append({
+            'route': route,
+            'requests': len(samples),
+            'errors': sum(1 for _, ok in samples if not ok),
+            'req_per_s': round(len(samples) / elapsed, 2),
+            'p50_ms': round(percentile(durations, 50) * 1000, 1),
+            'p95_ms': round(percentile(durations, 95) * 1000, 1),
+            'p99_ms': round(percentile(durations, 99) * 1000, 1),
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test ArtAI under gunicorn with synthetic users')
+    parser.add_argument('--users', type=int, default=20, help='concurrent virtual users')
+    parser.add_argument('--duration', type=float, default=30, help='seconds of load after ramp-up')
+    parser.add_argument('--ramp-up', type=float, default=5, help='seconds over which users start')
+    parser.add_argument('--think-time', type=float, default=0.5, help='mean pause between requests per user')
+    parser.add_argument('--scale', choices=sorted(SCALES), default='small', help='size of the seeded database')
+    parser.add_argument('--pool', choices=['web', 'image'], default='web',
+                        help='gunicorn.conf.py worker pool settings to serve every route with')
+    parser.add_argument('--workers', type=int, help='override the gunicorn worker count')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--keep', action='store_true', help='keep the temporary database and logs')
+    parser.add_argument('--save', nargs='?', const='', help='store results (optionally at the given path)')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='artai_loadtest_')
+    env = dict(os.environ,
+               DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'art_app.db')}",
+               PROMETHEUS_MULTIPROC_DIR=os.path.join(workdir, 'metrics'),
+               ARTAI_POOL=args.pool, ARTAI_BLUEPRINTS='all',
+               PYTHONPATH=os.pathsep.join(filter(None, [REPO_ROOT, os.environ.get('PYTHONPATH')])))
+    base_url = f'http://127.0.0.1:{args.port}'
+    server = None
+
+    try:
+        print(f"🌱 Seeding '{args.scale}' dataset in {workdir}", file=sys.stderr)
+        data = seed_database(workdir, args.scale, env)
+
+        print(f"🚀 Starting gunicorn on {base_url}", file=sys.stderr)
+        server = start_server(workdir, args.port, args.workers, env)
+        wait_until_ready(base_url, server)
+
+        print(f"🧪 Running {args.users} users for {args.duration:.0f}s", file=sys.stderr)
+        results = []
+        started = time.monotonic()
+        deadline = started + args.ramp_up + args.duration
+        users = [VirtualUser(base_url, data['users'][i % len(data['users'])], data, deadline,
+                             args.think_time, results, seed=i)
+                 for i in range(args.users)]
+        for user in users:
+            user.start()
+            time.sleep(args.ramp_up / max(args.users, 1))
+        for user in users:
+            user.join()
+        elapsed = time.monotonic() - started
+
+        rows = summarize_routes(results, elapsed)
+        print_table(rows, ['route', 'requests', 'errors', 'req_per_s', 'p50_ms', 'p95_ms', 'p99_ms'])
+
+        if args.save is not None:
+            path = save_results('loadtest', {row['route']: row for row in rows}, args.save or None,
+                                settings={'users': args.users, 'duration': args.duration,
+                                          'think_time': args.think_time, 'scale': args.scale,
+                                          'pool': args.pool, 'workers': args.workers})
+            print(f"\n✅ Results saved to {path}")
+    finally:
+        if server is not None:
+            # Quick shutdown; a graceful one waits out idle keep-alive connections
+            server.send_signal(signal.SIGINT)
+            server.wait(timeout=30)
+        if args.keep:
+            print(f"📁 Database and gunicorn log kept in {workdir}", file=sys.stderr)
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
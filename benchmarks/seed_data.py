@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Synthetic data seeder for profiling, benchmarks and load tests
+
+Bulk-inserts a realistic population into the database configured by
+DATABASE_URL: users, artworks, forum posts, comments, follows, activity,
+notifications, battles with submissions and votes, plus the default
+achievements, forum categories and learning paths. Rows are written with
+chunked executemany inserts and explicit ids, so the 'xlarge' scale
+(millions of rows) seeds in minutes. Popularity is skewed the way real
+communities are: a few artists get most followers, a few threads most
+comments and a few battles most votes. Every synthetic user can log in
+with password SEED_PASSWORD.
+
+    DATABASE_URL=sqlite:////tmp/artai.db python -m benchmarks.seed_data --scale large
+    DATABASE_URL=sqlite:////tmp/artai.db python -m benchmarks.seed_data --scale xlarge --images 0
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+import cv2
+from sqlalchemy import func, text
+
+from benchmarks.common import make_synthetic_image
+
+SEED_PASSWORD = 'loadtest'
+CHUNK_SIZE = 10000
+# How many ids of each kind the summary (used by the load test) carries
+SUMMARY_SAMPLE = 5000
+
+SCALES = {
+    'small': {'users': 50, 'artworks': 200, 'posts': 100, 'comments': 400, 'follows': 300,
+              'activity': 300, 'notifications': 300, 'battles': 3, 'submissions_per_battle': 10,
+              'votes': 200, 'images': 10},
+    'medium': {'users': 2000, 'artworks': 20000, 'posts': 5000, 'comments': 30000, 'follows': 40000,
+               'activity': 20000, 'notifications': 20000, 'battles': 10, 'submissions_per_battle': 50,
+               'votes': 10000, 'images': 30},
+    'large': {'users': 50000, 'artworks': 300000, 'posts': 100000, 'comments': 600000, 'follows': 1000000,
+              'activity': 300000, 'notifications': 500000, 'battles': 40, 'submissions_per_battle': 200,
+              'votes': 200000, 'images': 60},
+    'xlarge': {'users': 250000, 'artworks': 2000000, 'posts': 500000, 'comments': 4000000,
+               'follows': 5000000, 'activity': 2000000, 'notifications': 3000000, 'battles': 100,
+               'submissions_per_battle': 500, 'votes': 1000000, 'images': 100},
+}
+
+CATEGORIES = ['Digital Art', 'Painting', 'Drawing', 'Photography', 'Sculpture', 'Mixed Media', 'Other']
+FORUM_CATEGORIES = ['General', 'Critique', 'Help', 'Showcase']
+NOTIFICATION_TYPES = ['like', 'comment', 'follow', 'battle_win']
+
+
+class PowerLawPicker:
+    """Pick ids with Zipf-like popularity; rank order is shuffled so hot ids are spread out"""
+
+    def __init__(self, ids, exponent, rng):
+        self.ids = list(ids)
+        rng.shuffle(self.ids)
+        self.cum_weights = list(itertools.accumulate(1.0 / rank ** exponent for rank in range(1, len(self.ids) + 1)))
+        self.rng = rng
+
+    def pick(self, k=1):
+        return self.rng.choices(self.ids, cum_weights=self.cum_weights, k=k)
+
+    def share(self, total):
+        """Split total into per-id counts proportional to popularity"""
+        top = self.cum_weights[-1]
+        previous = 0.0
+        counts = {}
+        for item, cumulative in zip(self.ids, self.cum_weights):
+            counts[item] = int(round(total * (cumulative - previous) / top))
+            previous = cumulative
+        return counts
+
+
+def bulk_insert(model, rows):
+    """executemany-insert an iterable of row dicts in chunks; returns the row count"""
+    from extensions import db
+
+    table = model.__table__
+    count = 0
+    iterator = iter(rows)
+    while True:
+        chunk = list(itertools.islice(iterator, CHUNK_SIZE))
+        if not chunk:
+            break
+        db.session.execute(table.insert(), chunk)
+        count += len(chunk)
+    db.session.commit()
+    return count
+
+
+def first_free_id(model):
+    from extensions import db
+    return (db.session.query(func.max(model.id)).scalar() or 0) + 1
+
+
+def random_date(rng, now, max_days=730):
+    return now - timedelta(seconds=rng.randint(0, max_days * 86400))
+
+
+def write_images(upload_folder, count, rng):
+    """Write synthetic artwork files and return their filenames"""
+    os.makedirs(upload_folder, exist_ok=True)
+    filenames = []
+    for i in range(count):
+        width, height = rng.choice([(640, 480), (800, 800), (1024, 768), (768, 1024)])
+        filename = f'seed_{i:04d}.jpg'
+        cv2.imwrite(os.path.join(upload_folder, filename), make_synthetic_image(width, height, seed=i))
+        filenames.append(filename)
+    return filenames
+
+
+def seed(app, scale='small', seed_value=42, images=None):
+    """Populate the app's database; returns a sample of the ids a load test needs"""
+    import models
+    from database_setup import initialize_achievements, initialize_forum_categories, initialize_learning_paths
+    from extensions import db
+    from werkzeug.security import generate_password_hash
+
+    counts = SCALES[scale]
+    images = counts['images'] if images is None else images
+    rng = random.Random(seed_value)
+    now = datetime.utcnow()
+
+    def step(label, model, rows):
+        started = time.perf_counter()
+        inserted = bulk_insert(model, rows)
+        print(f"  {label:<20} {inserted:>10,} rows  {time.perf_counter() - started:>7.1f}s", file=sys.stderr)
+
+    with app.app_context():
+        db.create_all()
+        initialize_achievements()
+        initialize_forum_categories()
+        initialize_learning_paths()
+
+        if db.engine.dialect.name == 'sqlite':
+            # Throwaway fixture data: trade durability for insert speed
+            db.session.execute(text('PRAGMA synchronous=OFF'))
+            db.session.execute(text('PRAGMA journal_mode=MEMORY'))
+
+        # Users. Hashing is deliberately slow, so every synthetic user shares one hash
+        password_hash = generate_password_hash(SEED_PASSWORD)
+        first_user = first_free_id(models.User)
+        user_ids = range(first_user, first_user + counts['users'])
+        step('users', models.User, (
+            {'id': user_id, 'username': f'seed_user_{user_id}', 'email': f'seed_user_{user_id}@example.com',
+             'password_hash': password_hash, 'bio': '', 'join_date': random_date(rng, now),
+             'created_at': now, 'is_admin': False, 'level': rng.randint(1, 20), 'experience': rng.randint(0, 5000)}
+            for user_id in user_ids))
+
+        # A few prolific artists and authors create most of the content
+        creators = PowerLawPicker(user_ids, 0.8, rng)
+        celebrities = PowerLawPicker(user_ids, 1.1, rng)
+
+        filenames = (write_images(app.config['UPLOAD_FOLDER'], images, rng) if images
+                     else [f'seed_{i:04d}.jpg' for i in range(10)])
+        first_artwork = first_free_id(models.Artwork)
+        artwork_ids = range(first_artwork, first_artwork + counts['artworks'])
+        step('artworks', models.Artwork, (
+            {'id': artwork_id, 'title': f'Synthetic artwork {artwork_id}', 'description': 'Generated for load testing',
+             'filename': rng.choice(filenames), 'upload_date': random_date(rng, now), 'user_id': owner,
+             'ai_feedback': 'Synthetic', 'ai_score': round(rng.uniform(5, 9.5), 1),
+             'category': rng.choice(CATEGORIES), 'tags': ''}
+            for artwork_id, owner in zip(artwork_ids, creators.pick(counts['artworks']))))
+
+        first_post = first_free_id(models.ForumPost)
+        post_ids = range(first_post, first_post + counts['posts'])
+        step('forum posts', models.ForumPost, (
+            {'id': post_id, 'title': f'Synthetic discussion {post_id}', 'content': 'Load test post body ' * 10,
+             'author_id': author, 'created_date': random_date(rng, now), 'category': rng.choice(FORUM_CATEGORIES),
+             'likes': int(rng.paretovariate(1.5)) - 1, 'views': int(rng.paretovariate(1.2) * 10), 'is_pinned': False}
+            for post_id, author in zip(post_ids, creators.pick(counts['posts']))))
+
+        hot_posts = PowerLawPicker(post_ids, 1.0, rng)
+        step('comments', models.Comment, (
+            {'content': 'Synthetic comment', 'author_id': author, 'post_id': post_id,
+             'created_date': random_date(rng, now)}
+            for author, post_id in zip(creators.pick(counts['comments']), hot_posts.pick(counts['comments']))))
+
+        step('follows', models.UserFollow, follow_rows(user_ids, celebrities, counts['follows'], rng, now))
+
+        hot_artworks = PowerLawPicker(artwork_ids, 0.9, rng)
+        step('activity', models.ActivityFeed, (
+            {'user_id': user_id, 'action_type': 'upload', 'target_type': 'artwork', 'target_id': artwork_id,
+             'message': f'seed_user_{user_id} uploaded a new artwork', 'created_at': random_date(rng, now, 90)}
+            for user_id, artwork_id in zip(creators.pick(counts['activity']), hot_artworks.pick(counts['activity']))))
+
+        step('notifications', models.Notification, notification_rows(user_ids, celebrities, post_ids, artwork_ids,
+                                                                    counts['notifications'], rng, now))
+
+        battle_targets = seed_battles(models, counts, user_ids, artwork_ids, rng, now, step)
+
+        lesson_ids = [lesson_id for lesson_id, in db.session.query(models.Lesson.id)]
+        challenge_ids = [challenge_id for challenge_id, in db.session.query(models.Challenge.id)]
+
+    def sample(ids):
+        return rng.sample(list(ids), min(len(ids), SUMMARY_SAMPLE))
+
+    return {
+        'users': [[user_id, f'seed_user_{user_id}'] for user_id in sample(user_ids)],
+        'artwork_ids': sample(artwork_ids),
+        'post_ids': sample(post_ids),
+        'battle_targets': sample(battle_targets),
+        'lesson_ids': lesson_ids,
+        'challenge_ids': challenge_ids,
+        'image_files': [os.path.abspath(os.path.join(app.config['UPLOAD_FOLDER'], f)) for f in filenames]
+        if images else [],
+        'counts': counts,
+    }
+
+
+def follow_rows(user_ids, celebrities, total, rng, now):
+    """Each user follows a few accounts, chosen with power-law popularity"""
+    per_user = total / len(user_ids)
+    remaining = total
+    for follower in user_ids:
+        if remaining <= 0:
+            break
+        wanted = min(int(rng.expovariate(1 / per_user)) if per_user else 0, len(user_ids) - 1, remaining)
+        following = set()
+        for _ in range(wanted * 3):
+            if len(following) >= wanted:
+                break
+            candidate = celebrities.pick()[0]
+            if candidate != follower:
+                following.add(candidate)
+        remaining -= len(following)
+        for followed in following:
+            yield {'follower_id': follower, 'following_id': followed, 'created_at': random_date(rng, now)}
+
+
+def notification_rows(user_ids, celebrities, post_ids, artwork_ids, total, rng, now):
+    """Popular users receive most notifications; older ones are mostly read"""
+    for user_id in celebrities.pick(total):
+        kind = rng.choice(NOTIFICATION_TYPES)
+        created = random_date(rng, now, 180)
+        yield {'user_id': user_id, 'type': kind, 'title': f'New {kind}', 'message': f'Synthetic {kind} notification',
+               'url': None, 'is_read': created < now - timedelta(days=7) or rng.random() < 0.5, 'created_at': created,
+               'related_user_id': rng.choice(user_ids),
+               'related_post_id': rng.choice(post_ids) if kind == 'comment' else None,
+               'related_artwork_id': rng.choice(artwork_ids) if kind == 'like' else None}
+
+
+def seed_battles(models, counts, user_ids, artwork_ids, rng, now, step):
+    """Battles (about a third finished, the rest voting), submissions and hot-skewed votes"""
+    first_battle = first_free_id(models.ArtBattle)
+    battle_ids = range(first_battle, first_battle + counts['battles'])
+    battles = []
+    for battle_id in battle_ids:
+        finished = rng.random() < 0.33
+        end_date = now - timedelta(days=rng.randint(40, 300) if finished else 1)
+        battles.append({'id': battle_id, 'title': f'Synthetic battle {battle_id}', 'theme': 'Load testing',
+                        'description': '', 'start_date': end_date - timedelta(days=7), 'end_date': end_date,
+                        'voting_end_date': end_date + timedelta(days=7) if finished else now + timedelta(days=30),
+                        'max_participants': counts['submissions_per_battle'], 'entry_fee': 0, 'prize_exp': 100,
+                        'status': 'completed' if finished else 'voting', 'created_by': rng.choice(user_ids)})
+    step('battles', models.ArtBattle, battles)
+
+    first_submission = first_free_id(models.BattleSubmission)
+    submissions = []
+    for battle in battles:
+        for user_id in rng.sample(user_ids, min(counts['submissions_per_battle'], len(user_ids))):
+            submissions.append({'id': first_submission + len(submissions), 'battle_id': battle['id'],
+                                'user_id': user_id, 'artwork_id': rng.choice(artwork_ids),
+                                'submission_date': battle['start_date'], 'votes': 0})
+
+    by_battle = {}
+    for submission in submissions:
+        by_battle.setdefault(submission['battle_id'], []).append(submission)
+
+    # A handful of hot battles attract most votes, and within a battle a few entries lead.
+    # One vote per user per battle, never for their own entry, as vote_battle enforces
+    votes = []
+    for battle_id, vote_count in PowerLawPicker(battle_ids, 1.2, rng).share(counts['votes']).items():
+        entries = by_battle[battle_id]
+        favourites = PowerLawPicker(range(len(entries)), 1.0, rng)
+        owners = {entry['user_id'] for entry in entries}
+        voters = [v for v in rng.sample(user_ids, min(vote_count + len(owners), len(user_ids))) if v not in owners]
+        voters = voters[:vote_count]
+        for voter, index in zip(voters, favourites.pick(len(voters))):
+            entries[index]['votes'] += 1
+            votes.append({'battle_id': battle_id, 'submission_id': entries[index]['id'], 'voter_id': voter,
+                          'vote_date': now - timedelta(days=rng.randint(0, 6))})
+
+    step('battle submissions', models.BattleSubmission, submissions)
+    step('battle votes', models.BattleVote, votes)
+
+    voting = {battle['id'] for battle in battles if battle['status'] == 'voting'}
+    return [(s['battle_id'], s['id'], s['user_id']) for s in submissions if s['battle_id'] in voting]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Seed the ArtAI database with synthetic data')
+    parser.add_argument('--scale', choices=list(SCALES), default='small')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--images', type=int, help='synthetic image files to generate (0 = none, default per scale)')
+    parser.add_argument('--summary', help='write a sample of the seeded ids as JSON to this path')
+    args = parser.parse_args()
+
+    from application import create_app
+    app = create_app()
+    started = time.perf_counter()
+    summary = seed(app, args.scale, args.seed, args.images)
+    if args.summary:
+        with open(args.summary, 'w') as f:
+            json.dump(summary, f)
+    total = sum(value for key, value in summary['counts'].items() if key not in ('submissions_per_battle', 'images'))
+    print(f"✅ Seeded about {total:,} rows ('{args.scale}') into {app.config['SQLALCHEMY_DATABASE_URI']} "
+          f"in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,3 @@
+"""
+Route blueprints; application.BLUEPRINTS lists them in registration order
+"""
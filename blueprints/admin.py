@@ -0,0 +1,290 @@
+"""
+Admin panel, analytics, maintenance and performance pages
+"""
+
+from datetime import datetime, timedelta
+
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, current_app
+from flask_login import login_required, current_user
+
+from extensions import db, ai_guide_generator, request_profiler
+from models import (
+    User, Artwork, Challenge, ForumPost, LearningPath, Lesson, UserPathProgress, ArtBattle, BattleSubmission,
+    UserStats
+)
+
+bp = Blueprint('admin', __name__)
+
+# Admin routes
+@bp.route('/admin')
+@login_required
+def admin_panel():
+    if not current_user.is_admin:
+        flash('Access denied')
+        return redirect(url_for('main.index'))
+    
+    users = User.query.all()
+    challenges = Challenge.query.all()
+    learning_paths = LearningPath.query.all()
+    
+    # Calculate admin statistics
+    stats = {
+        'total_users': User.query.count(),
+        'total_artworks': Artwork.query.count(),
+        'total_challenges': Challenge.query.filter_by(is_active=True).count(),
+        'total_posts': ForumPost.query.count(),
+        'total_battles': ArtBattle.query.count(),
+        'total_learning_paths': LearningPath.query.filter_by(is_active=True).count(),
+        'recent_signups': User.query.filter(User.join_date >= datetime.utcnow() - timedelta(days=7)).count(),
+        'active_battles': ArtBattle.query.filter(ArtBattle.end_date > datetime.utcnow()).count()
+    }
+    
+    return render_template('admin_panel.html', users=users, challenges=challenges, 
+                         learning_paths=learning_paths, stats=stats)
+
+@bp.route('/admin/challenge/new', methods=['GET', 'POST'])
+@login_required
+def new_challenge():
+    if not current_user.is_admin:
+        flash('Access denied')
+        return redirect(url_for('main.index'))
+    
+    if request.method == 'POST':
+        challenge = Challenge(
+            title=request.form['title'],
+            description=request.form['description'],
+            requirements=request.form['requirements'],
+            difficulty=request.form['difficulty'],
+            reward_exp=int(request.form['reward_exp'])
+        )
+        db.session.add(challenge)
+        db.session.commit()
+        flash('Challenge created successfully!')
+        return redirect(url_for('admin.admin_panel'))
+    
+    return render_template('new_challenge.html')
+
+@bp.route('/admin/learning_path/new', methods=['GET', 'POST'])
+@login_required
+def new_learning_path():
+    if not current_user.is_admin:
+        flash('Access denied')
+        return redirect(url_for('main.index'))
+    
+    if request.method == 'POST':
+        learning_path = LearningPath(
+            title=request.form['title'],
+            description=request.form['description'],
+            difficulty=request.form['difficulty'],
+            order=int(request.form['order'])
+        )
+        db.session.add(learning_path)
+        db.session.commit()
+        flash('Learning path created successfully!')
+        return redirect(url_for('admin.admin_panel'))
+    
+    return render_template('new_learning_path.html')
+
+@bp.route('/admin/ai_learning_path', methods=['GET', 'POST'])
+@login_required
+def admin_ai_learning_path():
+    """Create learning paths with AI assistance"""
+    if not current_user.is_admin:
+        flash('Access denied')
+        return redirect(url_for('main.index'))
+    
+    if request.method == 'POST':
+        topic = request.form.get('topic', '').strip()
+        difficulty = request.form.get('difficulty', 'Beginner')
+        description = request.form.get('description', '').strip()
+        
+        if not topic:
+            flash('Topic is required')
+            return render_template('admin_ai_learning_path.html')
+        
+        try:
+            # Generate AI-powered learning path
+            ai_content = ai_guide_generator.generate_comprehensive_learning_path(
+                topic, difficulty, description
+            )
+            
+            # Create the learning path
+            learning_path = LearningPath(
+                title=ai_content['title'],
+                description=ai_content['description'],
+                difficulty=difficulty,
+                order=LearningPath.query.count() + 1,
+                category=ai_content.get('category', 'General'),
+                estimated_hours=ai_content.get('estimated_hours', 2)
+            )
+            db.session.add(learning_path)
+            db.session.flush()  # Get the ID
+            
+            # Create lessons for this learning path
+            for lesson_data in ai_content.get('lessons', []):
+                lesson = Lesson(
+                    path_id=learning_path.id,
+                    title=lesson_data['title'],
+                    content=lesson_data['content'],
+                    lesson_type=lesson_data.get('type', 'theory'),
+                    order=lesson_data['order'],
+                    estimated_minutes=lesson_data.get('estimated_minutes', 15),
+                    completion_xp=lesson_data.get('xp', 10)
+                )
+                db.session.add(lesson)
+            
+            db.session.commit()
+            flash(f'AI-generated learning path "{ai_content["title"]}" created successfully with {len(ai_content.get("lessons", []))} lessons!')
+            return redirect(url_for('admin.admin_panel'))
+            
+        except Exception as e:
+            flash(f'Error creating AI learning path: {str(e)}')
+            return render_template('admin_ai_learning_path.html')
+    
+    return render_template('admin_ai_learning_path.html')
+
+@bp.route('/admin/analytics')
+@login_required
+def admin_analytics():
+    """Advanced analytics dashboard for admins"""
+    if not current_user.is_admin:
+        flash('Access denied')
+        return redirect(url_for('main.index'))
+    
+    # User growth analytics
+    user_growth = []
+    for i in range(30):  # Last 30 days
+        date = datetime.utcnow().date() - timedelta(days=i)
+        count = User.query.filter(User.join_date >= date).count()
+        user_growth.append({'date': date.strftime('%Y-%m-%d'), 'count': count})
+    
+    # Most active users
+    top_users = db.session.query(User, UserStats).join(UserStats).order_by(
+        (UserStats.total_artworks + UserStats.total_comments_made + UserStats.battles_participated).desc()
+    ).limit(10).all()
+    
+    # Popular learning paths
+    popular_paths = db.session.query(LearningPath, db.func.count(UserPathProgress.id)).outerjoin(
+        UserPathProgress
+    ).group_by(LearningPath.id).order_by(db.func.count(UserPathProgress.id).desc()).limit(5).all()
+    
+    # Battle participation stats
+    battle_stats = {
+        'total_battles': ArtBattle.query.count(),
+        'active_battles': ArtBattle.query.filter(ArtBattle.end_date > datetime.utcnow()).count(),
+        'completed_battles': ArtBattle.query.filter(ArtBattle.end_date <= datetime.utcnow()).count(),
+        'total_submissions': BattleSubmission.query.count()
+    }
+    
+    return render_template('admin_analytics.html', 
+                         user_growth=user_growth, 
+                         top_users=top_users,
+                         popular_paths=popular_paths,
+                         battle_stats=battle_stats)
+
+@bp.route('/admin/user/<int:user_id>/toggle_admin', methods=['POST'])
+@login_required
+def toggle_user_admin(user_id):
+    """Toggle admin status for a user"""
+    if not current_user.is_admin:
+        return jsonify({'error': 'Access denied'}), 403
+    
+    user = User.query.get_or_404(user_id)
+    if user.id == current_user.id:
+        return jsonify({'error': 'Cannot modify your own admin status'}), 400
+    
+    user.is_admin = not user.is_admin
+    db.session.commit()
+    
+    return jsonify({
+        'success': True, 
+        'is_admin': user.is_admin,
+        'message': f'User {user.username} admin status updated'
+    })
+
+@bp.route('/admin/maintenance')
+@login_required
+def maintenance_panel():
+    """System maintenance and cleanup tools"""
+    if not current_user.is_admin:
+        flash('Access denied')
+        return redirect(url_for('main.index'))
+    
+    # System health checks
+    health_stats = {
+        'database_size': 'N/A',  # Would need OS-specific implementation
+        'orphaned_files': 0,     # Could check for files without database records
+        'inactive_users': User.query.filter(User.join_date < datetime.utcnow() - timedelta(days=90)).count(),
+        'empty_learning_paths': LearningPath.query.filter(~LearningPath.lessons.any()).count(),
+        'unmoderated_posts': ForumPost.query.filter_by(is_approved=False).count() if hasattr(ForumPost, 'is_approved') else 0
+    }
+    
+    return render_template('maintenance_panel.html', health_stats=health_stats)
+
+@bp.route('/admin/performance')
+@login_required
+def performance_panel():
+    """Slow-request log and per-request profiling data"""
+    if not current_user.is_admin:
+        flash('Access denied')
+        return redirect(url_for('main.index'))
+    
+    slow_requests = request_profiler.read_slow_requests(limit=100)
+    
+    # Aggregate by endpoint so the worst routes stand out
+    endpoint_stats = {}
+    for entry in slow_requests:
+        stats = endpoint_stats.setdefault(entry.get('endpoint') or entry['path'], {
+            'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'sql_ms': 0.0, 'queries': 0
+        })
+        stats['count'] += 1
+        stats['total_ms'] += entry['total_ms']
+        stats['max_ms'] = max(stats['max_ms'], entry['total_ms'])
+        stats['sql_ms'] += entry['sql_ms']
+        stats['queries'] += entry['query_count']
+    
+    endpoint_summary = sorted(
+        ({'endpoint': name,
+          'count': stats['count'],
+          'avg_ms': stats['total_ms'] / stats['count'],
+          'max_ms': stats['max_ms'],
+          'avg_sql_ms': stats['sql_ms'] / stats['count'],
+          'avg_queries': stats['queries'] / stats['count']}
+         for name, stats in endpoint_stats.items()),
+        key=lambda row: row['avg_ms'], reverse=True
+    )
+    
+    return render_template('performance_panel.html',
+                         slow_requests=slow_requests,
+                         endpoint_summary=endpoint_summary,
+                         slow_threshold_ms=current_app.config['SLOW_REQUEST_MS'])
+
+@bp.route('/api/user_activity')
+@login_required
+def user_activity_api():
+    """API endpoint for user activity data"""
+    if not current_user.is_admin:
+        return jsonify({'error': 'Access denied'}), 403
+    
+    # Daily activity for the last 7 days
+    activity_data = []
+    for i in range(7):
+        date = datetime.utcnow().date() - timedelta(days=i)
+        
+        # Count various activities for this date
+        artworks = Artwork.query.filter(
+            db.func.date(Artwork.upload_date) == date
+        ).count()
+        
+        posts = ForumPost.query.filter(
+            db.func.date(ForumPost.created_date) == date
+        ).count()
+        
+        activity_data.append({
+            'date': date.strftime('%Y-%m-%d'),
+            'artworks': artworks,
+            'posts': posts,
+            'total': artworks + posts
+        })
+    
+    return jsonify(activity_data)
@@ -0,0 +1,255 @@
+"""
+AI image routes: redraw, style transfer and color palettes
+"""
+
+import json
+import os
+from itertools import chain
+
+from flask import (
+    Blueprint, Response, render_template, request, redirect, url_for, flash, jsonify, current_app, stream_with_context
+)
+from flask_login import login_required
+
+from extensions import image_operation, image_service
+from image_service import ImageServiceError
+from models import Artwork
+from styles import STYLE_IDS, STYLES
+
+bp = Blueprint('ai', __name__)
+
+
+# Pages show redraws and styles at this size; full resolution is rendered on request and cached
+PREVIEW_MAX_SIDE = 1024
+
+@bp.route('/ai_redraw/<int:artwork_id>')
+@login_required
+def ai_redraw(artwork_id):
+    try:
+        artwork = Artwork.query.get_or_404(artwork_id)
+        
+        # Check if the artwork file exists
+        file_path = os.path.join(current_app.config['UPLOAD_FOLDER'], artwork.filename)
+        if not os.path.exists(file_path):
+            flash('Original artwork file not found.', 'error')
+            return redirect(url_for('gallery.gallery'))
+        
+        # Attempt to redraw the artwork
+        with image_operation('redraw'):
+            redrawn_image, message = image_service.redraw_artwork(file_path, PREVIEW_MAX_SIDE)
+        
+        if redrawn_image is None:
+            flash(f'AI redraw failed: {message}', 'error')
+            return redirect(url_for('gallery.artwork_detail', artwork_id=artwork_id))
+        
+        return render_template('ai_redraw.html', artwork=artwork, redrawn_image=redrawn_image, message=message)
+    
+    except ImageServiceError as e:
+        flash(f'AI redraw failed: {str(e)}', 'error')
+        return redirect(url_for('gallery.artwork_detail', artwork_id=artwork_id))
+    except Exception as e:
+        flash(f'An error occurred during AI redraw: {str(e)}', 'error')
+        return redirect(url_for('gallery.gallery'))
+
+@bp.route('/ai_redraw/<int:artwork_id>/full')
+@login_required
+def ai_redraw_full(artwork_id):
+    """Download the full-resolution redraw, rendering it the first time it is asked for"""
+    try:
+        artwork = Artwork.query.get_or_404(artwork_id)
+        file_path = os.path.join(current_app.config['UPLOAD_FOLDER'], artwork.filename)
+        
+        if not os.path.exists(file_path):
+            flash('Original artwork file not found.', 'error')
+            return redirect(url_for('gallery.gallery'))
+        
+        with image_operation('redraw_full'):
+            render_url, message = full_resolution_render(file_path)
+        
+        if render_url is None:
+            flash(f'AI redraw failed: {message}', 'error')
+            return redirect(url_for('ai.ai_redraw', artwork_id=artwork_id))
+        
+        return redirect(render_url)
+    
+    except ImageServiceError as e:
+        flash(f'AI redraw failed: {str(e)}', 'error')
+        return redirect(url_for('ai.ai_redraw', artwork_id=artwork_id))
+    except Exception as e:
+        flash(f'An error occurred during AI redraw: {str(e)}', 'error')
+        return redirect(url_for('gallery.gallery'))
+
+def full_resolution_render(file_path, style_name=None):
+    """Static URL of the cached full-size render of an upload, and a message"""
+    render_dir = os.path.join(current_app.config['UPLOAD_FOLDER'], 'renders')
+    render_path, message = image_service.render_full_resolution(file_path, render_dir, style_name)
+    if render_path is None:
+        return None, message
+    return url_for('static', filename='uploads/renders/' + os.path.basename(render_path)), message
+
+@bp.route('/ai_style_transfer/<int:artwork_id>')
+@login_required
+def ai_style_transfer_page(artwork_id):
+    artwork = Artwork.query.get_or_404(artwork_id)
+    
+    return render_template('ai_style_transfer.html', artwork=artwork, styles=STYLES)
+
+@bp.route('/style_previews/<int:artwork_id>')
+@login_required
+def style_previews(artwork_id):
+    """Stream small previews of all (or ?styles=a,b) styles as JSON lines, each as soon as it is rendered"""
+    artwork = Artwork.query.get_or_404(artwork_id)
+    file_path = os.path.join(current_app.config['UPLOAD_FOLDER'], artwork.filename)
+    
+    if not os.path.exists(file_path):
+        return jsonify({'success': False, 'error': 'Artwork file not found'})
+    
+    requested = request.args.get('styles')
+    styles = [name for name in requested.split(',') if name in STYLE_IDS] if requested else STYLE_IDS
+    
+    # Start rendering now so a busy image service is still reported as a 503
+    results = timed_previews(image_service.style_previews(file_path, styles))
+    try:
+        first = next(results, None)
+    except ImageServiceError as e:
+        return jsonify({'success': False, 'error': str(e)}), 503
+    
+    def generate():
+        if first is None:
+            return
+        try:
+            for style_name, styled_image, message in chain([first], results):
+                yield json.dumps({
+                    'success': styled_image is not None,
+                    'style': style_name,
+                    'styled_image': styled_image,
+                    'message': message
+                }) + '\n'
+        except ImageServiceError as e:
+            yield json.dumps({'success': False, 'error': str(e)}) + '\n'
+    
+    # X-Accel-Buffering stops nginx from holding the lines back until the end
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson',
+                    headers={'X-Accel-Buffering': 'no', 'Cache-Control': 'no-store'})
+
+def timed_previews(results):
+    """Count the whole preview batch as one image operation"""
+    with image_operation('style_previews'):
+        yield from results
+
+@bp.route('/apply_style/<int:artwork_id>/<style_name>')
+@login_required
+def apply_style(artwork_id, style_name):
+    """Render a style at preview size, or with ?quality=full return the URL of the full-size image"""
+    try:
+        artwork = Artwork.query.get_or_404(artwork_id)
+        file_path = os.path.join(current_app.config['UPLOAD_FOLDER'], artwork.filename)
+        
+        if not os.path.exists(file_path):
+            return jsonify({'success': False, 'error': 'Artwork file not found'})
+        
+        if request.args.get('quality') == 'full':
+            if style_name not in STYLE_IDS:
+                return jsonify({'success': False, 'error': f'Unknown style: {style_name}'})
+            
+            with image_operation('style_transfer_full', style_name):
+                image_url, message = full_resolution_render(file_path, style_name)
+            
+            if image_url is None:
+                return jsonify({'success': False, 'error': message})
+            
+            return jsonify({'success': True, 'image_url': image_url, 'message': message})
+        
+        with image_operation('style_transfer', style_name):
+            styled_image, message = image_service.apply_style_transfer(file_path, style_name, PREVIEW_MAX_SIDE)
+        
+        if styled_image is None:
+            return jsonify({'success': False, 'error': message})
+        
+        return jsonify({
+            'success': True, 
+            'styled_image': styled_image, 
+            'message': message,
+            'style_name': style_name.replace('_', ' ').title()
+        })
+    
+    except ImageServiceError as e:
+        return jsonify({'success': False, 'error': str(e)}), 503
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@bp.route('/color_palette/<int:artwork_id>')
+@login_required
+def generate_palette(artwork_id):
+    palette_type = request.args.get('type', 'harmonious')
+    
+    try:
+        artwork = Artwork.query.get_or_404(artwork_id)
+        file_path = os.path.join(current_app.config['UPLOAD_FOLDER'], artwork.filename)
+        
+        if not os.path.exists(file_path):
+            return jsonify({'success': False, 'error': 'Artwork file not found'})
+        
+        with image_operation('palette'):
+            palette_data, message = image_service.generate_color_palette(file_path, palette_type)
+        
+        if palette_data is None:
+            return jsonify({'success': False, 'error': message})
+        
+        return jsonify({
+            'success': True,
+            'palette': palette_data,
+            'message': message
+        })
+    
+    except ImageServiceError as e:
+        return jsonify({'success': False, 'error': str(e)}), 503
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@bp.route('/api/ai_analyze_drawing', methods=['POST'])
+@login_required
+def ai_analyze_drawing():
+    """Analyze drawing and provide AI suggestions"""
+    try:
+        data = request.get_json()
+        image_data = data.get('image_data')
+        
+        if not image_data:
+            return jsonify({'error': 'No image data provided'}), 400
+        
+        # Simulate AI analysis (replace with actual AI service)
+        suggestions = [
+            "Consider adding more contrast to make the subject stand out",
+            "The composition could benefit from the rule of thirds",
+            "Try adding highlights to create more depth",
+            "The color palette is well balanced",
+            "Consider adding shadows for more realism"
+        ]
+        
+        return jsonify({'suggestions': suggestions})
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/ai_style_transfer', methods=['POST'])
+@login_required
+def ai_style_transfer():
+    """Apply AI style transfer to drawing"""
+    try:
+        data = request.get_json()
+        image_data = data.get('image_data')
+        style = data.get('style', 'Van Gogh')
+        
+        if not image_data:
+            return jsonify({'error': 'No image data provided'}), 400
+        
+        # Simulate style transfer (replace with actual AI service)
+        # For now, just return the original image with a message
+        return jsonify({
+            'styled_image': image_data,
+            'message': f'Style transfer with {style} style applied (simulated)'
+        })
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
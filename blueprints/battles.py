@@ -0,0 +1,274 @@
+"""
+Art battles: creation, submissions, voting and results
+"""
+
+from datetime import datetime
+
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
+from flask_login import login_required, current_user
+
+from extensions import db, uploads
+from image_ingest import UploadRejected
+from models import User, Artwork, ArtBattle, BattleSubmission, BattleVote, loading_profile
+from services import update_user_stats
+
+bp = Blueprint('battles', __name__)
+
+@bp.route('/battles')
+def art_battles():
+    active_battles = ArtBattle.query.filter_by(status='active').all()
+    upcoming_battles = ArtBattle.query.filter_by(status='upcoming').all()
+    completed_battles = ArtBattle.query.filter_by(status='completed').order_by(ArtBattle.end_date.desc()).limit(5).all()
+    
+    return render_template('art_battles.html', 
+                         active_battles=active_battles,
+                         upcoming_battles=upcoming_battles,
+                         completed_battles=completed_battles)
+
+@bp.route('/battle/<int:battle_id>')
+def battle_detail(battle_id):
+    battle = ArtBattle.query.get_or_404(battle_id)
+    submissions = BattleSubmission.query.options(*loading_profile('battle_detail')).filter_by(
+        battle_id=battle_id).all()
+    
+    user_submission = None
+    if current_user.is_authenticated:
+        user_submission = BattleSubmission.query.filter_by(
+            battle_id=battle_id, 
+            user_id=current_user.id
+        ).first()
+    
+    return render_template('battle_detail.html', 
+                         battle=battle, 
+                         submissions=submissions, 
+                         user_submission=user_submission)
+
+# Art Battle Routes
+@bp.route('/battles/create', methods=['GET', 'POST'])
+@login_required
+def create_battle():
+    if request.method == 'POST':
+        title = request.form['title']
+        description = request.form['description']
+        theme = request.form['theme']
+        start_date = datetime.strptime(request.form['start_date'], '%Y-%m-%dT%H:%M')
+        end_date = datetime.strptime(request.form['end_date'], '%Y-%m-%dT%H:%M')
+        voting_end_date = datetime.strptime(request.form['voting_end_date'], '%Y-%m-%dT%H:%M')
+        max_participants = int(request.form.get('max_participants', 50))
+        prize_description = request.form.get('prize_description', '')
+        
+        # Validate dates
+        if start_date >= end_date or end_date >= voting_end_date:
+            flash('Invalid dates. Start < Submission End < Voting End', 'error')
+            return redirect(url_for('battles.create_battle'))
+        
+        battle = ArtBattle(
+            title=title,
+            description=description,
+            theme=theme,
+            start_date=start_date,
+            end_date=end_date,
+            voting_end_date=voting_end_date,
+            max_participants=max_participants,
+            prize_description=prize_description,
+            creator_id=current_user.id
+        )
+        
+        db.session.add(battle)
+        db.session.commit()
+        
+        flash('Art Battle created successfully!', 'success')
+        return redirect(url_for('battles.battle_detail', battle_id=battle.id))
+    
+    return render_template('create_battle.html')
+
+@bp.route('/battle/<int:battle_id>/join', methods=['POST'])
+@login_required
+def join_battle(battle_id):
+    battle = ArtBattle.query.get_or_404(battle_id)
+    
+    # Check if battle is open for submissions
+    now = datetime.utcnow()
+    if now < battle.start_date:
+        return jsonify({'success': False, 'error': 'Battle has not started yet'})
+    if now > battle.end_date:
+        return jsonify({'success': False, 'error': 'Battle submission period has ended'})
+    
+    # Check if user already submitted
+    existing_submission = BattleSubmission.query.filter_by(
+        battle_id=battle_id, user_id=current_user.id
+    ).first()
+    
+    if existing_submission:
+        return jsonify({'success': False, 'error': 'You have already submitted to this battle'})
+    
+    # Check if battle is full
+    current_participants = BattleSubmission.query.filter_by(battle_id=battle_id).count()
+    if current_participants >= battle.max_participants:
+        return jsonify({'success': False, 'error': 'Battle is full'})
+    
+    return jsonify({'success': True, 'message': 'You can now submit your artwork'})
+
+@bp.route('/battle/<int:battle_id>/submit', methods=['POST'])
+@login_required
+def submit_to_battle(battle_id):
+    battle = ArtBattle.query.get_or_404(battle_id)
+    
+    # Validation checks (same as join_battle)
+    now = datetime.utcnow()
+    if now < battle.start_date or now > battle.end_date:
+        flash('Battle submission period is not active', 'error')
+        return redirect(url_for('battles.battle_detail', battle_id=battle_id))
+    
+    existing_submission = BattleSubmission.query.filter_by(
+        battle_id=battle_id, user_id=current_user.id
+    ).first()
+    
+    if existing_submission:
+        flash('You have already submitted to this battle', 'error')
+        return redirect(url_for('battles.battle_detail', battle_id=battle_id))
+    
+    # Handle file upload
+    if 'artwork_file' not in request.files:
+        flash('No artwork file provided', 'error')
+        return redirect(url_for('battles.battle_detail', battle_id=battle_id))
+    
+    file = request.files['artwork_file']
+    if file.filename == '':
+        flash('No file selected', 'error')
+        return redirect(url_for('battles.battle_detail', battle_id=battle_id))
+    
+    if file:
+        # Create artwork entry
+        try:
+            upload = uploads.ingest(file, 'battle')
+        except UploadRejected as e:
+            flash(str(e), 'error')
+            return redirect(url_for('battles.battle_detail', battle_id=battle_id))
+        
+        # Create artwork
+        artwork = Artwork(
+            title=request.form.get('title', f'Battle Entry: {battle.title}'),
+            description=request.form.get('description', f'My submission for {battle.title}'),
+            filename=upload['filename'],
+            phash=upload['phash'],
+            user_id=current_user.id
+        )
+        db.session.add(artwork)
+        db.session.flush()  # Get artwork ID
+        
+        # Create battle submission
+        submission = BattleSubmission(
+            battle_id=battle_id,
+            user_id=current_user.id,
+            artwork_id=artwork.id
+        )
+        db.session.add(submission)
+        
+        # Update user stats
+        update_user_stats(current_user.id, 'battles_participated')
+        
+        db.session.commit()
+        uploads.queue_analysis(artwork.id, upload)
+        
+        flash('Successfully submitted to the battle!', 'success')
+        return redirect(url_for('battles.battle_detail', battle_id=battle_id))
+    
+    flash('Invalid file type', 'error')
+    return redirect(url_for('battles.battle_detail', battle_id=battle_id))
+
+@bp.route('/battle/<int:battle_id>/vote/<int:submission_id>', methods=['POST'])
+@login_required
+def vote_battle(battle_id, submission_id):
+    battle = ArtBattle.query.get_or_404(battle_id)
+    submission = BattleSubmission.query.get_or_404(submission_id)
+    
+    # Check if voting is active
+    now = datetime.utcnow()
+    if now <= battle.end_date:
+        return jsonify({'success': False, 'error': 'Voting has not started yet'})
+    if now > battle.voting_end_date:
+        return jsonify({'success': False, 'error': 'Voting has ended'})
+    
+    # Check if user is trying to vote for their own submission
+    if submission.user_id == current_user.id:
+        return jsonify({'success': False, 'error': 'Cannot vote for your own submission'})
+    
+    # Check if user already voted in this battle
+    existing_vote = BattleVote.query.filter_by(
+        battle_id=battle_id, voter_id=current_user.id
+    ).first()
+    
+    if existing_vote:
+        # Update existing vote
+        existing_vote.submission_id = submission_id
+        existing_vote.vote_date = datetime.utcnow()
+    else:
+        # Create new vote
+        vote = BattleVote(
+            battle_id=battle_id,
+            submission_id=submission_id,
+            voter_id=current_user.id
+        )
+        db.session.add(vote)
+    
+    db.session.commit()
+    
+    # Get updated vote count
+    vote_count = BattleVote.query.filter_by(submission_id=submission_id).count()
+    
+    return jsonify({
+        'success': True, 
+        'message': 'Vote recorded!',
+        'vote_count': vote_count
+    })
+
+@bp.route('/battle/<int:battle_id>/results')
+def battle_results(battle_id):
+    battle = ArtBattle.query.get_or_404(battle_id)
+    
+    # Check if voting has ended
+    now = datetime.utcnow()
+    if now <= battle.voting_end_date:
+        flash('Voting is still in progress', 'info')
+        return redirect(url_for('battles.battle_detail', battle_id=battle_id))
+    
+    # Get submissions with vote counts
+    submissions = db.session.query(
+        BattleSubmission,
+        Artwork,
+        User,
+        db.func.count(BattleVote.id).label('vote_count')
+    ).join(
+        Artwork, BattleSubmission.artwork_id == Artwork.id
+    ).join(
+        User, BattleSubmission.user_id == User.id
+    ).outerjoin(
+        BattleVote, BattleSubmission.id == BattleVote.submission_id
+    ).filter(
+        BattleSubmission.battle_id == battle_id
+    ).group_by(
+        BattleSubmission.id
+    ).order_by(
+        db.func.count(BattleVote.id).desc()
+    ).all()
+    
+    # Update battle status if not already done
+    if battle.status != 'completed':
+        battle.status = 'completed'
+        
+        # Award winner
+        if submissions:
+            winner_submission = submissions[0][0]  # BattleSubmission object
+            battle.winner_id = winner_submission.user_id
+            
+            # Update winner stats
+            update_user_stats(winner_submission.user_id, 'battles_won')
+            
+            # Award experience to winner
+            winner = User.query.get(winner_submission.user_id)
+            winner.experience += 100  # Battle win bonus
+        
+        db.session.commit()
+    
+    return render_template('battle_results.html', battle=battle, submissions=submissions)
@@ -0,0 +1,112 @@
+"""
+Community forum
+"""
+
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
+from flask_login import login_required, current_user
+
+from extensions import db
+from models import ForumPost, Comment, ForumCategory, loading_profile
+from services import update_user_stats, check_achievements
+
+bp = Blueprint('forum', __name__)
+
+@bp.route('/forum')
+def forum():
+    page = request.args.get('page', 1, type=int)
+    category = request.args.get('category', '')
+    
+    query = ForumPost.query.options(*loading_profile('forum'))
+    if category:
+        query = query.filter_by(category=category)
+    
+    posts = query.order_by(ForumPost.created_date.desc()).paginate(
+        page=page, per_page=10, error_out=False)
+    
+    categories = db.session.query(ForumPost.category).distinct().all()
+    categories = [cat[0] for cat in categories if cat[0]]
+    
+    return render_template('forum.html', posts=posts, categories=categories)
+
+@bp.route('/forum/post/<int:post_id>')
+def forum_post(post_id):
+    post = ForumPost.query.get_or_404(post_id)
+    return render_template('forum_post.html', post=post)
+
+@bp.route('/forum/new_post', methods=['GET', 'POST'])
+@login_required
+def new_post():
+    if request.method == 'POST':
+        post = ForumPost(
+            title=request.form['title'],
+            content=request.form['content'],
+            author_id=current_user.id,
+            category=request.form.get('category', 'General')
+        )
+        db.session.add(post)
+        db.session.commit()
+        flash('Post created successfully!')
+        return redirect(url_for('forum.forum'))
+    
+    return render_template('new_post.html')
+
+@bp.route('/forum/post/<int:post_id>/comment', methods=['POST'])
+@login_required
+def add_comment(post_id):
+    comment = Comment(
+        content=request.form['content'],
+        author_id=current_user.id,
+        post_id=post_id
+    )
+    db.session.add(comment)
+    db.session.commit()
+    flash('Comment added successfully!')
+    return redirect(url_for('forum.forum_post', post_id=post_id))
+
+@bp.route('/forum/post/<int:post_id>/like', methods=['POST'])
+@login_required
+def like_post(post_id):
+    post = ForumPost.query.get_or_404(post_id)
+    post.likes += 1
+    db.session.commit()
+    
+    # Update user stats
+    update_user_stats(current_user.id, 'likes_given')
+    check_achievements(post.author_id)
+    
+    return jsonify({'success': True, 'likes': post.likes})
+
+@bp.route('/forum/categories')
+def forum_categories():
+    categories = ForumCategory.query.all()
+    
+    # Get post counts and latest posts for each category
+    category_stats = []
+    for category in categories:
+        post_count = ForumPost.query.filter_by(category_id=category.id).count()
+        latest_post = ForumPost.query.filter_by(category_id=category.id).order_by(
+            ForumPost.created_date.desc()
+        ).first()
+        
+        category_stats.append({
+            'category': category,
+            'post_count': post_count,
+            'latest_post': latest_post
+        })
+    
+    return render_template('forum_categories.html', category_stats=category_stats)
+
+@bp.route('/forum/category/<int:category_id>')
+def forum_category_posts(category_id):
+    category = ForumCategory.query.get_or_404(category_id)
+    page = request.args.get('page', 1, type=int)
+    per_page = 10
+    
+    posts = ForumPost.query.filter_by(category_id=category_id).order_by(
+        ForumPost.is_pinned.desc(),
+        ForumPost.created_date.desc()
+    ).paginate(
+        page=page, per_page=per_page, error_out=False
+    )
+    
+    return render_template('forum_category_posts.html', category=category, posts=posts)
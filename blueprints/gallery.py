@@ -0,0 +1,303 @@
+"""
+Artwork uploads, the gallery, challenges and the drawing studio
+"""
+
+import base64
+import binascii
+from datetime import datetime, timedelta
+
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
+from flask_login import login_required, current_user
+
+from extensions import db, similarity_index, uploads
+from image_ingest import UploadRejected
+from models import Artwork, Challenge, ChallengeSubmission, loading_profile
+from services import update_user_stats, check_achievements
+
+bp = Blueprint('gallery', __name__)
+
+@bp.route('/upload', methods=['GET', 'POST'])
+@login_required
+def upload_artwork():
+    if request.method == 'POST':
+        if 'artwork' not in request.files:
+            flash('No file selected')
+            return redirect(request.url)
+        
+        file = request.files['artwork']
+        if file.filename == '':
+            flash('No file selected')
+            return redirect(request.url)
+        
+        if file:
+            try:
+                upload = uploads.ingest(file, 'gallery')
+            except UploadRejected as e:
+                flash(str(e))
+                return redirect(request.url)
+            
+            artwork = Artwork(
+                title=request.form['title'],
+                description=request.form['description'],
+                filename=upload['filename'],
+                phash=upload['phash'],
+                user_id=current_user.id,
+                category=request.form.get('category', 'Other'),
+                tags=request.form.get('tags', '')
+            )
+            
+            db.session.add(artwork)
+            db.session.commit()
+            
+            # AI feedback is added to the artwork once the analysis finishes
+            uploads.queue_analysis(artwork.id, upload)
+            
+            # Update user stats and check achievements
+            update_user_stats(current_user.id, 'artwork_uploaded')
+            check_achievements(current_user.id)
+            
+            flash('Artwork uploaded successfully!')
+            return redirect(url_for('gallery.gallery'))
+    
+    return render_template('upload.html')
+
+@bp.route('/gallery')
+def gallery():
+    page = request.args.get('page', 1, type=int)
+    category = request.args.get('category', '')
+    
+    query = Artwork.query.options(*loading_profile('gallery'))
+    if category:
+        query = query.filter_by(category=category)
+    
+    artworks = query.order_by(Artwork.upload_date.desc()).paginate(
+        page=page, per_page=12, error_out=False)
+    
+    categories = db.session.query(Artwork.category).distinct().all()
+    categories = [cat[0] for cat in categories if cat[0]]
+    
+    return render_template('gallery.html', artworks=artworks, categories=categories)
+
+@bp.route('/artwork/<int:artwork_id>')
+def artwork_detail(artwork_id):
+    artwork = Artwork.query.get_or_404(artwork_id)
+    similar_artworks = similarity_index.similar(artwork)
+    # Possible copies by other users are shown to the artist and the moderators
+    possible_duplicates = []
+    if current_user.is_authenticated and (current_user.id == artwork.user_id or current_user.is_admin):
+        possible_duplicates = similarity_index.duplicates(artwork)
+    return render_template('artwork_detail.html', artwork=artwork, similar_artworks=similar_artworks,
+                           possible_duplicates=possible_duplicates)
+
+@bp.route('/challenges')
+def challenges():
+    active_challenges = Challenge.query.filter_by(is_active=True).all()
+    completed_challenges = []
+    if current_user.is_authenticated:
+        completed_challenges = ChallengeSubmission.query.filter_by(
+            user_id=current_user.id, is_approved=True).all()
+    return render_template('challenges.html', 
+                         active_challenges=active_challenges,
+                         completed_challenges=completed_challenges)
+
+@bp.route('/challenge/<int:challenge_id>')
+def challenge_detail(challenge_id):
+    challenge = Challenge.query.get_or_404(challenge_id)
+    submissions = ChallengeSubmission.query.options(*loading_profile('challenge_detail')).filter_by(
+        challenge_id=challenge_id).all()
+    return render_template('challenge_detail.html', challenge=challenge, submissions=submissions)
+
+@bp.route('/submit_challenge/<int:challenge_id>', methods=['POST'])
+@login_required
+def submit_challenge(challenge_id):
+    challenge = Challenge.query.get_or_404(challenge_id)
+    
+    # Check if submitting from gallery
+    if request.form.get('from_gallery') == 'true':
+        selected_artwork_id = request.form.get('selected_artwork_id')
+        if not selected_artwork_id:
+            flash('No artwork selected from gallery')
+            return redirect(url_for('gallery.challenge_detail', challenge_id=challenge_id))
+        
+        # Verify the artwork belongs to the current user
+        artwork = Artwork.query.filter_by(id=selected_artwork_id, user_id=current_user.id).first()
+        if not artwork:
+            flash('Invalid artwork selection')
+            return redirect(url_for('gallery.challenge_detail', challenge_id=challenge_id))
+        
+        # Check if already submitted this artwork to this challenge
+        existing_submission = ChallengeSubmission.query.filter_by(
+            user_id=current_user.id, 
+            challenge_id=challenge_id,
+            artwork_id=artwork.id
+        ).first()
+        
+        if existing_submission:
+            flash('This artwork has already been submitted to this challenge')
+            return redirect(url_for('gallery.challenge_detail', challenge_id=challenge_id))
+        
+        # Create submission
+        submission = ChallengeSubmission(
+            user_id=current_user.id,
+            challenge_id=challenge_id,
+            artwork_id=artwork.id
+        )
+        db.session.add(submission)
+        db.session.commit()
+        
+        flash('Gallery artwork submitted successfully!')
+        return redirect(url_for('gallery.challenge_detail', challenge_id=challenge_id))
+    
+    # Original upload logic
+    if 'artwork_file' not in request.files:
+        flash('No file selected')
+        return redirect(url_for('gallery.challenge_detail', challenge_id=challenge_id))
+    
+    file = request.files['artwork_file']
+    if file.filename == '':
+        flash('No file selected')
+        return redirect(url_for('gallery.challenge_detail', challenge_id=challenge_id))
+    
+    if file:
+        try:
+            upload = uploads.ingest(file, 'challenge')
+        except UploadRejected as e:
+            flash(str(e))
+            return redirect(url_for('gallery.challenge_detail', challenge_id=challenge_id))
+        
+        # Create artwork first
+        artwork = Artwork(
+            title=f"Challenge: {challenge.title}",
+            description=request.form.get('description', ''),
+            filename=upload['filename'],
+            phash=upload['phash'],
+            user_id=current_user.id,
+            category='Challenge'
+        )
+        db.session.add(artwork)
+        db.session.flush()  # Get the artwork ID
+        
+        # Create submission
+        submission = ChallengeSubmission(
+            user_id=current_user.id,
+            challenge_id=challenge_id,
+            artwork_id=artwork.id
+        )
+        db.session.add(submission)
+        db.session.commit()
+        uploads.queue_analysis(artwork.id, upload)
+        
+        flash('Challenge submission successful!')
+        return redirect(url_for('gallery.challenge_detail', challenge_id=challenge_id))
+
+@bp.route('/api/user/artworks')
+@login_required
+def api_user_artworks():
+    """API endpoint to get current user's artworks for gallery selection"""
+    artworks = Artwork.query.filter_by(user_id=current_user.id).order_by(Artwork.upload_date.desc()).all()
+    
+    artworks_data = []
+    for artwork in artworks:
+        artworks_data.append({
+            'id': artwork.id,
+            'title': artwork.title,
+            'filename': artwork.filename,
+            'description': artwork.description,
+            'upload_date': artwork.upload_date.strftime('%Y-%m-%d'),
+            'category': artwork.category
+        })
+    
+    return jsonify(artworks_data)
+
+# Advanced Drawing Features
+@bp.route('/draw')
+@login_required
+def advanced_drawing():
+    """Advanced drawing studio with AI features"""
+    return render_template('advanced_drawing.html')
+
+@bp.route('/api/save_drawing', methods=['POST'])
+@login_required
+def save_drawing():
+    """Save drawing from canvas"""
+    try:
+        data = request.get_json()
+        image_data = data.get('image_data')
+        title = data.get('title', 'Untitled Drawing')
+        
+        if not image_data:
+            return jsonify({'error': 'No image data provided'}), 400
+        
+        # Remove data URL prefix
+        if image_data.startswith('data:image/png;base64,'):
+            image_data = image_data.replace('data:image/png;base64,', '')
+        
+        # Check and save image
+        try:
+            upload = uploads.ingest_bytes(base64.b64decode(image_data, validate=True), 'drawing')
+        except binascii.Error:
+            return jsonify({'error': 'Image data is not valid base64'}), 400
+        except UploadRejected as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # Create artwork record
+        artwork = Artwork(
+            title=title,
+            description="Created with Advanced Drawing Studio",
+            filename=upload['filename'],
+            phash=upload['phash'],
+            user_id=current_user.id,
+            category='Digital Art'
+        )
+        db.session.add(artwork)
+        
+        # Update user stats
+        update_user_stats(current_user.id, 'artwork_uploaded')
+        
+        db.session.commit()
+        uploads.queue_analysis(artwork.id, upload)
+        
+        return jsonify({'success': True, 'artwork_id': artwork.id})
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# Art Challenges System
+@bp.route('/daily_challenge')
+def daily_challenge():
+    """Daily art challenge with themes and prompts"""
+    today = datetime.utcnow().date()
+    
+    # Get today's challenge or create one
+    challenge = Challenge.query.filter(
+        db.func.date(Challenge.start_date) == today
+    ).first()
+    
+    if not challenge:
+        # Create daily challenge
+        themes = [
+            "Draw something blue", "Minimalist landscape", "Character portrait",
+            "Abstract emotions", "Favorite food", "Dream house", "Mythical creature",
+            "Retro futurism", "Nature scene", "Urban architecture"
+        ]
+        theme = themes[today.day % len(themes)]
+        
+        challenge = Challenge(
+            title=f"Daily Challenge - {theme}",
+            description=f"Today's theme: {theme}. Create your interpretation!",
+            requirements=f"Create artwork inspired by: {theme}",
+            end_date=datetime.combine(today + timedelta(days=1), datetime.min.time()),
+            difficulty='Beginner',
+            reward_exp=50
+        )
+        db.session.add(challenge)
+        db.session.commit()
+    
+    # Get today's submissions
+    submissions = ChallengeSubmission.query.filter_by(
+        challenge_id=challenge.id
+    ).join(Artwork).order_by(Artwork.upload_date.desc()).all()
+    
+    return render_template('daily_challenge.html',
+                         challenge=challenge,
+                         submissions=submissions)
@@ -0,0 +1,265 @@
+"""
+Learning paths, lessons, tutorials and AI study guides
+"""
+
+from datetime import datetime
+
+from flask import Blueprint, render_template, request, url_for, jsonify
+from flask_login import login_required, current_user
+
+from extensions import db, ai_guide_generator
+from models import LearningPath, Lesson, UserPathProgress, UserLessonProgress, Tutorial
+from services import create_notification, create_activity
+
+bp = Blueprint('learning', __name__)
+
+@bp.route('/roadmap')
+def roadmap():
+    learning_paths = LearningPath.query.filter_by(is_active=True).order_by(LearningPath.order).all()
+    return render_template('roadmap.html', learning_paths=learning_paths)
+
+@bp.route('/ai_guide/<int:path_id>')
+@login_required
+def ai_guide(path_id):
+    learning_path = LearningPath.query.get_or_404(path_id)
+    guide_content = ai_guide_generator.generate_guide(learning_path.title, learning_path.description)
+    return render_template('ai_guide.html', learning_path=learning_path, guide_content=guide_content)
+
+# Learning & Education Routes
+@bp.route('/learning')
+def learning_center():
+    # Get learning paths organized by category
+    categories = {}
+    all_paths = LearningPath.query.filter_by(is_active=True).order_by(LearningPath.order).all()
+    
+    for path in all_paths:
+        category = path.category
+        if category not in categories:
+            categories[category] = []
+        
+        # Get user progress if logged in
+        user_progress = None
+        if current_user.is_authenticated:
+            user_progress = UserPathProgress.query.filter_by(
+                user_id=current_user.id, path_id=path.id
+            ).first()
+        
+        categories[category].append({
+            'path': path,
+            'progress': user_progress
+        })
+    
+    # Get featured tutorials
+    featured_tutorials = Tutorial.query.filter_by(is_featured=True, is_active=True).limit(6).all()
+    
+    # Get recent tutorials
+    recent_tutorials = Tutorial.query.filter_by(is_active=True).order_by(
+        Tutorial.created_at.desc()
+    ).limit(8).all()
+    
+    return render_template('learning_center.html', 
+                         categories=categories,
+                         featured_tutorials=featured_tutorials,
+                         recent_tutorials=recent_tutorials)
+
+@bp.route('/learning/path/<int:path_id>')
+def learning_path_detail(path_id):
+    path = LearningPath.query.get_or_404(path_id)
+    lessons = Lesson.query.filter_by(path_id=path_id, is_active=True).order_by(Lesson.order).all()
+    
+    # Get user progress if logged in
+    user_progress = None
+    lesson_progress = {}
+    if current_user.is_authenticated:
+        user_progress = UserPathProgress.query.filter_by(
+            user_id=current_user.id, path_id=path_id
+        ).first()
+        
+        # Get progress for each lesson
+        for lesson in lessons:
+            progress = UserLessonProgress.query.filter_by(
+                user_id=current_user.id, lesson_id=lesson.id
+            ).first()
+            lesson_progress[lesson.id] = progress
+    
+    return render_template('learning_path_detail.html', 
+                         path=path, 
+                         lessons=lessons,
+                         user_progress=user_progress,
+                         lesson_progress=lesson_progress)
+
+@bp.route('/learning/lesson/<int:lesson_id>')
+@login_required
+def lesson_detail(lesson_id):
+    lesson = Lesson.query.get_or_404(lesson_id)
+    path = lesson.learning_path
+    
+    # Get or create user progress
+    user_progress = UserPathProgress.query.filter_by(
+        user_id=current_user.id, path_id=path.id
+    ).first()
+    
+    if not user_progress:
+        user_progress = UserPathProgress(
+            user_id=current_user.id,
+            path_id=path.id,
+            current_lesson_id=lesson_id
+        )
+        db.session.add(user_progress)
+        db.session.commit()
+    
+    # Get lesson progress
+    lesson_progress = UserLessonProgress.query.filter_by(
+        user_id=current_user.id, lesson_id=lesson_id
+    ).first()
+    
+    # Get next and previous lessons
+    all_lessons = Lesson.query.filter_by(path_id=path.id, is_active=True).order_by(Lesson.order).all()
+    current_index = next((i for i, l in enumerate(all_lessons) if l.id == lesson_id), 0)
+    
+    next_lesson = all_lessons[current_index + 1] if current_index + 1 < len(all_lessons) else None
+    prev_lesson = all_lessons[current_index - 1] if current_index > 0 else None
+    
+    return render_template('lesson_detail.html',
+                         lesson=lesson,
+                         path=path,
+                         lesson_progress=lesson_progress,
+                         next_lesson=next_lesson,
+                         prev_lesson=prev_lesson)
+
+@bp.route('/learning/lesson/<int:lesson_id>/complete', methods=['POST'])
+@login_required
+def complete_lesson(lesson_id):
+    lesson = Lesson.query.get_or_404(lesson_id)
+    
+    # Get or create lesson progress
+    lesson_progress = UserLessonProgress.query.filter_by(
+        user_id=current_user.id, lesson_id=lesson_id
+    ).first()
+    
+    if not lesson_progress:
+        lesson_progress = UserLessonProgress(
+            user_id=current_user.id,
+            lesson_id=lesson_id
+        )
+        db.session.add(lesson_progress)
+    
+    # Mark as completed if not already
+    if not lesson_progress.completed_at:
+        lesson_progress.completed_at = datetime.utcnow()
+        
+        # Award experience points
+        current_user.experience += lesson.completion_xp
+        
+        # Handle lesson-specific completion
+        if lesson.lesson_type == 'quiz':
+            quiz_score = float(request.form.get('quiz_score', 0))
+            lesson_progress.quiz_score = quiz_score
+        elif lesson.lesson_type == 'practical':
+            lesson_progress.practice_submitted = True
+            notes = request.form.get('notes', '')
+            lesson_progress.notes = notes
+        
+        # Update path progress
+        path_progress = UserPathProgress.query.filter_by(
+            user_id=current_user.id, path_id=lesson.path_id
+        ).first()
+        
+        if path_progress:
+            # Calculate overall progress
+            total_lessons = Lesson.query.filter_by(path_id=lesson.path_id, is_active=True).count()
+            completed_lessons = UserLessonProgress.query.filter_by(
+                user_id=current_user.id
+            ).join(Lesson).filter(
+                Lesson.path_id == lesson.path_id,
+                UserLessonProgress.completed_at.isnot(None)
+            ).count()
+            
+            path_progress.progress_percentage = (completed_lessons / total_lessons) * 100
+            
+            # Check if path is completed
+            if completed_lessons == total_lessons and not path_progress.completed_at:
+                path_progress.completed_at = datetime.utcnow()
+                current_user.experience += lesson.learning_path.completion_reward_xp
+                
+                # Create notification
+                create_notification(
+                    user_id=current_user.id,
+                    type='achievement',
+                    title='Learning Path Completed!',
+                    message=f'You completed the "{lesson.learning_path.title}" learning path!',
+                    url=url_for('learning.learning_path_detail', path_id=lesson.path_id)
+                )
+        
+        # Create activity
+        create_activity(
+            user_id=current_user.id,
+            action_type='lesson_complete',
+            target_type='lesson',
+            target_id=lesson_id,
+            message=f"{current_user.username} completed lesson: {lesson.title}"
+        )
+        
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': f'Lesson completed! +{lesson.completion_xp} XP',
+            'xp_gained': lesson.completion_xp
+        })
+    
+    return jsonify({'success': True, 'message': 'Lesson already completed'})
+
+@bp.route('/tutorials')
+def tutorials():
+    # Filter options
+    difficulty = request.args.get('difficulty', '')
+    tutorial_type = request.args.get('type', '')
+    search = request.args.get('search', '')
+    
+    # Build query
+    query = Tutorial.query.filter_by(is_active=True)
+    
+    if difficulty:
+        query = query.filter_by(difficulty=difficulty)
+    if tutorial_type:
+        query = query.filter_by(tutorial_type=tutorial_type)
+    if search:
+        query = query.filter(Tutorial.title.contains(search) | Tutorial.tags.contains(search))
+    
+    # Pagination
+    page = request.args.get('page', 1, type=int)
+    per_page = 12
+    
+    tutorials_paginated = query.order_by(Tutorial.created_at.desc()).paginate(
+        page=page, per_page=per_page, error_out=False
+    )
+    
+    # Get featured tutorials for sidebar
+    featured = Tutorial.query.filter_by(is_featured=True, is_active=True).limit(5).all()
+    
+    return render_template('tutorials.html', 
+                         tutorials=tutorials_paginated,
+                         featured_tutorials=featured,
+                         current_filters={
+                             'difficulty': difficulty,
+                             'type': tutorial_type,
+                             'search': search
+                         })
+
+@bp.route('/tutorial/<int:tutorial_id>')
+def tutorial_detail(tutorial_id):
+    tutorial = Tutorial.query.get_or_404(tutorial_id)
+    
+    # Increment view count
+    tutorial.views += 1
+    db.session.commit()
+    
+    # Get related tutorials
+    related = Tutorial.query.filter(
+        Tutorial.tutorial_type == tutorial.tutorial_type,
+        Tutorial.id != tutorial_id,
+        Tutorial.is_active == True
+    ).limit(4).all()
+    
+    return render_template('tutorial_detail.html', tutorial=tutorial, related_tutorials=related)
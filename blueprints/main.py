@@ -0,0 +1,404 @@
+"""
+Home page, accounts, profiles and the social features
+"""
+
+from datetime import datetime
+
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
+from flask_login import login_user, login_required, logout_user, current_user
+from werkzeug.security import generate_password_hash, check_password_hash
+
+from extensions import db
+from models import (
+    User, Artwork, Challenge, UserFollow, Notification, ActivityFeed, UserPathProgress, Achievement,
+    UserAchievement, UserStats, loading_profile
+)
+from services import create_notification, create_activity
+
+bp = Blueprint('main', __name__)
+
+# Routes
+@bp.route('/')
+def index():
+    recent_artworks = Artwork.query.options(*loading_profile('index')).order_by(
+        Artwork.upload_date.desc()).limit(6).all()
+    active_challenges = Challenge.query.filter_by(is_active=True).limit(3).all()
+    return render_template('index.html', recent_artworks=recent_artworks, active_challenges=active_challenges)
+
+@bp.route('/register', methods=['GET', 'POST'])
+def register():
+    if request.method == 'POST':
+        username = request.form['username']
+        email = request.form['email']
+        password = request.form['password']
+        
+        if User.query.filter_by(username=username).first():
+            flash('Username already exists')
+            return redirect(url_for('main.register'))
+        
+        if User.query.filter_by(email=email).first():
+            flash('Email already registered')
+            return redirect(url_for('main.register'))
+        
+        user = User(
+            username=username,
+            email=email,
+            password_hash=generate_password_hash(password)
+        )
+        db.session.add(user)
+        db.session.commit()
+        
+        flash('Registration successful! Please login.')
+        return redirect(url_for('main.login'))
+    
+    return render_template('register.html')
+
+@bp.route('/login', methods=['GET', 'POST'])
+def login():
+    if request.method == 'POST':
+        username = request.form['username']
+        password = request.form['password']
+        user = User.query.filter_by(username=username).first()
+        
+        if user and check_password_hash(user.password_hash, password):
+            login_user(user)
+            return redirect(url_for('main.index'))
+        else:
+            flash('Invalid username or password')
+    
+    return render_template('login.html')
+
+@bp.route('/logout')
+@login_required
+def logout():
+    logout_user()
+    return redirect(url_for('main.index'))
+
+@bp.route('/profile/<username>')
+def profile(username):
+    user = User.query.filter_by(username=username).first_or_404()
+    artworks = Artwork.query.filter_by(user_id=user.id).order_by(Artwork.upload_date.desc()).all()
+    return render_template('profile.html', user=user, artworks=artworks)
+
+@bp.route('/achievements')
+def achievements():
+    all_achievements = Achievement.query.filter_by(is_active=True).all()
+    user_achievements = []
+    
+    if current_user.is_authenticated:
+        user_achievements = [ua.achievement_id for ua in UserAchievement.query.filter_by(user_id=current_user.id).all()]
+    
+    return render_template('achievements.html', achievements=all_achievements, user_achievements=user_achievements)
+
+@bp.route('/leaderboard')
+def leaderboard():
+    # Top artists by experience
+    top_artists = User.query.order_by(User.experience.desc()).limit(10).all()
+    
+    # Top by different categories
+    top_uploaders = db.session.query(User, UserStats).join(UserStats).order_by(UserStats.total_artworks.desc()).limit(10).all()
+    top_liked = db.session.query(User, UserStats).join(UserStats).order_by(UserStats.total_likes_received.desc()).limit(10).all()
+    top_streaks = db.session.query(User, UserStats).join(UserStats).order_by(UserStats.longest_streak.desc()).limit(10).all()
+    
+    return render_template('leaderboard.html', 
+                         top_artists=top_artists,
+                         top_uploaders=top_uploaders,
+                         top_liked=top_liked,
+                         top_streaks=top_streaks)
+
+@bp.route('/profile/<username>')
+def user_profile(username):
+    user = User.query.filter_by(username=username).first_or_404()
+    stats = UserStats.query.filter_by(user_id=user.id).first()
+    
+    if not stats:
+        stats = UserStats(user_id=user.id)
+        db.session.add(stats)
+        db.session.commit()
+    
+    # Get user's artworks
+    artworks = Artwork.query.filter_by(user_id=user.id).order_by(Artwork.upload_date.desc()).limit(12).all()
+    
+    # Get user's achievements
+    user_achievements = db.session.query(Achievement).join(UserAchievement).filter(
+        UserAchievement.user_id == user.id
+    ).all()
+    
+    return render_template('profile_enhanced.html', 
+                         user=user, 
+                         stats=stats, 
+                         artworks=artworks, 
+                         achievements=user_achievements)
+
+# Community Routes
+@bp.route('/follow/<int:user_id>', methods=['POST'])
+@login_required
+def follow_user(user_id):
+    if user_id == current_user.id:
+        return jsonify({'success': False, 'error': 'Cannot follow yourself'})
+    
+    target_user = User.query.get_or_404(user_id)
+    
+    # Check if already following
+    existing_follow = UserFollow.query.filter_by(
+        follower_id=current_user.id,
+        following_id=user_id
+    ).first()
+    
+    if existing_follow:
+        return jsonify({'success': False, 'error': 'Already following this user'})
+    
+    # Create follow relationship
+    follow = UserFollow(
+        follower_id=current_user.id,
+        following_id=user_id
+    )
+    db.session.add(follow)
+    
+    # Create notification for followed user
+    create_notification(
+        user_id=user_id,
+        type='follow',
+        title='New Follower',
+        message=f'{current_user.username} started following you!',
+        url=url_for('main.profile', username=current_user.username),
+        related_user_id=current_user.id
+    )
+    
+    # Create activity
+    create_activity(
+        user_id=current_user.id,
+        action_type='follow',
+        target_type='user',
+        target_id=user_id
+    )
+    
+    db.session.commit()
+    
+    return jsonify({'success': True, 'message': f'Now following {target_user.username}'})
+
+@bp.route('/unfollow/<int:user_id>', methods=['POST'])
+@login_required
+def unfollow_user(user_id):
+    follow = UserFollow.query.filter_by(
+        follower_id=current_user.id,
+        following_id=user_id
+    ).first()
+    
+    if not follow:
+        return jsonify({'success': False, 'error': 'Not following this user'})
+    
+    db.session.delete(follow)
+    db.session.commit()
+    
+    target_user = User.query.get(user_id)
+    return jsonify({'success': True, 'message': f'Unfollowed {target_user.username}'})
+
+@bp.route('/notifications')
+@login_required
+def notifications():
+    # Mark all notifications as read when viewing (single UPDATE)
+    Notification.query.filter_by(
+        user_id=current_user.id,
+        is_read=False
+    ).update({'is_read': True}, synchronize_session=False)
+    db.session.commit()
+    
+    # Get all notifications
+    all_notifications = Notification.query.options(*loading_profile('notifications')).filter_by(
+        user_id=current_user.id
+    ).order_by(Notification.created_at.desc()).limit(50).all()
+    
+    return render_template('notifications.html', notifications=all_notifications)
+
+@bp.route('/activity_feed')
+def activity_feed():
+    # Get activities from followed users if logged in
+    if current_user.is_authenticated:
+        # Get user's follows
+        following_ids = db.session.query(UserFollow.following_id).filter_by(
+            follower_id=current_user.id
+        ).scalar_subquery()
+        
+        # Get activities from followed users + own activities
+        activities = ActivityFeed.query.options(*loading_profile('activity_feed')).filter(
+            db.or_(
+                ActivityFeed.user_id.in_(following_ids),
+                ActivityFeed.user_id == current_user.id
+            )
+        ).order_by(ActivityFeed.created_at.desc()).limit(50).all()
+    else:
+        # Public activity feed
+        activities = ActivityFeed.query.options(*loading_profile('activity_feed')).order_by(
+            ActivityFeed.created_at.desc()
+        ).limit(20).all()
+    
+    # Load every previewed artwork in one query instead of one per activity
+    artwork_ids = {a.target_id for a in activities if a.target_type == 'artwork' and a.target_id}
+    artworks_by_id = {}
+    if artwork_ids:
+        artworks_by_id = {a.id: a for a in Artwork.query.filter(Artwork.id.in_(artwork_ids)).all()}
+    
+    return render_template('activity_feed.html', activities=activities,
+                         get_artwork_by_id=artworks_by_id.get)
+
+@bp.route('/users/discover')
+def discover_users():
+    # Get top artists by various metrics
+    top_by_artworks = User.query.join(UserStats).order_by(
+        UserStats.total_artworks.desc()
+    ).limit(10).all()
+    
+    top_by_experience = User.query.order_by(User.experience.desc()).limit(10).all()
+    
+    recently_joined = User.query.order_by(User.created_at.desc()).limit(10).all()
+    
+    # Get users with most followers
+    follower_counts = db.session.query(
+        UserFollow.following_id,
+        db.func.count(UserFollow.follower_id).label('follower_count')
+    ).group_by(UserFollow.following_id).order_by(
+        db.func.count(UserFollow.follower_id).desc()
+    ).limit(10).all()
+    
+    popular_users = []
+    for user_id, count in follower_counts:
+        user = User.query.get(user_id)
+        if user:
+            popular_users.append((user, count))
+    
+    return render_template('discover_users.html', 
+                         top_by_artworks=top_by_artworks,
+                         top_by_experience=top_by_experience,
+                         recently_joined=recently_joined,
+                         popular_users=popular_users)
+
+# Social Features
+@bp.route('/social')
+@login_required
+def social_hub():
+    """Social hub with friends, groups, and messaging"""
+    # Get user's friends
+    friends = []  # Would implement friend system
+    
+    # Get recent activity from friends
+    friend_activity = []  # Would get friend activities
+    
+    # Get suggested users to follow
+    suggested_users = User.query.filter(
+        User.id != current_user.id,
+        User.is_admin == False
+    ).order_by(db.func.random()).limit(5).all()
+    
+    return render_template('social_hub.html', 
+                         friends=friends,
+                         friend_activity=friend_activity,
+                         suggested_users=suggested_users)
+
+# Portfolio Features
+@bp.route('/portfolio/<username>')
+def user_portfolio(username):
+    """Enhanced user portfolio with collections and themes"""
+    user = User.query.filter_by(username=username).first_or_404()
+    
+    # Get user's artworks organized by collections
+    artworks = Artwork.query.filter_by(user_id=user.id).order_by(Artwork.upload_date.desc()).all()
+    
+    # Get user's achievements
+    user_achievements = db.session.query(UserAchievement, Achievement).join(
+        Achievement
+    ).filter(UserAchievement.user_id == user.id).all()
+    
+    # Get user's stats
+    stats = UserStats.query.filter_by(user_id=user.id).first()
+    if not stats:
+        stats = UserStats(user_id=user.id)
+        db.session.add(stats)
+        db.session.commit()
+    
+    # Get user's learning progress
+    learning_progress = UserPathProgress.query.filter_by(user_id=user.id).all()
+    
+    return render_template('enhanced_portfolio.html',
+                         user=user,
+                         artworks=artworks,
+                         user_achievements=user_achievements,
+                         stats=stats,
+                         learning_progress=learning_progress)
+
+# Art Marketplace
+@bp.route('/marketplace')
+def art_marketplace():
+    """Art marketplace for buying/selling artwork"""
+    # Get featured artworks
+    featured_artworks = Artwork.query.filter(
+        Artwork.ai_score >= 8.0
+    ).order_by(Artwork.upload_date.desc()).limit(6).all()
+    
+    # Get recent artworks
+    recent_artworks = Artwork.query.order_by(
+        Artwork.upload_date.desc()
+    ).limit(12).all()
+    
+    # Get categories
+    categories = db.session.query(Artwork.category).distinct().all()
+    categories = [cat[0] for cat in categories if cat[0]]
+    
+    return render_template('marketplace.html',
+                         featured_artworks=featured_artworks,
+                         recent_artworks=recent_artworks,
+                         categories=categories)
+
+@bp.route('/api/start_stream', methods=['POST'])
+@login_required
+def start_stream():
+    """Start a live art stream"""
+    try:
+        data = request.get_json()
+        title = data.get('title', 'Untitled Stream')
+        description = data.get('description', '')
+        
+        # Create stream record (would integrate with streaming service)
+        stream_data = {
+            'stream_id': f"stream_{current_user.id}_{datetime.utcnow().timestamp()}",
+            'title': title,
+            'description': description,
+            'streamer': current_user.username,
+            'start_time': datetime.utcnow().isoformat(),
+            'status': 'live'
+        }
+        
+        return jsonify(stream_data)
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# Collaborative Drawing
+@bp.route('/collaborate')
+@login_required
+def collaborative_drawing():
+    """Real-time collaborative drawing rooms"""
+    return render_template('collaborative_drawing.html')
+
+@bp.route('/api/create_collab_room', methods=['POST'])
+@login_required
+def create_collab_room():
+    """Create a collaborative drawing room"""
+    try:
+        data = request.get_json()
+        room_name = data.get('name', 'Untitled Room')
+        max_users = data.get('max_users', 4)
+        
+        room_data = {
+            'room_id': f"room_{current_user.id}_{datetime.utcnow().timestamp()}",
+            'name': room_name,
+            'creator': current_user.username,
+            'max_users': max_users,
+            'current_users': 1,
+            'created_at': datetime.utcnow().isoformat()
+        }
+        
+        return jsonify(room_data)
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
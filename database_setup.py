@@ -0,0 +1,565 @@
+"""
+Schema migrations, the admin account and default seed data
+"""
+
+from werkzeug.security import generate_password_hash
+
+from extensions import db
+from models import User, ForumCategory, LearningPath, Lesson, Tutorial, Achievement, SkillTree, seeds
+
+
+# Admin initialization function
+def create_admin_user():
+    """Create admin user if it doesn't exist"""
+    admin = User.query.filter_by(username='Knotico').first()
+    if not admin:
+        admin = User(
+            username='Knotico',
+            email='admin@artai.com',
+            password_hash=generate_password_hash('Millie1991'),
+            is_admin=True,
+            level=10,
+            experience=9999
+        )
+        db.session.add(admin)
+        db.session.commit()
+        print("✅ Admin user 'Knotico' created successfully!")
+    else:
+        # Ensure existing user has admin privileges
+        admin.is_admin = True
+        admin.level = 10
+        admin.experience = 9999
+        db.session.commit()
+        print("✅ Admin user 'Knotico' updated with admin privileges!")
+
+def initialize_achievements():
+    """Create default achievements if they don't exist"""
+    default_achievements = [
+        {
+            'name': 'First Upload',
+            'description': 'Upload your first artwork to the gallery',
+            'icon': 'fas fa-upload',
+            'category': 'Milestones',
+            'points': 10,
+            'requirement_type': 'artworks_count',
+            'requirement_value': 1
+        },
+        {
+            'name': 'Art Enthusiast',
+            'description': 'Upload 10 artworks',
+            'icon': 'fas fa-palette',
+            'category': 'Milestones',
+            'points': 50,
+            'requirement_type': 'artworks_count',
+            'requirement_value': 10
+        },
+        {
+            'name': 'Week Warrior',
+            'description': 'Maintain a 7-day drawing streak',
+            'icon': 'fas fa-fire',
+            'category': 'Streaks',
+            'points': 30,
+            'requirement_type': 'streak',
+            'requirement_value': 7
+        },
+        {
+            'name': 'Popular Artist',
+            'description': 'Receive 100 likes on your artworks',
+            'icon': 'fas fa-heart',
+            'category': 'Social',
+            'points': 40,
+            'requirement_type': 'likes',
+            'requirement_value': 100
+        },
+        {
+            'name': 'Battle Rookie',
+            'description': 'Participate in your first art battle',
+            'icon': 'fas fa-sword-crossed',
+            'category': 'Battles',
+            'points': 25,
+            'requirement_type': 'battles_participated',
+            'requirement_value': 1
+        },
+        {
+            'name': 'Champion',
+            'description': 'Win your first art battle',
+            'icon': 'fas fa-crown',
+            'category': 'Battles',
+            'points': 100,
+            'requirement_type': 'battles_won',
+            'requirement_value': 1
+        }
+    ]
+    
+    if seeds.is_current('achievements', default_achievements):
+        return
+    
+    seeds.insert_missing(Achievement, 'name', default_achievements)
+    seeds.mark_current('achievements', default_achievements)
+    db.session.commit()
+    print("✅ Default achievements initialized!")
+
+def initialize_skill_trees():
+    """Create default skill trees"""
+    default_skills = [
+        {
+            'name': 'Basic Drawing',
+            'description': 'Fundamental drawing skills',
+            'category': 'drawing',
+            'level': 1,
+            'experience_required': 100,
+            'icon': 'fas fa-pencil-alt'
+        },
+        {
+            'name': 'Advanced Sketching',
+            'description': 'Complex sketching techniques',
+            'category': 'drawing',
+            'level': 2,
+            'experience_required': 250,
+            'icon': 'fas fa-pen-fancy'
+        },
+        {
+            'name': 'Color Theory',
+            'description': 'Understanding color relationships',
+            'category': 'theory',
+            'level': 1,
+            'experience_required': 150,
+            'icon': 'fas fa-palette'
+        },
+        {
+            'name': 'Digital Art',
+            'description': 'Digital creation techniques',
+            'category': 'digital',
+            'level': 1,
+            'experience_required': 200,
+            'icon': 'fas fa-laptop'
+        }
+    ]
+    
+    if seeds.is_current('skill_trees', default_skills):
+        return
+    
+    seeds.insert_missing(SkillTree, 'name', default_skills)
+    seeds.mark_current('skill_trees', default_skills)
+    db.session.commit()
+    print("✅ Default skill trees initialized!")
+
+def initialize_forum_categories():
+    """Initialize default forum categories"""
+    categories = [
+        {
+            'name': 'General Discussion',
+            'description': 'General art and platform discussions',
+            'icon': 'fas fa-comments',
+            'color': 'primary'
+        },
+        {
+            'name': 'Artwork Showcase',
+            'description': 'Share your latest creations',
+            'icon': 'fas fa-palette',
+            'color': 'success'
+        },
+        {
+            'name': 'Tutorials & Tips',
+            'description': 'Learn and teach art techniques',
+            'icon': 'fas fa-graduation-cap',
+            'color': 'info'
+        },
+        {
+            'name': 'Critiques & Feedback',
+            'description': 'Get constructive feedback on your work',
+            'icon': 'fas fa-search',
+            'color': 'warning'
+        },
+        {
+            'name': 'Challenges & Contests',
+            'description': 'Participate in art challenges',
+            'icon': 'fas fa-trophy',
+            'color': 'danger'
+        },
+        {
+            'name': 'AI Art Discussion',
+            'description': 'Discuss AI tools and techniques',
+            'icon': 'fas fa-robot',
+            'color': 'secondary'
+        },
+        {
+            'name': 'Community Events',
+            'description': 'Platform news and community events',
+            'icon': 'fas fa-calendar',
+            'color': 'dark'
+        }
+    ]
+    
+    if seeds.is_current('forum_categories', categories):
+        return
+    
+    seeds.insert_missing(ForumCategory, 'name', categories)
+    seeds.mark_current('forum_categories', categories)
+    db.session.commit()
+    print("✅ Forum categories initialized!")
+
+def initialize_learning_paths():
+    """Initialize default learning paths and lessons"""
+    learning_paths_data = [
+        {
+            'title': 'Digital Art Fundamentals',
+            'description': 'Master the basics of digital art creation, from tools to techniques',
+            'difficulty': 'Beginner',
+            'category': 'Digital Art',
+            'estimated_hours': 8,
+            'order': 1,
+            'completion_reward_xp': 100,
+            'lessons': [
+                {
+                    'title': 'Introduction to Digital Art Tools',
+                    'content': 'Learn about the essential software and hardware for digital art creation. We\'ll cover popular programs like Photoshop, Procreate, and free alternatives like GIMP and Krita.',
+                    'lesson_type': 'theory',
+                    'order': 1,
+                    'estimated_minutes': 20,
+                    'completion_xp': 15
+                },
+                {
+                    'title': 'Understanding Layers and Blending Modes',
+                    'content': 'Layers are the foundation of digital art. Learn how to organize your artwork, use different blending modes, and create non-destructive workflows.',
+                    'lesson_type': 'practical',
+                    'order': 2,
+                    'estimated_minutes': 30,
+                    'practice_prompt': 'Create a simple landscape using at least 5 different layers and 3 different blending modes.',
+                    'completion_xp': 20
+                },
+                {
+                    'title': 'Color Theory in Digital Art',
+                    'content': 'Explore color relationships, color harmony, and how digital screens affect color perception. Learn to create compelling color palettes.',
+                    'lesson_type': 'theory',
+                    'order': 3,
+                    'estimated_minutes': 25,
+                    'completion_xp': 15
+                },
+                {
+                    'title': 'Digital Painting Techniques Quiz',
+                    'content': 'Test your knowledge of digital painting fundamentals.',
+                    'lesson_type': 'quiz',
+                    'order': 4,
+                    'estimated_minutes': 10,
+                    'quiz_data': '{"questions": [{"question": "What is the primary advantage of using layers in digital art?", "options": ["Better colors", "Non-destructive editing", "Faster rendering", "Smaller file size"], "correct": 1}]}',
+                    'completion_xp': 25
+                }
+            ]
+        },
+        {
+            'title': 'Traditional Drawing Skills',
+            'description': 'Build a strong foundation in traditional drawing techniques that apply to all art forms',
+            'difficulty': 'Beginner',
+            'category': 'Traditional Art',
+            'estimated_hours': 12,
+            'order': 2,
+            'completion_reward_xp': 150,
+            'lessons': [
+                {
+                    'title': 'Line Quality and Control',
+                    'content': 'Develop confident, expressive lines. Learn about line weight, texture, and how lines can convey emotion and movement.',
+                    'lesson_type': 'practical',
+                    'order': 1,
+                    'estimated_minutes': 45,
+                    'practice_prompt': 'Practice drawing continuous lines without lifting your pencil. Create 10 different line textures.',
+                    'completion_xp': 20
+                },
+                {
+                    'title': 'Understanding Perspective',
+                    'content': 'Master one-point, two-point, and three-point perspective. Learn how to create depth and dimension in your drawings.',
+                    'lesson_type': 'theory',
+                    'order': 2,
+                    'estimated_minutes': 40,
+                    'completion_xp': 18
+                },
+                {
+                    'title': 'Shading and Value Studies',
+                    'content': 'Learn to see and render light, shadow, and form. Understand how value creates volume and mood in your artwork.',
+                    'lesson_type': 'practical',
+                    'order': 3,
+                    'estimated_minutes': 50,
+                    'practice_prompt': 'Create a value study of 5 simple objects using only 5 different values.',
+                    'completion_xp': 25
+                }
+            ]
+        },
+        {
+            'title': 'Character Design Mastery',
+            'description': 'Create compelling characters from concept to final illustration',
+            'difficulty': 'Intermediate',
+            'category': 'Character Design',
+            'estimated_hours': 15,
+            'order': 3,
+            'prerequisites': '["1", "2"]',  # Requires completion of paths 1 and 2
+            'completion_reward_xp': 200,
+            'lessons': [
+                {
+                    'title': 'Character Concept Development',
+                    'content': 'Learn to develop unique character concepts. Explore personality, backstory, and how these elements influence visual design.',
+                    'lesson_type': 'theory',
+                    'order': 1,
+                    'estimated_minutes': 35,
+                    'completion_xp': 20
+                },
+                {
+                    'title': 'Anatomy and Proportions',
+                    'content': 'Understand human anatomy basics and how to stylize proportions for different character types and art styles.',
+                    'lesson_type': 'practical',
+                    'order': 2,
+                    'estimated_minutes': 60,
+                    'practice_prompt': 'Draw the same character in 3 different proportion styles (realistic, cartoon, chibi).',
+                    'completion_xp': 30
+                },
+                {
+                    'title': 'Character Expressions and Emotions',
+                    'content': 'Master facial expressions and body language to convey personality and emotion effectively.',
+                    'lesson_type': 'practical',
+                    'order': 3,
+                    'estimated_minutes': 45,
+                    'practice_prompt': 'Create an expression sheet showing 8 different emotions for your character.',
+                    'completion_xp': 25
+                }
+            ]
+        },
+        {
+            'title': 'AI Art Integration',
+            'description': 'Learn to effectively combine AI tools with traditional art skills',
+            'difficulty': 'Advanced',
+            'category': 'AI Art',
+            'estimated_hours': 6,
+            'order': 4,
+            'completion_reward_xp': 120,
+            'lessons': [
+                {
+                    'title': 'Understanding AI Art Tools',
+                    'content': 'Explore different AI art platforms, their strengths, and how to choose the right tool for your project.',
+                    'lesson_type': 'theory',
+                    'order': 1,
+                    'estimated_minutes': 25,
+                    'completion_xp': 15
+                },
+                {
+                    'title': 'Prompt Engineering for Artists',
+                    'content': 'Master the art of writing effective prompts to get the results you want from AI art generators.',
+                    'lesson_type': 'practical',
+                    'order': 2,
+                    'estimated_minutes': 40,
+                    'practice_prompt': 'Create 5 different AI artworks by refining and improving your prompts iteratively.',
+                    'completion_xp': 25
+                },
+                {
+                    'title': 'AI + Human Collaboration',
+                    'content': 'Learn professional workflows for combining AI-generated elements with hand-drawn art for commercial projects.',
+                    'lesson_type': 'practical',
+                    'order': 3,
+                    'estimated_minutes': 50,
+                    'practice_prompt': 'Create a final artwork that combines AI-generated backgrounds with hand-drawn characters.',
+                    'completion_xp': 30
+                }
+            ]
+        }
+    ]
+    
+    if seeds.is_current('learning_paths', learning_paths_data):
+        return
+    
+    # Lessons are only created together with a new path
+    path_rows = [{key: value for key, value in path_data.items() if key != 'lessons'}
+                 for path_data in learning_paths_data]
+    new_path_ids = seeds.insert_missing(LearningPath, 'title', path_rows)
+    lesson_rows = [dict(lesson_data, path_id=new_path_ids[path_data['title']])
+                   for path_data in learning_paths_data if path_data['title'] in new_path_ids
+                   for lesson_data in path_data['lessons']]
+    if lesson_rows:
+        seeds.insert_rows(Lesson, lesson_rows)
+    
+    seeds.mark_current('learning_paths', learning_paths_data)
+    db.session.commit()
+    print("✅ Learning paths and lessons initialized!")
+
+def initialize_tutorials():
+    """Initialize sample tutorials"""
+    tutorials_data = [
+        {
+            'title': 'Mastering Digital Brushes',
+            'description': 'Learn to create custom brushes and understand brush dynamics in digital art software',
+            'content': '''# Mastering Digital Brushes
+
+Digital brushes are the foundation of digital painting. Understanding how to use and create custom brushes will dramatically improve your artwork.
+
+## Understanding Brush Properties
+
+### Opacity and Flow
+- **Opacity**: Controls the transparency of each stroke
+- **Flow**: Controls how paint builds up within a single stroke
+
+### Brush Dynamics
+- **Pressure Sensitivity**: Link brush properties to pen pressure
+- **Tilt and Rotation**: Use pen angle for varied effects
+- **Velocity**: Stroke speed affects brush behavior
+
+## Creating Custom Brushes
+
+1. Start with a base texture or shape
+2. Define brush tip behavior
+3. Set up pressure dynamics
+4. Test and refine your brush
+
+## Pro Tips
+- Save your favorite brush settings as presets
+- Experiment with texture brushes for backgrounds
+- Use different brushes for different art styles
+- Don't rely too heavily on fancy brushes - skill matters more
+
+Practice these techniques and watch your digital art improve dramatically!''',
+            'tutorial_type': 'technique',
+            'difficulty': 'Intermediate',
+            'estimated_minutes': 45,
+            'tags': 'digital art, brushes, technique, photoshop, procreate',
+            'is_featured': True
+        },
+        {
+            'title': 'Color Theory for Beginners',
+            'description': 'Understand the fundamentals of color and how to create harmonious color schemes',
+            'content': '''# Color Theory Fundamentals
+
+Color is one of the most powerful tools in an artist's arsenal. Understanding color theory will help you create more impactful and harmonious artwork.
+
+## The Color Wheel
+
+### Primary Colors
+- Red, Blue, Yellow (traditional)
+- Red, Green, Blue (digital/light)
+
+### Secondary Colors
+Created by mixing two primary colors
+
+### Tertiary Colors
+Created by mixing a primary and secondary color
+
+## Color Relationships
+
+### Complementary Colors
+Colors opposite each other on the color wheel
+- Create high contrast and vibrant effects
+- Use sparingly for maximum impact
+
+### Analogous Colors
+Colors next to each other on the color wheel
+- Create harmony and unity
+- Great for natural, peaceful scenes
+
+### Triadic Colors
+Three colors evenly spaced on the color wheel
+- Vibrant but balanced
+- Choose one dominant color
+
+## Color Temperature
+- **Warm colors**: Reds, oranges, yellows (energetic, advancing)
+- **Cool colors**: Blues, greens, purples (calming, receding)
+
+## Practical Applications
+1. Choose a dominant color temperature
+2. Use the opposite temperature for accents
+3. Consider the mood you want to convey
+4. Study master paintings for color inspiration
+
+Remember: Rules are meant to be broken once you understand them!''',
+            'tutorial_type': 'theory',
+            'difficulty': 'Beginner',
+            'estimated_minutes': 30,
+            'tags': 'color theory, fundamentals, harmony, painting',
+            'is_featured': True
+        }
+    ]
+    
+    if seeds.is_current('tutorials', tutorials_data):
+        return
+    
+    admin_user = User.query.filter_by(username='Knotico').first()
+    if not admin_user:
+        # Tutorials need an author; try again on the next start
+        return
+    
+    seeds.insert_missing(Tutorial, 'title', [dict(tutorial_data, author_id=admin_user.id)
+                                             for tutorial_data in tutorials_data])
+    seeds.mark_current('tutorials', tutorials_data)
+    db.session.commit()
+    print("✅ Sample tutorials initialized!")
+
+def migrate_database():
+    """Handle database schema migrations"""
+    try:
+        with db.engine.connect() as conn:
+            # Migrate learning_path table
+            result = conn.execute(db.text("PRAGMA table_info(learning_path)"))
+            existing_lp_columns = [row[1] for row in result]
+            
+            lp_expected_columns = {
+                'category': "VARCHAR(50) DEFAULT 'General'",
+                'estimated_hours': "INTEGER DEFAULT 1",
+                'thumbnail_url': "VARCHAR(200)",
+                'prerequisites': "TEXT",
+                'completion_reward_xp': "INTEGER DEFAULT 50",
+                'created_at': "DATETIME DEFAULT CURRENT_TIMESTAMP"
+            }
+            
+            lp_columns_added = []
+            for column_name, column_def in lp_expected_columns.items():
+                if column_name not in existing_lp_columns:
+                    print(f"🔄 Adding missing '{column_name}' column to learning_path table...")
+                    conn.execute(db.text(f"ALTER TABLE learning_path ADD COLUMN {column_name} {column_def}"))
+                    lp_columns_added.append(column_name)
+            
+            # Migrate user table
+            result = conn.execute(db.text("PRAGMA table_info(user)"))
+            existing_user_columns = [row[1] for row in result]
+            
+            user_expected_columns = {
+                'created_at': "DATETIME DEFAULT CURRENT_TIMESTAMP"
+            }
+            
+            user_columns_added = []
+            for column_name, column_def in user_expected_columns.items():
+                if column_name not in existing_user_columns:
+                    print(f"🔄 Adding missing '{column_name}' column to user table...")
+                    conn.execute(db.text(f"ALTER TABLE user ADD COLUMN {column_name} {column_def}"))
+                    user_columns_added.append(column_name)
+            
+            # Migrate artwork table
+            result = conn.execute(db.text("PRAGMA table_info(artwork)"))
+            existing_artwork_columns = [row[1] for row in result]
+            
+            artwork_expected_columns = {
+                'phash': "BIGINT"
+            }
+            
+            artwork_columns_added = []
+            for column_name, column_def in artwork_expected_columns.items():
+                if column_name not in existing_artwork_columns:
+                    print(f"🔄 Adding missing '{column_name}' column to artwork table...")
+                    conn.execute(db.text(f"ALTER TABLE artwork ADD COLUMN {column_name} {column_def}"))
+                    artwork_columns_added.append(column_name)
+            
+            # Shared uploads are reference-counted by Artwork.filename
+            conn.execute(db.text("CREATE INDEX IF NOT EXISTS ix_artwork_filename ON artwork (filename)"))
+            # The similarity index and its backfill select artworks by whether they are hashed
+            conn.execute(db.text("CREATE INDEX IF NOT EXISTS ix_artwork_phash ON artwork (phash)"))
+            conn.commit()
+            
+            if lp_columns_added or user_columns_added or artwork_columns_added:
+                conn.commit()
+                all_added = lp_columns_added + user_columns_added + artwork_columns_added
+                print(f"✅ Added columns: {', '.join(all_added)}")
+                if artwork_columns_added:
+                    print("💡 Run 'python image_similarity.py backfill' to hash existing artworks")
+            else:
+                print("✅ All database columns are up to date!")
+                
+    except Exception as e:
+        print(f"⚠️ Migration check failed: {e}")
+        print("🔄 Recreating database tables...")
+        db.drop_all()
+        db.create_all()
+        print("✅ Database recreated successfully!")
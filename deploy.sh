@@ -47,18 +47,50 @@ pip install -r requirements.txt
 echo "🗄️ Initializing database..."
 python3 start.py
 
-# Create Gunicorn configuration
+# Fingerprint static assets and generate the nginx static snippets
+echo "🧩 Building static assets..."
+mkdir -p /etc/nginx/snippets
+python3 static_assets.py build \
+    --static-root /var/www/artai/static \
+    --nginx-map /etc/nginx/conf.d/artai_static_map.conf \
+    --nginx-location /etc/nginx/snippets/artai_static.conf
+
+# Create Gunicorn configuration (threaded web pool + CPU-bound image pool, see gunicorn.conf.py)
+# and the image-processing service both pools hand OpenCV jobs to (see image_service.py)
 echo "⚙️ Creating Gunicorn configuration..."
 cat > /etc/supervisor/conf.d/artai.conf << EOF
 [program:artai]
 directory=/var/www/artai
-command=/var/www/artai/venv/bin/gunicorn --workers 3 --bind unix:artai.sock -m 007 app:app
+command=/var/www/artai/venv/bin/gunicorn --config gunicorn.conf.py
 autostart=true
 autorestart=true
 stderr_logfile=/var/log/artai/artai.err.log
 stdout_logfile=/var/log/artai/artai.out.log
 user=www-data
 group=www-data
+environment=PATH="/var/www/artai/venv/bin",ARTAI_POOL="web",IMAGE_SERVICE_SOCKET="/var/www/artai/artai_images.sock"
+
+[program:artai-image]
+directory=/var/www/artai
+command=/var/www/artai/venv/bin/gunicorn --config gunicorn.conf.py
+autostart=true
+autorestart=true
+stderr_logfile=/var/log/artai/artai-image.err.log
+stdout_logfile=/var/log/artai/artai-image.out.log
+user=www-data
+group=www-data
+environment=PATH="/var/www/artai/venv/bin",ARTAI_POOL="image",IMAGE_SERVICE_SOCKET="/var/www/artai/artai_images.sock"
+
+[program:artai-images]
+directory=/var/www/artai
+command=/var/www/artai/venv/bin/python image_service.py serve --socket /var/www/artai/artai_images.sock
+autostart=true
+autorestart=true
+stopasgroup=true
+stderr_logfile=/var/log/artai/artai-images.err.log
+stdout_logfile=/var/log/artai/artai-images.out.log
+user=www-data
+group=www-data
 environment=PATH="/var/www/artai/venv/bin"
 EOF
 
@@ -78,10 +110,29 @@ server {
         proxy_pass http://unix:/var/www/artai/artai.sock;
     }
 
-    location /static {
-        alias /var/www/artai/static;
-        expires 30d;
-        add_header Cache-Control "public, immutable";
+    # Uploads and OpenCV routes (every route that decodes or renders images) go to the CPU-bound image pool
+    location ~ ^/(upload$|submit_challenge/|battle/[0-9]+/submit$|api/save_drawing$|ai_redraw/|ai_style_transfer/|style_previews/|apply_style/|color_palette/) {
+        include proxy_params;
+        proxy_read_timeout 120s;
+        proxy_pass http://unix:/var/www/artai/artai_image.sock;
+    }
+
+    # Static files and uploads are served directly by nginx (see static_assets.py)
+    include snippets/artai_static.conf;
+
+    # Prometheus scrapes /metrics locally; keep it off the public internet
+    location = /metrics {
+        allow 127.0.0.1;
+        deny all;
+        include proxy_params;
+        proxy_pass http://unix:/var/www/artai/artai.sock;
+    }
+
+    location = /metrics/image {
+        allow 127.0.0.1;
+        deny all;
+        include proxy_params;
+        proxy_pass http://unix:/var/www/artai/artai_image.sock:/metrics;
     }
 
     location /uploads {
@@ -123,11 +174,14 @@ if command -v ufw &> /dev/null; then
     ufw --force enable
 fi
 
-# Create systemd service for auto-start
-echo "⚡ Creating systemd service..."
-cat > /etc/systemd/system/artai.service << EOF
+# Create systemd services for auto-start, one per gunicorn pool
+echo "⚡ Creating systemd services..."
+for POOL in web image; do
+    SERVICE=artai
+    [ "$POOL" = "image" ] && SERVICE=artai-image
+    cat > /etc/systemd/system/$SERVICE.service << EOF
 [Unit]
-Description=ArtAI Gunicorn Application
+Description=ArtAI Gunicorn Application ($POOL pool)
 After=network.target
 
 [Service]
@@ -135,18 +189,38 @@ User=www-data
 Group=www-data
 WorkingDirectory=/var/www/artai
 Environment="PATH=/var/www/artai/venv/bin"
-ExecStart=/var/www/artai/venv/bin/gunicorn --workers 3 --bind unix:artai.sock -m 007 app:app
+Environment="ARTAI_POOL=$POOL"
+Environment="IMAGE_SERVICE_SOCKET=/var/www/artai/artai_images.sock"
+ExecStart=/var/www/artai/venv/bin/gunicorn --config gunicorn.conf.py
 ExecReload=/bin/kill -s HUP \$MAINPID
 Restart=always
 
+[Install]
+WantedBy=multi-user.target
+EOF
+done
+
+cat > /etc/systemd/system/artai-images.service << EOF
+[Unit]
+Description=ArtAI image-processing service
+After=network.target
+
+[Service]
+User=www-data
+Group=www-data
+WorkingDirectory=/var/www/artai
+Environment="PATH=/var/www/artai/venv/bin"
+ExecStart=/var/www/artai/venv/bin/python image_service.py serve --socket /var/www/artai/artai_images.sock
+Restart=always
+
 [Install]
 WantedBy=multi-user.target
 EOF
 
-# Enable and start the service
+# Enable and start the services
 systemctl daemon-reload
-systemctl enable artai
-systemctl start artai
+systemctl enable artai artai-image artai-images
+systemctl start artai-images artai artai-image
 
 # Create environment file
 echo "🔧 Creating environment configuration..."
@@ -175,10 +249,11 @@ echo "📁 Application Directory: /var/www/artai"
 echo "📋 Logs: /var/log/artai/"
 echo ""
 echo "🔧 Useful commands:"
-echo "  - Check status: systemctl status artai"
+echo "  - Check status: systemctl status artai artai-image artai-images"
+echo "  - Image service load: venv/bin/python image_service.py status --socket /var/www/artai/artai_images.sock"
 echo "  - View logs: tail -f /var/log/artai/artai.out.log"
-echo "  - Restart app: systemctl restart artai"
-echo "  - Update app: cd /var/www/artai && git pull && systemctl restart artai"
+echo "  - Restart app: systemctl restart artai-images artai artai-image"
+echo "  - Update app: cd /var/www/artai && git pull && venv/bin/python static_assets.py build && systemctl restart artai-images artai artai-image"
 echo ""
 echo "⚠️  Don't forget to:"
 echo "  1. Change the admin password after first login"
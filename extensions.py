@@ -0,0 +1,55 @@
+"""
+Flask extensions shared by the application factory and the blueprints
+
+Created unbound here and attached to an app in application.create_app, so
+models and views can import them without importing the app.
+"""
+
+from contextlib import contextmanager
+
+from flask_login import LoginManager
+from flask_sqlalchemy import SQLAlchemy
+
+from image_ingest import UploadService
+from image_service import ImageService
+from image_similarity import SimilarityIndex
+from lazy_loader import LazyComponent
+from metrics import Metrics, time_image_operation
+from query_audit import QueryBudgetAuditor
+from request_profiler import RequestProfiler, profile_section
+from static_assets import StaticAssets
+
+db = SQLAlchemy()
+login_manager = LoginManager()
+
+# Fingerprint static URLs so they can be cached as immutable
+static_assets = StaticAssets()
+
+# Log requests that exceed the query budget in development
+query_auditor = QueryBudgetAuditor()
+
+# Per-request SQL/template/OpenCV timings and slow-request log
+request_profiler = RequestProfiler()
+
+# Prometheus metrics at /metrics
+metrics = Metrics()
+
+# AI components are built on first use; AIAnalyzer imports OpenCV/NumPy/Pillow
+ai_analyzer = LazyComponent('ai_analyzer', 'AIAnalyzer')
+ai_guide_generator = LazyComponent('ai_guide_generator', 'AIGuideGenerator')
+
+# OpenCV jobs go to the image service when IMAGE_SERVICE_SOCKET is set
+image_service = ImageService(ai_analyzer)
+
+# Every upload route stores and analyzes images through this
+uploads = UploadService(image_service)
+
+# Perceptual-hash search for similar and duplicate artworks
+similarity_index = SimilarityIndex()
+
+
+@contextmanager
+def image_operation(operation, style=None):
+    """Attribute an OpenCV call to the request profile and the image metrics"""
+    with profile_section('opencv'), time_image_operation(operation, style):
+        yield
@@ -0,0 +1,84 @@
+"""
+Gunicorn configuration for ArtAI
+
+Loaded automatically by `gunicorn` when run from the project directory
+(deploy.sh passes it explicitly with --config). ArtAI runs as two pools
+of the same app, selected with ARTAI_POOL:
+
+- web (default): page views, forum, voting. I/O-bound on SQLite and
+  templates, so threaded workers serve several requests per process.
+- image: uploads and the OpenCV routes (see the nginx config in
+  deploy.sh). CPU-bound, so one request per process, one process per
+  core and a longer timeout.
+
+The app is preloaded from wsgi.py in the master and shared copy-on-write
+by the workers.
+"""
+
+import multiprocessing
+import os
+import shutil
+
+POOLS = {
+    'web': {
+        'bind': 'unix:artai.sock',
+        'worker_class': 'gthread',
+        'workers': multiprocessing.cpu_count() + 1,
+        'threads': 4,
+        'timeout': 30,
+        'max_requests': 5000,
+    },
+    'image': {
+        'bind': 'unix:artai_image.sock',
+        'worker_class': 'sync',
+        'workers': multiprocessing.cpu_count(),
+        'threads': 1,
+        'timeout': 120,
+        # OpenCV buffers fragment the heap; recycle workers now and then
+        'max_requests': 500,
+    },
+}
+
+pool = os.environ.get('ARTAI_POOL', 'web')
+settings = POOLS[pool]
+
+wsgi_app = 'wsgi:application'
+preload_app = True
+bind = settings['bind']
+umask = 0o007
+worker_class = settings['worker_class']
+workers = int(os.environ.get('ARTAI_WORKERS', settings['workers']))
+threads = settings['threads']
+timeout = settings['timeout']
+max_requests = settings['max_requests']
+max_requests_jitter = settings['max_requests'] // 10
+proc_name = f'artai-{pool}'
+
+# Each worker writes its Prometheus samples here and /metrics aggregates them.
+# This has to be set before prometheus_client is imported by the app.
+prometheus_dir = os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', f'/tmp/artai_metrics_{pool}')
+# The preloaded app creates its metric files before on_starting runs
+os.makedirs(prometheus_dir, exist_ok=True)
+
+
+def on_starting(server):
+    """Start every master process with an empty metrics directory"""
+    shutil.rmtree(prometheus_dir, ignore_errors=True)
+    os.makedirs(prometheus_dir, exist_ok=True)
+
+
+def post_fork(server, worker):
+    """Give each worker its own database connections and its share of the cores for OpenCV"""
+    from extensions import db
+    from image_concurrency import concurrency
+    from wsgi import application
+    with application.app_context():
+        db.engine.dispose(close=False)
+    # Without an image service, style previews render on threads of the worker itself
+    concurrency.configure(processes=server.cfg.workers, fan_out=not application.config['IMAGE_SERVICE_SOCKET'])
+
+
+def child_exit(server, worker):
+    """Drop live gauges of workers that exited"""
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,58 @@
+"""
+Scratch buffers reused across renders
+
+Every step of a style's filter chain used to allocate a new full-size
+array. Fresh allocations of that size are mmap'd, so each render paid for
+page faults on memory it had just released. The chains now write their
+intermediate results into buffers from a BufferPool via OpenCV's dst=
+arguments. The pool keeps those buffers per thread and hands the same ones
+to the next render. A chain's final result is still allocated normally,
+because it outlives the chain.
+"""
+
+import threading
+
+import numpy as np
+
+
+class BufferPool:
+    """Scratch arrays for filter chains, kept per thread up to `capacity` bytes"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.local = threading.local()
+
+    def get(self, name, shape, dtype=np.uint8):
+        """Array of the given shape for one step of a chain
+
+        Its contents are left over from an earlier render and it is reused
+        by the next one on this thread, so a chain must not return it.
+        Buffers are kept per name, row shape and dtype and grow to the
+        tallest image seen; the least recently used are dropped when the
+        pool holds more than its capacity.
+        """
+        buffers = self._buffers()
+        key = (name, tuple(shape[1:]), np.dtype(dtype))
+        buffer = buffers.pop(key, None)
+        if buffer is None or buffer.shape[0] < shape[0]:
+            buffer = np.empty(shape, dtype)
+        buffers[key] = buffer
+
+        total = self.held()
+        while buffers and total > self.capacity:
+            total -= buffers.pop(next(iter(buffers))).nbytes
+        return buffer[:shape[0]]
+
+    def held(self):
+        """Bytes of buffers kept for this thread"""
+        return sum(buffer.nbytes for buffer in self._buffers().values())
+
+    def clear(self):
+        """Release this thread's buffers"""
+        self._buffers().clear()
+
+    def _buffers(self):
+        buffers = getattr(self.local, 'buffers', None)
+        if buffers is None:
+            buffers = self.local.buffers = {}
+        return buffers
@@ -0,0 +1,122 @@
+"""
+OpenCV thread control for processes that run image jobs
+
+OpenCV parallelises its filters over every core by default, in every
+process that imports it. Three gunicorn workers on four cores rendering
+at the same time therefore run twelve filter threads, which spend their
+time switching instead of working. The ImageConcurrency of a process
+decides how many OpenCV threads the process may use and how many image
+jobs it runs at once:
+
+- A process gets its share of the cores: all of them for a lone image
+  service worker, cores / workers for each gunicorn worker
+  (ARTAI_OPENCV_THREADS overrides it).
+- A job running alone uses the whole share, so a single large render
+  finishes sooner (intra-op parallelism). Jobs running side by side split
+  it, down to one thread each, so throughput comes from serving requests
+  in parallel instead (inter-request parallelism).
+- At most `max_jobs` jobs run at once (ARTAI_IMAGE_JOBS, by default one
+  per thread of the share). Further jobs wait for a slot. A process that
+  fans one request out over threads - gunicorn workers rendering style
+  previews without an image service - gets one slot per core instead.
+
+AIAnalyzer's public methods are wrapped with image_job, so every caller
+goes through the process's `concurrency`. The image service knows how many
+jobs its worker processes are running and passes each job its share of
+the cores (see ImageWorkerServer).
+"""
+
+import functools
+import os
+import threading
+from contextlib import contextmanager
+
+
+def cpu_count():
+    """Cores this process may run on"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+class ImageConcurrency:
+    """The OpenCV thread share of this process and the slots for its image jobs"""
+
+    def __init__(self):
+        self.threads = 1
+        self.max_jobs = 1
+        self.semaphore = None
+        self.active = 0
+        self.applied = None
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.configure()
+
+    def configure(self, processes=1, threads=None, max_jobs=None, fan_out=False):
+        """Share the cores between `processes` processes that run image jobs
+
+        With fan_out, the process may run a job per core (each with the
+        threads its share allows when they run together) so one request
+        split over threads can use idle cores. Call it when the process
+        starts, before any job runs.
+        """
+        threads = threads or int(os.environ.get('ARTAI_OPENCV_THREADS', 0)) or max(1, cpu_count() // processes)
+        max_jobs = max_jobs or int(os.environ.get('ARTAI_IMAGE_JOBS', 0)) or (cpu_count() if fan_out else threads)
+        with self.lock:
+            self.threads = threads
+            self.max_jobs = max_jobs
+            self.semaphore = threading.BoundedSemaphore(max_jobs)
+
+    def set_threads(self, threads):
+        """Change the thread share for the next jobs, e.g. as the load on the machine changes"""
+        with self.lock:
+            self.threads = max(1, threads)
+
+    @contextmanager
+    def job(self):
+        """Run one image job: wait for a free slot, then set OpenCV to the job's share of the threads"""
+        if getattr(self.local, 'running', False):
+            # Part of a job this thread is already running
+            yield
+            return
+        semaphore = self.semaphore
+        semaphore.acquire()
+        self.local.running = True
+        with self.lock:
+            self.active += 1
+            self._apply()
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.active -= 1
+                self._apply()
+            self.local.running = False
+            semaphore.release()
+
+    def stats(self):
+        with self.lock:
+            return {'threads': self.threads, 'max_jobs': self.max_jobs, 'active': self.active,
+                    'opencv_threads': self.applied}
+
+    def _apply(self):
+        # OpenCV's thread count is process-wide, so it follows the number of running jobs
+        threads = max(1, self.threads // max(self.active, 1))
+        if threads != self.applied:
+            import cv2
+            cv2.setNumThreads(threads)
+            self.applied = threads
+
+
+# One per process; gunicorn's post_fork and the image service configure it
+concurrency = ImageConcurrency()
+
+
+def image_job(method):
+    """Run a method as an image job of this process's `concurrency`"""
+    @functools.wraps(method)
+    def run(*args, **kwargs):
+        with concurrency.job():
+            return method(*args, **kwargs)
+    return run
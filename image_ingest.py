@@ -0,0 +1,550 @@
+"""
+Upload ingestion shared by every route that stores an image
+
+Artwork uploads, challenge and battle entries and saved drawings all go
+through UploadService.ingest / ingest_bytes:
+
+- The upload is decoded straight from the buffer Werkzeug already holds
+  it in (np.frombuffer + cv2.imdecode, no copy) and checked to be a
+  browser-displayable image of a sensible size before anything is
+  written.
+- The original bytes are written to a temporary file in chunks while
+  their SHA-256 is computed, then stored as <sha256>.<ext>; a file whose
+  content is already stored is not written again. Artworks refer to the
+  stored file by Artwork.filename, and a file is deleted once the last
+  artwork or profile picture referring to it is (release). An upload
+  that stores or reuses a file claims it until its transaction ends, so
+  the file cannot be deleted before the new artwork refers to it. The
+  claims and the lock serializing them are kept in UPLOAD_STATE_FOLDER
+  (instance/uploads), out of the static folder nginx serves.
+- A thumbnail and the perceptual hash (image_similarity.py) are made
+  from the decoded image.
+- Analysis is queued on a small thread pool and stored on the artwork
+  when it finishes, so the request doesn't wait for it. Content that was
+  analyzed before (or is being analyzed) reuses that analysis.
+
+`python image_ingest.py dedupe` moves uploads stored before this to
+their content-addressed names, merging identical files.
+"""
+
+import argparse
+import fcntl
+import hashlib
+import io
+import logging
+import mmap
+import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from flask import url_for
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from image_similarity import perceptual_hash, to_column
+
+# Formats browsers display, by the bytes their files start with -> stored extension
+FORMATS = {
+    'jpeg': (b'\xff\xd8\xff', '.jpg'),
+    'png': (b'\x89PNG\r\n\x1a\n', '.png'),
+    'gif': (b'GIF8', '.gif'),
+    'bmp': (b'BM', '.bmp'),
+    'webp': (b'RIFF', '.webp'),  # followed by the size and b'WEBP'
+}
+MIN_IMAGE_SIDE = 16
+MAX_IMAGE_SIDE = 12000
+MAX_IMAGE_PIXELS = 50_000_000
+CHUNK_SIZE = 256 * 1024
+THUMBNAIL_FOLDER = 'thumbs'
+RENDER_FOLDER = 'renders'
+CLAIM_FOLDER = 'claims'
+# A claim this old belongs to a request that died before its transaction ended
+CLAIM_SECONDS = 600
+# Queued analyses that keep their decoded image; later ones read the stored file
+ANALYSIS_QUEUE_IMAGES = 4
+ANALYSIS_UNAVAILABLE = {'feedback': 'AI analysis is temporarily unavailable.', 'score': 0}
+
+logger = logging.getLogger(__name__)
+
+
+class UploadRejected(ValueError):
+    """The upload is not an image the site accepts; the message is shown to the user"""
+
+
+def image_format(data):
+    """Format of encoded image bytes, or None if it is not one of FORMATS"""
+    header = bytes(data[:12])
+    for name, (magic, _) in FORMATS.items():
+        if header.startswith(magic) and (name != 'webp' or header[8:12] == b'WEBP'):
+            return name
+    return None
+
+
+@contextmanager
+def upload_buffer(stream):
+    """The bytes of an uploaded file as a buffer, without copying them where the stream allows it"""
+    # Werkzeug spools uploads: small ones stay in a BytesIO, larger ones go to a temporary file
+    raw = getattr(stream, '_file', stream)
+    if isinstance(raw, io.BytesIO):
+        buffer = raw.getbuffer()
+    else:
+        try:
+            buffer = mmap.mmap(raw.fileno(), 0, access=mmap.ACCESS_READ)
+        except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+            stream.seek(0)
+            buffer = memoryview(stream.read())
+    try:
+        yield buffer
+    finally:
+        # Callers must not keep views of the buffer past this point
+        buffer.release() if isinstance(buffer, memoryview) else buffer.close()
+
+
+def decode_image(data):
+    """Decode and check encoded image bytes; returns (format, BGR image) or raises UploadRejected"""
+    # Imported here so the web workers that never ingest images don't load OpenCV
+    import cv2
+    import numpy as np
+
+    if not len(data):
+        raise UploadRejected('The uploaded file is empty.')
+    image_type = image_format(data)
+    if image_type is None:
+        raise UploadRejected('Please upload a JPEG, PNG, GIF, WebP or BMP image.')
+
+    try:
+        image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    except cv2.error:
+        image = None
+    if image is None:
+        raise UploadRejected('The image could not be read; the file may be damaged.')
+    height, width = image.shape[:2]
+    if min(width, height) < MIN_IMAGE_SIDE:
+        raise UploadRejected(f'The image must be at least {MIN_IMAGE_SIDE} pixels wide and high.')
+    if max(width, height) > MAX_IMAGE_SIDE or width * height > MAX_IMAGE_PIXELS:
+        raise UploadRejected(f'The image is too large ({width}x{height}); '
+                             f'please upload one of at most {MAX_IMAGE_PIXELS // 1_000_000} megapixels.')
+    return image_type, image
+
+
+@contextmanager
+def storage_lock(state_folder):
+    """Serialize storing, claiming and deleting uploads, between threads and processes"""
+    with open(os.path.join(state_folder, 'storage.lock'), 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def claimed(state_folder, sha256):
+    """Whether an upload that has not finished yet uses the file with this hash
+
+    Call it under storage_lock; expired claims are deleted on the way.
+    """
+    claims = os.path.join(state_folder, CLAIM_FOLDER, sha256)
+    try:
+        names = os.listdir(claims)
+    except FileNotFoundError:
+        return False
+    now = time.time()
+    live = False
+    for name in names:
+        path = os.path.join(claims, name)
+        try:
+            if now - os.path.getmtime(path) < CLAIM_SECONDS:
+                live = True
+            else:
+                os.unlink(path)
+        except FileNotFoundError:
+            pass
+    if not live:
+        remove_empty(claims)
+    return live
+
+
+def remove_empty(folder):
+    try:
+        os.rmdir(folder)
+    except OSError:
+        pass
+
+
+def store_content(data, folder, extension, state_folder):
+    """Write data to folder as <sha256><extension> unless that file exists
+
+    Returns (filename, sha256, written, claim): the stored file is claimed
+    until the caller deletes the `claim` path (see drop_claim), after the
+    row referring to it is committed or rolled back.
+    """
+    digest = hashlib.sha256()
+    partial = os.path.join(folder, f'.{uuid.uuid4().hex}.part')
+    try:
+        with open(partial, 'wb') as f:
+            for start in range(0, len(data), CHUNK_SIZE):
+                chunk = data[start:start + CHUNK_SIZE]
+                digest.update(chunk)
+                f.write(chunk)
+        sha256 = digest.hexdigest()
+        filename = sha256 + extension
+        path = os.path.join(folder, filename)
+        claims = os.path.join(state_folder, CLAIM_FOLDER, sha256)
+        claim = os.path.join(claims, uuid.uuid4().hex)
+        # release() deletes under the same lock, and only files nobody has claimed
+        with storage_lock(state_folder):
+            os.makedirs(claims, exist_ok=True)
+            open(claim, 'x').close()
+            if os.path.exists(path):
+                return filename, sha256, False, claim
+            # Appears under its final name complete or not at all
+            os.replace(partial, path)
+            return filename, sha256, True, claim
+    finally:
+        if os.path.exists(partial):
+            os.unlink(partial)
+
+
+def drop_claim(state_folder, claim):
+    """Delete a claim made by store_content, and its hash's folder once no claims are left"""
+    with storage_lock(state_folder):
+        try:
+            os.unlink(claim)
+        except FileNotFoundError:
+            pass
+        remove_empty(os.path.dirname(claim))
+
+
+def make_thumbnail(image, path, max_side):
+    """Write a JPEG of the image scaled down to max_side"""
+    import cv2
+
+    scale = max_side / max(image.shape[:2])
+    if scale < 1:
+        image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    encoded, data = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, 85])
+    if encoded:
+        partial = f'{path}.{uuid.uuid4().hex}.part'
+        with open(partial, 'wb') as f:
+            f.write(data)
+        os.replace(partial, path)
+
+
+def file_sha256(path):
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def dedupe_uploads(folder, thumbnail_size, dry_run=False):
+    """Move uploads to their content-addressed names, merging identical files
+
+    Runs in an app context. Artwork.filename and User.profile_picture are
+    pointed at the new names before the old files are deleted, so an
+    interrupted run leaves extra files but no broken references.
+    """
+    from extensions import db
+    from models import Artwork, User
+
+    stats = {'files': 0, 'renamed': 0, 'duplicates': 0, 'bytes_freed': 0, 'references': 0, 'thumbnails': 0}
+    stored = set(os.listdir(folder))
+    renamed = {}
+    for name in sorted(stored):
+        path = os.path.join(folder, name)
+        # 'default.jpg' stands for "no profile picture", not for a file
+        if name.startswith('.') or name == 'default.jpg' or not os.path.isfile(path):
+            continue
+        stats['files'] += 1
+        with open(path, 'rb') as f:
+            image_type = image_format(f.read(12))
+        extension = FORMATS[image_type][1] if image_type else os.path.splitext(name)[1].lower()
+        target = file_sha256(path) + extension
+        if target == name:
+            continue
+        renamed[name] = target
+        if target in stored:
+            stats['duplicates'] += 1
+            stats['bytes_freed'] += os.path.getsize(path)
+            continue
+        stored.add(target)
+        stats['renamed'] += 1
+        if not dry_run:
+            try:
+                os.link(path, os.path.join(folder, target))
+            except OSError:
+                shutil.copy2(path, os.path.join(folder, target))
+
+    for name, target in renamed.items():
+        stats['references'] += Artwork.query.filter_by(filename=name).update({'filename': target})
+        stats['references'] += User.query.filter_by(profile_picture=name).update({'profile_picture': target})
+    if dry_run:
+        db.session.rollback()
+        return stats
+    db.session.commit()
+
+    renders = os.path.join(folder, RENDER_FOLDER)
+    render_names = os.listdir(renders) if os.path.isdir(renders) else []
+    for name in renamed:
+        os.unlink(os.path.join(folder, name))
+        # Renders are cached by source file name; the new name renders afresh
+        stem = os.path.splitext(name)[0] + '_'
+        for render in render_names:
+            if render.startswith(stem):
+                os.unlink(os.path.join(renders, render))
+
+    import cv2
+    for name in set(renamed.values()):
+        thumbnail = os.path.join(folder, THUMBNAIL_FOLDER, os.path.splitext(name)[0] + '.jpg')
+        image = None if os.path.exists(thumbnail) else cv2.imread(os.path.join(folder, name), cv2.IMREAD_COLOR)
+        if image is not None:
+            os.makedirs(os.path.dirname(thumbnail), exist_ok=True)
+            make_thumbnail(image, thumbnail, thumbnail_size)
+            stats['thumbnails'] += 1
+    return stats
+
+
+class UploadService:
+    """Flask extension that validates, stores and analyzes uploaded images"""
+
+    def __init__(self, image_service=None, app=None):
+        self.image_service = image_service
+        self.app = None
+        self.folder = None
+        self.state_folder = None
+        self.thumbnail_size = None
+        self.executor = None
+        self.queued_images = 0
+        self.lock = threading.Lock()
+        self.thumbnails = set()
+        # sha256 -> ids of the artworks waiting for its analysis
+        self.analyzing = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('UPLOAD_THUMBNAIL_SIZE', 480)
+        # Threads analyzing uploads in the background; 0 analyzes during the request
+        app.config.setdefault('UPLOAD_ANALYSIS_WORKERS', 2)
+        # Claims on stored files and their lock, shared by every process of the app
+        app.config.setdefault('UPLOAD_STATE_FOLDER', os.path.join(app.instance_path, 'uploads'))
+
+        self.app = app
+        self.folder = app.config['UPLOAD_FOLDER']
+        self.state_folder = app.config['UPLOAD_STATE_FOLDER']
+        self.thumbnail_size = app.config['UPLOAD_THUMBNAIL_SIZE']
+        os.makedirs(os.path.join(self.folder, THUMBNAIL_FOLDER), exist_ok=True)
+        os.makedirs(os.path.join(self.state_folder, CLAIM_FOLDER), exist_ok=True)
+        workers = app.config['UPLOAD_ANALYSIS_WORKERS']
+        self.executor = ThreadPoolExecutor(workers, thread_name_prefix='upload-analysis') if workers else None
+        app.add_template_global(self.thumbnail_url)
+        app.extensions['uploads'] = self
+        # Files of deleted artworks are released once the deletion is committed,
+        # and the claims of uploads dropped once their rows are committed or abandoned
+        event.listen(Session, 'after_commit', self._release_committed)
+        event.listen(Session, 'after_rollback', lambda session: session.info.pop('released_uploads', None))
+        event.listen(Session, 'after_transaction_end', self._transaction_ended)
+
+    def ingest(self, file, source):
+        """Store an uploaded file (a Werkzeug FileStorage); see ingest_bytes"""
+        with upload_buffer(file.stream) as buffer:
+            return self.ingest_bytes(buffer, source)
+
+    def ingest_bytes(self, data, source):
+        """Validate and store encoded image bytes
+
+        Returns a dict with the stored 'filename' and 'path', its 'sha256',
+        whether it was 'written' (False if the same content was stored
+        already), the 'size', 'format', 'width', 'height', the decoded
+        BGR 'image' and its 'phash' as stored in Artwork.phash. Raises UploadRejected before anything is written if
+        the data is not an accepted image.
+        """
+        from extensions import db
+        from metrics import observe_upload
+
+        image_type, image = decode_image(data)
+        filename, sha256, written, claim = store_content(data, self.folder, FORMATS[image_type][1], self.state_folder)
+        db.session.info.setdefault('upload_claims', []).append((claim, filename))
+        path = os.path.join(self.folder, filename)
+        thumbnail = self._thumbnail_path(filename)
+        if written or not os.path.exists(thumbnail):
+            make_thumbnail(image, thumbnail, self.thumbnail_size)
+        observe_upload(path, source)
+        return {'filename': filename, 'path': path, 'sha256': sha256, 'written': written, 'size': len(data),
+                'format': image_type, 'width': image.shape[1], 'height': image.shape[0], 'image': image,
+                'phash': to_column(perceptual_hash(image))}
+
+    def queue_analysis(self, artwork_id, upload):
+        """Analyze an ingested upload and store the result on its artwork, in the background if configured"""
+        if not upload['written'] and self._reuse_analysis(artwork_id, upload['filename']):
+            return
+        sha256 = upload['sha256']
+        with self.lock:
+            if sha256 in self.analyzing:
+                # The same content is being analyzed for another artwork
+                self.analyzing[sha256].append(artwork_id)
+                return
+            self.analyzing[sha256] = [artwork_id]
+            # Queued decoded images are what bounds the queue's memory
+            keep_image = self.executor is None or self.queued_images < ANALYSIS_QUEUE_IMAGES
+            self.queued_images += keep_image
+        image = upload['image'] if keep_image else None
+        if self.executor is None:
+            self._analyze(sha256, upload['path'], image, keep_image)
+        else:
+            self.executor.submit(self._analyze, sha256, upload['path'], image, keep_image)
+
+    def references(self, filename, connection=None):
+        """Number of artworks and profile pictures that refer to a stored file"""
+        from models import Artwork, User
+
+        query = select(select(func.count()).where(Artwork.filename == filename).scalar_subquery()
+                       + select(func.count()).where(User.profile_picture == filename).scalar_subquery())
+        if connection is not None:
+            return connection.execute(query).scalar()
+        from extensions import db
+        return db.session.execute(query).scalar()
+
+    def release(self, filename):
+        """Delete a stored file, its thumbnail and its renders if nothing refers to it any more; returns whether it did"""
+        from extensions import db
+
+        stem = os.path.splitext(filename)[0]
+        with storage_lock(self.state_folder):
+            # An upload of the same content may be about to commit a row referring to the file
+            if claimed(self.state_folder, stem):
+                return False
+            with self.app.app_context(), db.engine.connect() as connection:
+                if self.references(filename, connection):
+                    return False
+            renders = os.path.join(self.folder, RENDER_FOLDER)
+            paths = [os.path.join(self.folder, filename), self._thumbnail_path(filename)]
+            if os.path.isdir(renders):
+                paths += [os.path.join(renders, name) for name in os.listdir(renders) if name.startswith(stem + '_')]
+            for path in paths:
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+        self.thumbnails.discard(filename)
+        return True
+
+    def release_after_commit(self, session, filename):
+        """Release a file once the session's transaction (which deletes a reference to it) commits"""
+        session.info.setdefault('released_uploads', set()).add(filename)
+
+    def thumbnail_url(self, filename):
+        """URL of an upload's thumbnail, or of the upload itself if it has none (older uploads)"""
+        if filename not in self.thumbnails:
+            if not os.path.exists(self._thumbnail_path(filename)):
+                return url_for('static', filename='uploads/' + filename)
+            self.thumbnails.add(filename)
+        return url_for('static', filename=f'uploads/{THUMBNAIL_FOLDER}/{os.path.splitext(filename)[0]}.jpg')
+
+    def _thumbnail_path(self, filename):
+        return os.path.join(self.folder, THUMBNAIL_FOLDER, os.path.splitext(filename)[0] + '.jpg')
+
+    def _reuse_analysis(self, artwork_id, filename):
+        """Copy the analysis of an earlier artwork with the same file; returns whether there was one"""
+        from extensions import db
+        from models import Artwork
+
+        analyzed = Artwork.query.filter(Artwork.filename == filename, Artwork.id != artwork_id,
+                                        Artwork.ai_feedback.isnot(None),
+                                        Artwork.ai_feedback != ANALYSIS_UNAVAILABLE['feedback']).first()
+        if analyzed is None:
+            return False
+        artwork = db.session.get(Artwork, artwork_id)
+        artwork.ai_feedback = analyzed.ai_feedback
+        artwork.ai_score = analyzed.ai_score
+        db.session.commit()
+        return True
+
+    def _analyze(self, sha256, path, image, kept_image):
+        from extensions import db, image_operation
+        from image_service import ImageServiceError
+        from models import Artwork
+
+        artwork_ids = []
+        try:
+            with self.app.app_context():
+                try:
+                    with image_operation('analyze'):
+                        analysis = self.image_service.analyze_artwork(path, image)
+                except ImageServiceError:
+                    # Keep the upload even when the image service cannot analyze it right now
+                    analysis = ANALYSIS_UNAVAILABLE
+                # Store before forgetting the analysis, so duplicates find it in one place or the other
+                while True:
+                    with self.lock:
+                        waiting = self.analyzing[sha256][len(artwork_ids):]
+                        if not waiting:
+                            del self.analyzing[sha256]
+                            break
+                    artwork_ids += waiting
+                    for artwork in Artwork.query.filter(Artwork.id.in_(waiting)):
+                        artwork.ai_feedback = analysis['feedback']
+                        artwork.ai_score = analysis['score']
+                    db.session.commit()
+        except Exception:
+            logger.exception('Analysis of %s failed (artworks %s)', path, artwork_ids)
+        finally:
+            with self.lock:
+                self.analyzing.pop(sha256, None)
+                if kept_image:
+                    self.queued_images -= 1
+
+    def _release_committed(self, session):
+        self._drop_claims(session)
+        for filename in session.info.pop('released_uploads', ()):
+            self._release_later(filename)
+
+    def _transaction_ended(self, session, transaction):
+        # Claims left after a rollback or close: the upload's artwork was never stored,
+        # so nothing may refer to its file
+        if transaction.parent is None:
+            for filename in self._drop_claims(session):
+                self._release_later(filename)
+
+    def _drop_claims(self, session):
+        claims = session.info.pop('upload_claims', ())
+        for claim, _ in claims:
+            drop_claim(self.state_folder, claim)
+        return [filename for _, filename in claims]
+
+    def _release_later(self, filename):
+        if self.executor is None:
+            self.release(filename)
+        else:
+            self.executor.submit(self.release, filename)
+
+
+def main():
+    """Deduplicate the uploads folder of an existing installation"""
+    parser = argparse.ArgumentParser(description='ArtAI upload storage')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    dedupe = subparsers.add_parser('dedupe', help='move uploads to content-addressed names and merge identical files')
+    dedupe.add_argument('--dry-run', action='store_true', help='report what would change without changing anything')
+    args = parser.parse_args()
+
+    from application import create_app
+
+    app = create_app()
+    with app.app_context():
+        stats = dedupe_uploads(app.config['UPLOAD_FOLDER'], app.config['UPLOAD_THUMBNAIL_SIZE'], args.dry_run)
+    prefix = '🔍 Would move' if args.dry_run else '✅ Moved'
+    print(f"{prefix} {stats['renamed']} of {stats['files']} uploads to content-addressed names, "
+          f"merging {stats['duplicates']} duplicates ({stats['bytes_freed'] / 1024 / 1024:.1f} MB) "
+          f"and updating {stats['references']} references")
+    if stats['thumbnails']:
+        print(f"🖼️ Made {stats['thumbnails']} thumbnails")
+
+
+if __name__ == '__main__':
+    main()
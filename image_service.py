@@ -0,0 +1,581 @@
+#!/usr/bin/env python3
+"""
+Image-processing service for ArtAI
+
+OpenCV work (analysis, redraw, style transfer, palettes) runs in a pool of
+worker processes behind a Unix socket instead of inside the gunicorn
+workers that render pages, so a burst of style transfers queues up here
+rather than starving page requests. Web workers submit jobs through the
+ImageService extension. The service runs at most --max-pending jobs at
+once (running or queued for a worker process) and answers "busy" beyond
+that; jobs that exceed their timeout are reported as such to the caller.
+Style previews for the style-transfer page are a streaming job: the image
+is decoded once at preview size, its styles render in parallel on the
+worker processes and each result is sent back as soon as it is ready.
+Full-resolution renders are written to a file by the worker instead of
+being sent back; ImageService.render_full_resolution caches them on disk.
+Each job is told how many OpenCV threads to use: every core when it is
+the only job running, an equal share of the cores when the workers are
+busy (see image_concurrency).
+
+    python image_service.py serve --socket artai_images.sock --workers 4
+    python image_service.py status --socket artai_images.sock
+
+Requests are pickled over the socket, so it is created group-only (0660)
+and clients must prove they know a shared key before anything they send is
+unpickled. The service creates the key as <socket>.key (0640) on first
+start, or reads --key-file / IMAGE_SERVICE_KEY_FILE; keep both in a
+directory only the app's user can reach. Full-resolution renders are only
+written into --render-folder (static/uploads/renders, as the app uses).
+Without IMAGE_SERVICE_SOCKET the app runs image jobs in-process as before.
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import secrets
+import signal
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import (FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait,
+                                TimeoutError as FutureTimeout)
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+
+from image_concurrency import concurrency, cpu_count
+from metrics import record_cache_lookup, record_image_service_rejection
+
+# AIAnalyzer methods the service runs; each takes the image path first
+OPERATIONS = ('analyze_artwork', 'redraw_artwork', 'apply_style_transfer', 'generate_color_palette',
+              'render_to_file')
+DEFAULT_TIMEOUT = 60  # seconds
+PREVIEW_SIZE = 512  # longer side of style previews, in pixels
+RESPONSE_GRACE = 5  # extra seconds the client waits for the service's own timeout reply
+# Part of the cached render file names; bump it when a renderer's output changes
+RENDER_VERSION = 4
+RENDER_FOLDER = os.path.join('static', 'uploads', 'renders')
+
+logger = logging.getLogger(__name__)
+
+
+class ImageServiceError(Exception):
+    """An image job could not be run by the image service"""
+
+
+class ImageServiceBusy(ImageServiceError):
+    """The service already has as many jobs as it accepts"""
+
+
+class ImageServiceTimeout(ImageServiceError):
+    """The job did not finish within its timeout"""
+
+
+class ImageServiceUnavailable(ImageServiceError):
+    """The service socket could not be reached"""
+
+
+def key_file(address):
+    """Where the key shared by the service and its clients is kept"""
+    return os.environ.get('IMAGE_SERVICE_KEY_FILE') or address + '.key'
+
+
+def read_key(path, create=False):
+    """The shared key in path, generating it first if create is set and there is none"""
+    if create:
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o640)
+        except FileExistsError:
+            pass
+        else:
+            with os.fdopen(fd, 'w') as f:
+                f.write(secrets.token_hex(32))
+    with open(path) as f:
+        return f.read().strip().encode()
+
+
+# Worker processes build their own analyzer; the OpenCV import is inherited from the server
+_analyzer = None
+
+
+def _init_worker(memory_budget):
+    global _analyzer
+    # Stop Ctrl+C in a terminal from killing jobs; the server shuts the pool down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    from ai_analyzer import AIAnalyzer
+    _analyzer = AIAnalyzer(memory_budget)
+
+
+def _run_job(operation, args, threads):
+    concurrency.set_threads(threads)
+    return getattr(_analyzer, operation)(*args)
+
+
+def _run_preview(image, style_name, threads):
+    concurrency.set_threads(threads)
+    return _analyzer.style_preview(image, style_name)
+
+
+class ImageWorkerServer:
+    """Accepts jobs on a Unix socket and runs them in a process pool"""
+
+    def __init__(self, address, workers, max_pending, job_timeout=DEFAULT_TIMEOUT, memory_budget=None,
+                 key_path=None, render_folder=RENDER_FOLDER):
+        self.address = address
+        self.key_path = key_path or key_file(address)
+        self.render_folder = render_folder
+        self.workers = workers
+        self.max_pending = max_pending
+        self.job_timeout = job_timeout
+        self.memory_budget = memory_budget
+        self.cores = cpu_count()
+        self.executor = None
+        self.analyzer = None
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.lock = threading.Lock()
+
+    def serve_forever(self):
+        # Import OpenCV once here so forked worker processes share it
+        from ai_analyzer import AIAnalyzer
+        self.analyzer = AIAnalyzer(self.memory_budget)
+
+        self.executor = self._new_executor()
+        if os.path.exists(self.address):
+            os.unlink(self.address)
+        listener = Listener(self.address, family='AF_UNIX', authkey=read_key(self.key_path, create=True))
+        os.chmod(self.address, 0o660)
+        logger.info('Image service listening on %s with %d workers', self.address, self.workers)
+        try:
+            while True:
+                try:
+                    connection = listener.accept()
+                except (OSError, AuthenticationError) as e:
+                    logger.warning('Rejected image service connection: %s', e)
+                    continue
+                threading.Thread(target=self._handle, args=(connection,), daemon=True).start()
+        finally:
+            listener.close()
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        with self.lock:
+            return {'workers': self.workers, 'max_pending': self.max_pending, 'in_flight': self.in_flight,
+                    'completed': self.completed, 'rejected': self.rejected}
+
+    def _new_executor(self):
+        return ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(self.memory_budget,))
+
+    def _handle(self, connection):
+        """Answer the requests of one client connection until it closes"""
+        with connection:
+            while True:
+                try:
+                    operation, args, timeout = connection.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    if operation == 'style_previews':
+                        self._stream_previews(connection, *args, timeout=timeout)
+                    else:
+                        connection.send(self._dispatch(operation, args, timeout))
+                except OSError:
+                    return
+
+    def _dispatch(self, operation, args, timeout):
+        if operation == 'stats':
+            return 'ok', self.stats()
+        if operation not in OPERATIONS:
+            return 'error', f'Unknown image operation: {operation}'
+        if operation == 'render_to_file' and not self._in_render_folder(args[1] if len(args) > 1 else None):
+            return 'error', 'Renders can only be written to the render folder'
+
+        with self.lock:
+            if self.in_flight >= self.max_pending:
+                self.rejected += 1
+                return 'busy', None
+            self.in_flight += 1
+            executor = self.executor
+            threads = self._job_threads()
+
+        try:
+            future = executor.submit(_run_job, operation, args, threads)
+        except BrokenProcessPool:
+            with self.lock:
+                self.in_flight -= 1
+            self._replace_executor(executor)
+            return 'error', 'Image worker pool restarted, please retry'
+        # The slot stays taken until the job really ends, even if the caller gave up on it
+        future.add_done_callback(self._finished)
+
+        try:
+            return 'ok', future.result(timeout=min(timeout or self.job_timeout, self.job_timeout))
+        except FutureTimeout:
+            return 'timeout', None
+        except BrokenProcessPool:
+            self._replace_executor(executor)
+            return 'error', 'Image worker crashed'
+        except Exception as e:
+            return 'error', str(e)
+
+    def _stream_previews(self, connection, image_path, styles, max_side=PREVIEW_SIZE, timeout=None):
+        """Send ('item', (style, image, message)) per style as each finishes, then ('ok', None)"""
+        styles = list(styles)
+        with self.lock:
+            free = self.max_pending - self.in_flight
+            if free < 1:
+                self.rejected += 1
+            else:
+                # Run up to one style per worker at a time, within the free slots
+                window = min(len(styles), self.workers, free)
+                self.in_flight += window
+                executor = self.executor
+        if free < 1:
+            connection.send(('busy', None))
+            return
+
+        pending = {}
+        reserved = window
+        deadline = time.monotonic() + min(timeout or self.job_timeout, self.job_timeout)
+        try:
+            image = self.analyzer.load_preview(image_path, max_side) if styles else None
+            if image is None:
+                for style in styles:
+                    connection.send(('item', (style, None, 'Unable to load image for style preview.')))
+                connection.send(('ok', None))
+                return
+
+            queue = list(reversed(styles))
+            while queue or pending:
+                while queue and reserved:
+                    style = queue.pop()
+                    with self.lock:
+                        threads = self._job_threads()
+                    future = executor.submit(_run_preview, image, style, threads)
+                    reserved -= 1
+                    future.add_done_callback(self._finished)
+                    pending[future] = style
+
+                done, _ = wait(pending, timeout=max(deadline - time.monotonic(), 0), return_when=FIRST_COMPLETED)
+                if not done:
+                    connection.send(('timeout', None))
+                    return
+                for future in done:
+                    style = pending.pop(future)
+                    try:
+                        styled_image, message = future.result()
+                    except BrokenProcessPool:
+                        raise
+                    except Exception as e:
+                        styled_image, message = None, str(e)
+                    connection.send(('item', (style, styled_image, message)))
+                    if queue:
+                        with self.lock:
+                            self.in_flight += 1
+                        reserved += 1
+            connection.send(('ok', None))
+        except BrokenProcessPool:
+            self._replace_executor(executor)
+            connection.send(('error', 'Image worker crashed'))
+        finally:
+            # Slots reserved for styles that were never submitted
+            with self.lock:
+                self.in_flight -= reserved
+
+    def _in_render_folder(self, path):
+        """Whether path names a file directly inside the render folder, once links are resolved"""
+        if not isinstance(path, str):
+            return False
+        folder = os.path.realpath(self.render_folder)
+        return os.path.dirname(os.path.realpath(path)) == folder
+
+    def _job_threads(self):
+        """OpenCV threads for a job submitted now: all cores when it runs alone, a share when jobs run side by side"""
+        return max(1, self.cores // min(max(self.in_flight, 1), self.workers))
+
+    def _finished(self, future):
+        with self.lock:
+            self.in_flight -= 1
+            self.completed += 1
+
+    def _replace_executor(self, broken):
+        """Start a new pool after a worker process died (e.g. OpenCV crashed)"""
+        with self.lock:
+            if self.executor is broken:
+                logger.error('Image worker process died, restarting the pool')
+                self.executor = self._new_executor()
+        broken.shutdown(wait=False)
+
+
+class ImageServiceClient:
+    """Submits jobs to the image service, one connection per thread"""
+
+    def __init__(self, address, timeout=DEFAULT_TIMEOUT, key_path=None):
+        self.address = address
+        self.timeout = timeout
+        self.key_path = key_path or key_file(address)
+        self.local = threading.local()
+
+    def call(self, operation, *args, timeout=None):
+        """Run a job and return its result"""
+        timeout = timeout or self.timeout
+        connection = self._send((operation, args, timeout))
+        status, result = self._receive(connection, timeout)
+        return self._result(status, result)
+
+    def stream(self, operation, *args, timeout=None):
+        """Run a streaming job, yielding its items as the service sends them"""
+        timeout = timeout or self.timeout
+        deadline = time.monotonic() + timeout
+        connection = self._send((operation, args, timeout))
+        finished = False
+        try:
+            while True:
+                status, result = self._receive(connection, max(deadline - time.monotonic(), 0))
+                if status != 'item':
+                    finished = True
+                    self._result(status, result)
+                    return
+                yield result
+        finally:
+            if not finished:
+                # The rest of the stream would be read as the reply to the next job
+                self._close()
+
+    def _send(self, request):
+        connection, reused = self._connection()
+        try:
+            connection.send(request)
+        except OSError:
+            self._close()
+            if not reused:
+                raise ImageServiceUnavailable('Image service is unavailable')
+            # The service restarted since this connection was opened
+            connection, _ = self._connection()
+            try:
+                connection.send(request)
+            except OSError:
+                self._close()
+                raise ImageServiceUnavailable('Image service is unavailable')
+        return connection
+
+    def _receive(self, connection, timeout):
+        try:
+            if not connection.poll(timeout + RESPONSE_GRACE):
+                # A late answer would be read as the reply to the next job
+                self._close()
+                raise ImageServiceTimeout('Image processing took too long')
+            return connection.recv()
+        except (EOFError, OSError):
+            self._close()
+            raise ImageServiceUnavailable('Image service closed the connection')
+
+    def _result(self, status, result):
+        if status == 'ok':
+            return result
+        if status == 'busy':
+            raise ImageServiceBusy('Image service is busy, please try again in a moment')
+        if status == 'timeout':
+            raise ImageServiceTimeout('Image processing took too long')
+        raise ImageServiceError(result)
+
+    def _connection(self):
+        connection = getattr(self.local, 'connection', None)
+        if connection is not None:
+            return connection, True
+        try:
+            # The service writes the key when it first starts
+            connection = Client(self.address, family='AF_UNIX', authkey=read_key(self.key_path))
+        except OSError:
+            raise ImageServiceUnavailable('Image service is unavailable')
+        except AuthenticationError:
+            raise ImageServiceError('Image service rejected the key in ' + self.key_path)
+        self.local.connection = connection
+        return connection, False
+
+    def _close(self):
+        connection = getattr(self.local, 'connection', None)
+        self.local.connection = None
+        if connection is not None:
+            connection.close()
+
+
+class ImageService:
+    """Flask extension that runs image jobs in the image service, or in-process without one"""
+
+    def __init__(self, analyzer, app=None):
+        self.analyzer = analyzer
+        self.client = None
+        self.fallback = False
+        self.preview_executor = None
+        self.lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('IMAGE_SERVICE_SOCKET', None)
+        app.config.setdefault('IMAGE_SERVICE_TIMEOUT', DEFAULT_TIMEOUT)
+        # The key clients authenticate with (default: the socket path + '.key')
+        app.config.setdefault('IMAGE_SERVICE_KEY_FILE', None)
+        # Run jobs in the web worker when the service is down instead of failing them
+        app.config.setdefault('IMAGE_SERVICE_FALLBACK', False)
+
+        socket = app.config['IMAGE_SERVICE_SOCKET']
+        key_path = app.config['IMAGE_SERVICE_KEY_FILE']
+        self.client = ImageServiceClient(os.path.abspath(socket), app.config['IMAGE_SERVICE_TIMEOUT'],
+                                         key_path and os.path.abspath(key_path)) if socket else None
+        self.fallback = app.config['IMAGE_SERVICE_FALLBACK']
+        app.extensions['image_service'] = self
+
+    def analyze_artwork(self, image_path, image=None):
+        """Analyze an image file; in-process, an already decoded `image` of it is used instead of reading it back"""
+        if self.client is None and image is not None:
+            return self.analyzer.analyze_artwork(image_path, image)
+        return self.run('analyze_artwork', image_path)
+
+    def redraw_artwork(self, image_path, max_side=None):
+        return self.run('redraw_artwork', image_path, max_side)
+
+    def apply_style_transfer(self, image_path, style_name, max_side=None):
+        return self.run('apply_style_transfer', image_path, style_name, max_side)
+
+    def generate_color_palette(self, image_path, palette_type='harmonious'):
+        return self.run('generate_color_palette', image_path, palette_type)
+
+    def render_full_resolution(self, image_path, cache_dir, style_name=None):
+        """Return (path, message) of the full-size render of a style (or the redraw), rendering it on a miss
+
+        Renders are cached in cache_dir by source file, style and
+        RENDER_VERSION; uploads are never modified in place, so a cached
+        render stays valid until the renderers change.
+        """
+        stem = os.path.splitext(os.path.basename(image_path))[0]
+        path = os.path.join(cache_dir, f"{stem}_{style_name or 'redraw'}_v{RENDER_VERSION}.jpg")
+        hit = os.path.exists(path)
+        record_cache_lookup('full_render', hit)
+        if hit:
+            return path, "Full-resolution image ready."
+
+        os.makedirs(cache_dir, exist_ok=True)
+        # Render under a temporary name so a half-written file is never served
+        partial = f"{path[:-len('.jpg')]}.{uuid.uuid4().hex}.jpg"
+        result, message = self.run('render_to_file', image_path, os.path.abspath(partial), style_name)
+        if result is None:
+            return None, message
+        os.replace(partial, path)
+        return path, message
+
+    def style_previews(self, image_path, styles, max_side=PREVIEW_SIZE):
+        """Yield (style, base64 JPEG or None, message) for each style, fastest first
+
+        The image is decoded once at preview size and the styles render in
+        parallel: on the image service's worker processes, or without one
+        on a thread pool here (OpenCV releases the GIL while it works).
+        """
+        styles = list(styles)
+        if self.client is not None:
+            sent = set()
+            try:
+                for item in self.client.stream('style_previews', os.path.abspath(image_path), styles, max_side):
+                    sent.add(item[0])
+                    yield item
+                return
+            except ImageServiceError as e:
+                self._handle_failure(e, 'style_previews')
+            styles = [style for style in styles if style not in sent]
+
+        image = self.analyzer.load_preview(image_path, max_side)
+        if image is None:
+            for style in styles:
+                yield style, None, 'Unable to load image for style preview.'
+            return
+        futures = {self._preview_executor().submit(self.analyzer.style_preview, image, style): style
+                   for style in styles}
+        for future in as_completed(futures):
+            yield (futures[future],) + tuple(future.result())
+
+    def _preview_executor(self):
+        with self.lock:
+            if self.preview_executor is None:
+                # As many threads as this process has job slots; more would only wait for one
+                self.preview_executor = ThreadPoolExecutor(concurrency.max_jobs, thread_name_prefix='style-preview')
+        return self.preview_executor
+
+    def run(self, operation, image_path, *args):
+        """Run an AIAnalyzer method on an image file"""
+        if self.client is None:
+            return getattr(self.analyzer, operation)(image_path, *args)
+        try:
+            # The service may run in another working directory
+            return self.client.call(operation, os.path.abspath(image_path), *args)
+        except ImageServiceError as e:
+            self._handle_failure(e, operation)
+        return getattr(self.analyzer, operation)(image_path, *args)
+
+    def _handle_failure(self, error, operation):
+        """Count a failed job and re-raise it unless it should run in-process instead"""
+        reason = type(error).__name__.replace('ImageService', '').lower() or 'error'
+        record_image_service_rejection(reason)
+        if not (self.fallback and isinstance(error, ImageServiceUnavailable)):
+            raise error
+        logger.warning('Image service unavailable, running %s in-process', operation)
+
+
+def main():
+    """Run the image service or query a running one"""
+    parser = argparse.ArgumentParser(description='ArtAI image-processing service')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    default_socket = os.environ.get('IMAGE_SERVICE_SOCKET', 'artai_images.sock')
+    key_help = 'shared key clients authenticate with (default: IMAGE_SERVICE_KEY_FILE or SOCKET.key)'
+
+    serve = subparsers.add_parser('serve', help='run the image worker pool')
+    serve.add_argument('--socket', default=default_socket)
+    serve.add_argument('--key-file', help=key_help + ', created if missing')
+    serve.add_argument('--render-folder', default=RENDER_FOLDER,
+                       help='the only folder full-resolution renders are written to (default: %(default)s)')
+    serve.add_argument('--workers', type=int, default=multiprocessing.cpu_count(), help='worker processes')
+    serve.add_argument('--max-pending', type=int,
+                       help='jobs accepted at once, running or queued (default: 2 per worker)')
+    serve.add_argument('--job-timeout', type=float, default=DEFAULT_TIMEOUT, help='seconds before a job is abandoned')
+    serve.add_argument('--memory-budget', type=float,
+                       help='MB of scratch memory per job before images are processed in strips '
+                            '(default: ARTAI_IMAGE_MEMORY_MB or 256)')
+
+    status = subparsers.add_parser('status', help='print the load of a running service')
+    status.add_argument('--socket', default=default_socket)
+    status.add_argument('--key-file', help=key_help)
+    args = parser.parse_args()
+
+    if args.command == 'status':
+        try:
+            stats = ImageServiceClient(args.socket, timeout=5, key_path=args.key_file).call('stats')
+        except ImageServiceError as e:
+            print(f"❌ {e} ({args.socket})")
+            sys.exit(1)
+        print(f"✅ {stats['in_flight']}/{stats['max_pending']} jobs in flight on {stats['workers']} workers, "
+              f"{stats['completed']} completed, {stats['rejected']} rejected as busy")
+        return
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    memory_budget = int(args.memory_budget * 1024 * 1024) if args.memory_budget else None
+    server = ImageWorkerServer(args.socket, args.workers, args.max_pending or 2 * args.workers, args.job_timeout,
+                               memory_budget, args.key_file, args.render_folder)
+    # Supervisor and systemd stop services with SIGTERM
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    print(f"🎨 Image service on {args.socket}: {args.workers} workers, "
+          f"up to {server.max_pending} jobs, {args.job_timeout:g}s timeout")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if os.path.exists(args.socket):
+            os.unlink(args.socket)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,277 @@
+"""
+Perceptual hashes and the index that finds visually similar artworks
+
+Every upload gets a 64-bit pHash (perceptual_hash), stored as
+Artwork.phash: the signs of the lowest 8x8 frequencies of a 32x32
+grayscale DCT of the image. Images that look alike have hashes a small
+Hamming distance apart, whatever their size, format or compression:
+
+- up to DUPLICATE_ARTWORK_DISTANCE (6): the same picture, possibly
+  re-encoded, resized or lightly edited - a possible duplicate or
+  plagiarism when posted by someone else
+- up to SIMILAR_ARTWORK_DISTANCE (12): visually similar artworks
+
+SimilarityIndex keeps the hashes of the gallery in a multi-index hash
+table (MultiIndex), which finds every hash within a distance by looking
+at a small fraction of the gallery instead of comparing against every
+artwork. Each process builds it on first use, picks up the artworks added
+since at most every SIMILARITY_REFRESH_SECONDS (one query on the primary
+key, for ids above the highest it has seen) and rebuilds it every
+SIMILARITY_REBUILD_SECONDS to catch up with backfilled hashes and
+deletions. Lookups never wait for the database: one thread refreshes while
+the others keep searching the index they have.
+
+    python image_similarity.py backfill      # hash artworks uploaded before phash existed
+    python image_similarity.py duplicates    # list possible duplicates across the gallery
+"""
+
+import argparse
+import functools
+import os
+import threading
+import time
+
+HASH_BITS = 64
+HASH_MASK = (1 << HASH_BITS) - 1
+CHUNKS = 4
+CHUNK_BITS = HASH_BITS // CHUNKS
+
+
+def perceptual_hash(image):
+    """64-bit pHash of a BGR or grayscale image"""
+    # Imported here so the web workers that never hash images don't load OpenCV
+    import cv2
+    import numpy as np
+
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    small = cv2.resize(gray, (32, 32), interpolation=cv2.INTER_AREA).astype(np.float32)
+    low = cv2.dct(small)[:8, :8].flatten()
+    # The DC term is the mean brightness, which says nothing about the picture
+    bits = low > np.median(low[1:])
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+
+def hamming(a, b):
+    """Number of bits two hashes differ in"""
+    return bin(a ^ b).count('1')
+
+
+def to_column(value):
+    """A 64-bit hash as the signed integer SQLite and other databases store"""
+    return value - (1 << HASH_BITS) if value >> (HASH_BITS - 1) else value
+
+
+def from_column(value):
+    return value & HASH_MASK
+
+
+def chunks(value):
+    """The CHUNKS chunks of a hash, lowest bits first"""
+    mask = (1 << CHUNK_BITS) - 1
+    return [(value >> (CHUNK_BITS * i)) & mask for i in range(CHUNKS)]
+
+
+@functools.lru_cache(maxsize=None)
+def chunk_flips(max_bits):
+    """Every CHUNK_BITS-bit mask with at most max_bits bits set"""
+    return [mask for mask in range(1 << CHUNK_BITS) if bin(mask).count('1') <= max_bits]
+
+
+class MultiIndex:
+    """Multi-index hashing of 64-bit hashes under the Hamming distance
+
+    Each hash is filed in CHUNKS tables, by the value of one of its
+    CHUNK_BITS-bit chunks. Two hashes at most r apart differ by at most
+    r // CHUNKS bits in at least one chunk, so a search only checks the
+    hashes filed under the chunk values that close to the query's: for a
+    distance of 12, 697 values of 65536 per table.
+    """
+
+    def __init__(self):
+        self.tables = [{} for _ in range(CHUNKS)]  # chunk value -> [(hash, item)]
+        self.size = 0
+
+    def add(self, value, item):
+        entry = (value, item)
+        for table, chunk in zip(self.tables, chunks(value)):
+            table.setdefault(chunk, []).append(entry)
+        self.size += 1
+
+    def search(self, value, max_distance):
+        """(distance, item) of every item within max_distance, nearest first"""
+        flips = chunk_flips(max_distance // CHUNKS)
+        found = {}
+        for table, chunk in zip(self.tables, chunks(value)):
+            for mask in flips:
+                for other, item in table.get(chunk ^ mask, ()):
+                    if item not in found:
+                        found[item] = hamming(value, other)
+        matches = [(distance, item) for item, distance in found.items() if distance <= max_distance]
+        matches.sort(key=lambda match: match[0])
+        return matches
+
+    def __iter__(self):
+        """(hash, item) of every item"""
+        for entries in self.tables[0].values():
+            yield from entries
+
+
+class SimilarityIndex:
+    """Flask extension answering "similar artworks" and "possible duplicates" from Artwork.phash"""
+
+    def __init__(self, app=None):
+        self.similar_distance = 12
+        self.duplicate_distance = 6
+        self.refresh_seconds = 30
+        self.rebuild_seconds = 3600
+        self.index = None
+        self.last_id = 0
+        self.refresh_at = self.rebuild_at = 0
+        self.lock = threading.Lock()  # guards searching and changing self.index
+        self.refresh_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('SIMILAR_ARTWORK_DISTANCE', 12)
+        app.config.setdefault('DUPLICATE_ARTWORK_DISTANCE', 6)
+        app.config.setdefault('SIMILARITY_REFRESH_SECONDS', 30)
+        app.config.setdefault('SIMILARITY_REBUILD_SECONDS', 3600)
+
+        self.similar_distance = app.config['SIMILAR_ARTWORK_DISTANCE']
+        self.duplicate_distance = app.config['DUPLICATE_ARTWORK_DISTANCE']
+        self.refresh_seconds = app.config['SIMILARITY_REFRESH_SECONDS']
+        self.rebuild_seconds = app.config['SIMILARITY_REBUILD_SECONDS']
+        app.extensions['similarity_index'] = self
+
+    def similar(self, artwork, limit=6, max_distance=None):
+        """Artworks that look like `artwork`, nearest first, as (distance, Artwork)"""
+        return self._matches(artwork, self.similar_distance if max_distance is None else max_distance, limit)
+
+    def duplicates(self, artwork, limit=None):
+        """Artworks by other users that may be copies of `artwork`, as (distance, Artwork)"""
+        return self._matches(artwork, self.duplicate_distance, limit, exclude_user=artwork.user_id)
+
+    def all_duplicates(self):
+        """Pairs (distance, first Artwork, second Artwork) of possible duplicates by different users in the gallery"""
+        from models import Artwork
+
+        pairs = set()
+        self._refresh(rebuild=True)
+        with self.lock:
+            for value, artwork_id in self.index:
+                for distance, other_id in self.index.search(value, self.duplicate_distance):
+                    if other_id > artwork_id:
+                        pairs.add((distance, artwork_id, other_id))
+        artworks = {a.id: a for a in Artwork.query.filter(Artwork.id.in_({i for pair in pairs for i in pair[1:]}))}
+        return [(distance, artworks[first], artworks[second]) for distance, first, second in sorted(pairs)
+                if first in artworks and second in artworks and artworks[first].user_id != artworks[second].user_id]
+
+    def _matches(self, artwork, max_distance, limit, exclude_user=None):
+        from models import Artwork
+
+        if artwork.phash is None:
+            return []
+        self._refresh()
+        with self.lock:
+            found = self.index.search(from_column(artwork.phash), max_distance)
+        distances = {artwork_id: distance for distance, artwork_id in found if artwork_id != artwork.id}
+        if not distances:
+            return []
+        # Artworks deleted since the last rebuild are still in the index
+        query = Artwork.query.filter(Artwork.id.in_(distances))
+        if exclude_user is not None:
+            query = query.filter(Artwork.user_id != exclude_user)
+        matches = sorted(((distances[a.id], a) for a in query), key=lambda match: (match[0], -match[1].id))
+        return matches[:limit] if limit else matches
+
+    def _refresh(self, rebuild=False):
+        """Build the index, add the artworks hashed since the last refresh, or rebuild it, as due"""
+        from models import Artwork
+
+        if self.index is not None and not rebuild and time.monotonic() < self.refresh_at:
+            return
+        # Only the first lookup waits for the index; later ones search the current one meanwhile
+        if not self.refresh_lock.acquire(blocking=self.index is None or rebuild):
+            return
+        try:
+            now = time.monotonic()
+            if self.index is not None and not rebuild and now < self.refresh_at:
+                return
+            query = Artwork.query.with_entities(Artwork.id, Artwork.phash).filter(Artwork.phash.isnot(None))
+            if self.index is None or rebuild or now >= self.rebuild_at:
+                # Also picks up hashes backfilled or committed out of id order, and drops deleted artworks
+                index = MultiIndex()
+                last_id = self._fill(index, query.all(), 0)
+                with self.lock:
+                    self.index, self.last_id = index, last_id
+                self.rebuild_at = now + self.rebuild_seconds
+            else:
+                added = query.filter(Artwork.id > self.last_id).all()
+                if added:
+                    with self.lock:
+                        self.last_id = self._fill(self.index, added, self.last_id)
+            self.refresh_at = now + self.refresh_seconds
+        finally:
+            self.refresh_lock.release()
+
+    @staticmethod
+    def _fill(index, rows, last_id):
+        """Add (id, phash) rows to index; returns the highest id seen"""
+        for artwork_id, value in rows:
+            index.add(from_column(value), artwork_id)
+            last_id = max(last_id, artwork_id)
+        return last_id
+
+
+def backfill(folder):
+    """Hash the artworks that have no phash yet; returns (hashed, unreadable)"""
+    import cv2
+    from extensions import db
+    from models import Artwork
+
+    hashed = unreadable = 0
+    # Artworks sharing a file (see image_ingest) share a hash
+    by_file = {}
+    for artwork in Artwork.query.filter(Artwork.phash.is_(None)):
+        if artwork.filename not in by_file:
+            image = cv2.imread(os.path.join(folder, artwork.filename), cv2.IMREAD_COLOR)
+            by_file[artwork.filename] = None if image is None else to_column(perceptual_hash(image))
+        artwork.phash = by_file[artwork.filename]
+        if artwork.phash is None:
+            unreadable += 1
+        else:
+            hashed += 1
+    db.session.commit()
+    return hashed, unreadable
+
+
+def main():
+    """Backfill perceptual hashes or list possible duplicates"""
+    parser = argparse.ArgumentParser(description='ArtAI similar-artwork index')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('backfill', help='hash artworks uploaded before perceptual hashes were stored')
+    duplicates = subparsers.add_parser('duplicates', help='list possible duplicates by different users')
+    duplicates.add_argument('--distance', type=int, help='largest Hamming distance to report (default: 6)')
+    args = parser.parse_args()
+
+    from application import create_app
+    from extensions import similarity_index
+
+    app = create_app()
+    with app.app_context():
+        if args.command == 'backfill':
+            hashed, unreadable = backfill(app.config['UPLOAD_FOLDER'])
+            print(f"✅ Hashed {hashed} artworks" + (f", {unreadable} files could not be read" if unreadable else ''))
+            return
+        if args.distance is not None:
+            similarity_index.duplicate_distance = args.distance
+        pairs = similarity_index.all_duplicates()
+        for distance, first, second in pairs:
+            print(f"  {distance:2d}  #{first.id} {first.title!r} ({first.artist.username})"
+                  f"  ~  #{second.id} {second.title!r} ({second.artist.username})")
+        print(f"🔍 {len(pairs)} possible duplicates within distance {similarity_index.duplicate_distance}")
+
+
+if __name__ == '__main__':
+    main()
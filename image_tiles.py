@@ -0,0 +1,49 @@
+"""
+Strip-by-strip processing for images too large to filter in one piece
+
+The style filters are local: each output pixel depends only on input pixels
+a few rows above and below it. map_strips runs such a filter chain over
+horizontal strips of the image. Each strip is extended by `halo` rows on
+both sides, which are filtered and then thrown away, so the result is
+identical to filtering the whole image at once while the chain's
+intermediate arrays (LAB/HSV copies, edge masks, float buffers) only ever
+cover one strip. Strips of whole rows are views of the image, so cutting
+them copies nothing.
+"""
+
+import numpy as np
+
+# Scratch memory of the heaviest filter chain (the redraw), measured with tracemalloc
+SCRATCH_BYTES_PER_PIXEL = 40
+MIN_STRIP_ROWS = 16
+
+
+def strip_rows(shape, budget, halo=0, bytes_per_pixel=SCRATCH_BYTES_PER_PIXEL):
+    """Rows per strip that keep a chain's scratch arrays within budget bytes (all rows if they fit)"""
+    rows, cols = shape[:2]
+    if budget is None or rows * cols * bytes_per_pixel <= budget:
+        return rows
+    fit = budget // (cols * bytes_per_pixel) - 2 * halo
+    return int(min(rows, max(fit, MIN_STRIP_ROWS)))
+
+
+def map_strips(image, chain, halo, rows_per_strip):
+    """Run chain(strip, top) over the image in strips and return the assembled result
+
+    chain gets a strip with up to `halo` extra rows on each side and the
+    image row the strip starts at, and returns an array with one row per
+    strip row. With a single strip its result is returned as it is.
+    """
+    height = image.shape[0]
+    if rows_per_strip >= height:
+        return chain(image, 0)
+
+    out = None
+    for start in range(0, height, rows_per_strip):
+        stop = min(start + rows_per_strip, height)
+        top = max(start - halo, 0)
+        result = chain(image[top:min(stop + halo, height)], top)
+        if out is None:
+            out = np.empty((height,) + result.shape[1:], dtype=result.dtype)
+        out[start:stop] = result[start - top:stop - top]
+    return out
@@ -0,0 +1,43 @@
+"""
+Deferred construction of heavy components
+
+AIAnalyzer pulls in OpenCV, NumPy and Pillow, which dominate import time.
+LazyComponent stands in for such an object: the module is imported and the
+class instantiated on first attribute access, so workers and CLI scripts
+that never process an image don't pay for the imaging stack.
+"""
+
+import importlib
+import threading
+
+
+class LazyComponent:
+    """Proxy that imports module_name and builds class_name(*args, **kwargs) on first use"""
+
+    def __init__(self, module_name, class_name, *args, **kwargs):
+        self._module_name = module_name
+        self._class_name = class_name
+        self._args = args
+        self._kwargs = kwargs
+        self._instance = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._instance is not None
+
+    def load(self):
+        """Build the component now (e.g. to warm a process before it serves requests)"""
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    module = importlib.import_module(self._module_name)
+                    self._instance = getattr(module, self._class_name)(*self._args, **self._kwargs)
+        return self._instance
+
+    def __getattr__(self, name):
+        return getattr(self.load(), name)
+
+    def __repr__(self):
+        state = 'loaded' if self.loaded else 'not loaded'
+        return f'<LazyComponent {self._module_name}.{self._class_name} ({state})>'
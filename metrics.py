@@ -0,0 +1,197 @@
+"""
+Prometheus metrics for ArtAI
+
+Exposes request latency, image-processing durations, upload sizes, cache
+hit rates, image job queue depth, image service rejections, SQLite write
+contention and worker memory at /metrics.
+When PROMETHEUS_MULTIPROC_DIR is set (gunicorn.conf.py does this) every
+worker writes its samples to that directory and /metrics aggregates them,
+so a scrape sees the whole server rather than whichever worker answered.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+from flask import Response, g, request
+from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge,
+                               Histogram, generate_latest, multiprocess)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+IMAGE_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+UPLOAD_BUCKETS = (64 * 1024, 256 * 1024, 1024 ** 2, 2 * 1024 ** 2, 4 * 1024 ** 2, 8 * 1024 ** 2, 16 * 1024 ** 2)
+
+REQUEST_LATENCY = Histogram(
+    'artai_http_request_duration_seconds', 'HTTP request latency by route',
+    ['method', 'endpoint', 'status']
+)
+STYLE_TRANSFER_DURATION = Histogram(
+    'artai_style_transfer_duration_seconds', 'apply_style_transfer duration by style',
+    ['style'], buckets=IMAGE_BUCKETS
+)
+ANALYSIS_DURATION = Histogram(
+    'artai_analyze_artwork_duration_seconds', 'analyze_artwork duration',
+    buckets=IMAGE_BUCKETS
+)
+IMAGE_OPERATION_DURATION = Histogram(
+    'artai_image_operation_duration_seconds', 'Duration of other image operations (redraw, palette)',
+    ['operation'], buckets=IMAGE_BUCKETS
+)
+UPLOAD_SIZE = Histogram(
+    'artai_upload_size_bytes', 'Size of uploaded artwork files',
+    ['source'], buckets=UPLOAD_BUCKETS
+)
+IMAGE_JOBS_IN_PROGRESS = Gauge(
+    'artai_image_jobs_in_progress', 'Image jobs currently running or waiting in web workers',
+    multiprocess_mode='livesum'
+)
+CACHE_LOOKUPS = Counter(
+    'artai_cache_lookups_total', 'Cache lookups by cache and result',
+    ['cache', 'result']
+)
+IMAGE_SERVICE_REJECTIONS = Counter(
+    'artai_image_service_rejections_total', 'Image jobs the image service refused or failed, by reason',
+    ['reason']
+)
+DB_WRITE_DURATION = Histogram(
+    'artai_db_write_duration_seconds',
+    'INSERT/UPDATE/DELETE duration, dominated by SQLite write-lock waits under contention'
+)
+DB_LOCK_ERRORS = Counter(
+    'artai_db_lock_errors_total', 'Statements that failed with "database is locked"'
+)
+WORKER_MEMORY = Gauge(
+    'artai_worker_memory_bytes',
+    'Worker memory by kind: rss, pss (shared pages split between processes), private and shared',
+    ['pool', 'kind'], multiprocess_mode='liveall'
+)
+
+WRITE_VERBS = ('INSERT', 'UPDATE', 'DELETE')
+MEMORY_SAMPLE_INTERVAL = 10  # seconds
+SMAPS_FIELDS = {'Rss': 'rss', 'Pss': 'pss', 'Shared_Clean': 'shared', 'Shared_Dirty': 'shared',
+                'Private_Clean': 'private', 'Private_Dirty': 'private'}
+
+
+@contextmanager
+def time_image_operation(operation, style=None):
+    """Time an image operation and count it as an in-flight image job"""
+    IMAGE_JOBS_IN_PROGRESS.inc()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - started
+        IMAGE_JOBS_IN_PROGRESS.dec()
+        if operation == 'style_transfer':
+            STYLE_TRANSFER_DURATION.labels(style=style or 'unknown').observe(duration)
+        elif operation == 'analyze':
+            ANALYSIS_DURATION.observe(duration)
+        else:
+            IMAGE_OPERATION_DURATION.labels(operation=operation).observe(duration)
+
+
+def observe_upload(path, source):
+    """Record the size of an uploaded file"""
+    try:
+        UPLOAD_SIZE.labels(source=source).observe(os.path.getsize(path))
+    except OSError:
+        pass
+
+
+def record_cache_lookup(cache, hit):
+    """Count a hit or miss for the named cache"""
+    CACHE_LOOKUPS.labels(cache=cache, result='hit' if hit else 'miss').inc()
+
+
+def record_image_service_rejection(reason):
+    """Count an image job that was busy, timed out or could not reach the image service"""
+    IMAGE_SERVICE_REJECTIONS.labels(reason=reason).inc()
+
+
+def read_process_memory():
+    """Memory of this process in bytes, from /proc/self/smaps_rollup (Linux)"""
+    memory = {'rss': 0, 'pss': 0, 'shared': 0, 'private': 0}
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                field, _, value = line.partition(':')
+                if field in SMAPS_FIELDS:
+                    memory[SMAPS_FIELDS[field]] += int(value.split()[0]) * 1024
+    except OSError:
+        import resource
+        # Peak RSS only; ru_maxrss is in kilobytes on Linux
+        memory = {'rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024}
+    return memory
+
+
+def record_worker_memory():
+    """Publish this worker's memory usage"""
+    pool = os.environ.get('ARTAI_POOL', 'web')
+    for kind, value in read_process_memory().items():
+        WORKER_MEMORY.labels(pool=pool, kind=kind).set(value)
+
+
+class Metrics:
+    """Flask extension that records request metrics and serves /metrics"""
+
+    def __init__(self, app=None):
+        self.memory_sampled = 0.0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        app.add_url_rule('/metrics', 'metrics', self.metrics_view)
+        app.extensions['metrics'] = self
+
+        if not event.contains(Engine, 'before_cursor_execute', _write_started):
+            event.listen(Engine, 'before_cursor_execute', _write_started)
+            event.listen(Engine, 'after_cursor_execute', _write_finished)
+            event.listen(Engine, 'handle_error', _count_lock_error)
+
+    def _start_request(self):
+        g.metrics_started = time.perf_counter()
+
+    def _finish_request(self, response):
+        started = g.pop('metrics_started', None)
+        if started is not None and request.endpoint != 'metrics':
+            REQUEST_LATENCY.labels(
+                method=request.method,
+                endpoint=request.endpoint or 'unmatched',
+                status=response.status_code
+            ).observe(time.perf_counter() - started)
+
+        if time.monotonic() - self.memory_sampled >= MEMORY_SAMPLE_INTERVAL:
+            self.memory_sampled = time.monotonic()
+            record_worker_memory()
+        return response
+
+    def metrics_view(self):
+        if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry = REGISTRY
+        return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+
+
+def _write_started(conn, cursor, statement, parameters, context, executemany):
+    if statement.lstrip()[:6].upper() in WRITE_VERBS:
+        conn.info.setdefault('metrics_write_starts', []).append(time.perf_counter())
+
+
+def _write_finished(conn, cursor, statement, parameters, context, executemany):
+    if statement.lstrip()[:6].upper() in WRITE_VERBS:
+        starts = conn.info.get('metrics_write_starts')
+        if starts:
+            DB_WRITE_DURATION.observe(time.perf_counter() - starts.pop())
+
+
+def _count_lock_error(exception_context):
+    if 'database is locked' in str(exception_context.original_exception):
+        DB_LOCK_ERRORS.inc()
+    # A failed write never reaches after_cursor_execute
+    if exception_context.connection is not None:
+        exception_context.connection.info.pop('metrics_write_starts', None)
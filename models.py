@@ -0,0 +1,358 @@
+"""
+Database models
+"""
+
+from datetime import datetime
+
+from flask_login import UserMixin
+from sqlalchemy import event
+from sqlalchemy.orm import joinedload, object_session, selectinload
+
+from extensions import db, login_manager, uploads
+from seed_engine import SeedEngine
+
+class User(UserMixin, db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    username = db.Column(db.String(80), unique=True, nullable=False)
+    email = db.Column(db.String(120), unique=True, nullable=False)
+    password_hash = db.Column(db.String(120), nullable=False)
+    profile_picture = db.Column(db.String(200), default='default.jpg')
+    bio = db.Column(db.Text, default='')
+    join_date = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)  # For template compatibility
+    is_admin = db.Column(db.Boolean, default=False)
+    level = db.Column(db.Integer, default=1)
+    experience = db.Column(db.Integer, default=0)
+    
+    artworks = db.relationship('Artwork', backref='artist', lazy=True)
+    forum_posts = db.relationship('ForumPost', backref='author', lazy=True)
+    comments = db.relationship('Comment', backref='author', lazy=True)
+    challenge_submissions = db.relationship('ChallengeSubmission', backref='user', lazy=True)
+    user_achievements = db.relationship('UserAchievement', backref='user', lazy=True)
+    user_skills = db.relationship('UserSkill', backref='user', lazy=True)
+    battle_submissions = db.relationship('BattleSubmission', backref='user', lazy=True)
+    battle_votes = db.relationship('BattleVote', backref='voter', lazy=True)
+    stats = db.relationship('UserStats', backref=db.backref('user', uselist=False), lazy=True)
+
+class Artwork(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    title = db.Column(db.String(100), nullable=False)
+    description = db.Column(db.Text)
+    filename = db.Column(db.String(200), nullable=False, index=True)
+    upload_date = db.Column(db.DateTime, default=datetime.utcnow)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    ai_feedback = db.Column(db.Text)
+    ai_score = db.Column(db.Float)
+    category = db.Column(db.String(50))
+    tags = db.Column(db.String(200))
+    # Perceptual hash for finding similar artworks (image_similarity.py)
+    phash = db.Column(db.BigInteger, index=True)
+    battle_submissions = db.relationship('BattleSubmission', backref='artwork', lazy=True)
+
+@event.listens_for(Artwork, 'after_delete')
+def release_artwork_file(mapper, connection, artwork):
+    # Uploads are shared by content, so the file goes only with its last reference
+    uploads.release_after_commit(object_session(artwork), artwork.filename)
+
+class Challenge(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    title = db.Column(db.String(100), nullable=False)
+    description = db.Column(db.Text, nullable=False)
+    requirements = db.Column(db.Text)
+    start_date = db.Column(db.DateTime, default=datetime.utcnow)
+    end_date = db.Column(db.DateTime)
+    is_active = db.Column(db.Boolean, default=True)
+    difficulty = db.Column(db.String(20), default='Beginner')
+    reward_exp = db.Column(db.Integer, default=100)
+
+class ChallengeSubmission(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    challenge_id = db.Column(db.Integer, db.ForeignKey('challenge.id'), nullable=False)
+    artwork_id = db.Column(db.Integer, db.ForeignKey('artwork.id'), nullable=False)
+    submission_date = db.Column(db.DateTime, default=datetime.utcnow)
+    is_approved = db.Column(db.Boolean, default=False)
+    
+    artwork = db.relationship('Artwork')
+
+class ForumPost(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    title = db.Column(db.String(200), nullable=False)
+    content = db.Column(db.Text, nullable=False)
+    author_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    category_id = db.Column(db.Integer, db.ForeignKey('forum_category.id'))
+    created_date = db.Column(db.DateTime, default=datetime.utcnow)
+    category = db.Column(db.String(50), default='General')  # Keep for backward compatibility
+    likes = db.Column(db.Integer, default=0)
+    views = db.Column(db.Integer, default=0)
+    is_pinned = db.Column(db.Boolean, default=False)
+    
+    comments = db.relationship('Comment', backref='post', lazy=True)
+    category_obj = db.relationship('ForumCategory', backref='posts')
+
+class Comment(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    content = db.Column(db.Text, nullable=False)
+    author_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    post_id = db.Column(db.Integer, db.ForeignKey('forum_post.id'), nullable=False)
+    created_date = db.Column(db.DateTime, default=datetime.utcnow)
+
+class ForumCategory(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    description = db.Column(db.Text)
+    icon = db.Column(db.String(50), default='fas fa-comments')
+    color = db.Column(db.String(20), default='primary')
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class UserFollow(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    follower_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    following_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Ensure a user can't follow the same person twice
+    __table_args__ = (db.UniqueConstraint('follower_id', 'following_id'),)
+
+class Notification(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    type = db.Column(db.String(50), nullable=False)  # 'like', 'comment', 'follow', 'battle_win', etc.
+    title = db.Column(db.String(200), nullable=False)
+    message = db.Column(db.Text, nullable=False)
+    url = db.Column(db.String(200))  # Link to relevant page
+    is_read = db.Column(db.Boolean, default=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Optional: Link to related objects
+    related_user_id = db.Column(db.Integer, db.ForeignKey('user.id'))  # Who triggered the notification
+    related_post_id = db.Column(db.Integer, db.ForeignKey('forum_post.id'))
+    related_artwork_id = db.Column(db.Integer, db.ForeignKey('artwork.id'))
+    
+    user = db.relationship('User', foreign_keys=[user_id],
+                           backref=db.backref('notifications', lazy='dynamic'))
+    related_user = db.relationship('User', foreign_keys=[related_user_id])
+
+class ActivityFeed(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    action_type = db.Column(db.String(50), nullable=False)  # 'upload', 'like', 'comment', 'follow', 'battle_join'
+    target_type = db.Column(db.String(50))  # 'artwork', 'post', 'user', 'battle'
+    target_id = db.Column(db.Integer)
+    message = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    user = db.relationship('User', backref='activities')
+
+class LearningPath(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    title = db.Column(db.String(100), nullable=False)
+    description = db.Column(db.Text)
+    difficulty = db.Column(db.String(20), default='Beginner')
+    order = db.Column(db.Integer, default=0)
+    is_active = db.Column(db.Boolean, default=True)
+    category = db.Column(db.String(50), default='General')
+    estimated_hours = db.Column(db.Integer, default=1)
+    thumbnail_url = db.Column(db.String(200))
+    prerequisites = db.Column(db.Text)  # JSON string of prerequisite path IDs
+    completion_reward_xp = db.Column(db.Integer, default=50)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Relationships
+    lessons = db.relationship('Lesson', backref='learning_path', lazy=True, cascade='all, delete-orphan')
+
+class Lesson(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    path_id = db.Column(db.Integer, db.ForeignKey('learning_path.id'), nullable=False)
+    title = db.Column(db.String(100), nullable=False)
+    content = db.Column(db.Text, nullable=False)
+    lesson_type = db.Column(db.String(20), default='theory')  # theory, practical, quiz, video
+    order = db.Column(db.Integer, default=0)
+    estimated_minutes = db.Column(db.Integer, default=15)
+    video_url = db.Column(db.String(200))
+    practice_prompt = db.Column(db.Text)
+    quiz_data = db.Column(db.Text)  # JSON string for quiz questions
+    completion_xp = db.Column(db.Integer, default=10)
+    is_active = db.Column(db.Boolean, default=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class UserPathProgress(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    path_id = db.Column(db.Integer, db.ForeignKey('learning_path.id'), nullable=False)
+    started_at = db.Column(db.DateTime, default=datetime.utcnow)
+    completed_at = db.Column(db.DateTime)
+    current_lesson_id = db.Column(db.Integer, db.ForeignKey('lesson.id'))
+    progress_percentage = db.Column(db.Float, default=0.0)
+    time_spent_minutes = db.Column(db.Integer, default=0)
+    
+    # Ensure unique user-path combination
+    __table_args__ = (db.UniqueConstraint('user_id', 'path_id'),)
+
+class UserLessonProgress(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    lesson_id = db.Column(db.Integer, db.ForeignKey('lesson.id'), nullable=False)
+    completed_at = db.Column(db.DateTime)
+    quiz_score = db.Column(db.Float)  # For quiz lessons
+    practice_submitted = db.Column(db.Boolean, default=False)  # For practical lessons
+    time_spent_minutes = db.Column(db.Integer, default=0)
+    notes = db.Column(db.Text)  # User's personal notes
+    
+    # Ensure unique user-lesson combination
+    __table_args__ = (db.UniqueConstraint('user_id', 'lesson_id'),)
+
+class Tutorial(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    title = db.Column(db.String(100), nullable=False)
+    description = db.Column(db.Text)
+    content = db.Column(db.Text, nullable=False)
+    tutorial_type = db.Column(db.String(20), default='technique')  # technique, tool, style, beginner
+    difficulty = db.Column(db.String(20), default='Beginner')
+    estimated_minutes = db.Column(db.Integer, default=30)
+    author_id = db.Column(db.Integer, db.ForeignKey('user.id'))
+    thumbnail_url = db.Column(db.String(200))
+    tags = db.Column(db.String(200))  # Comma-separated tags
+    likes = db.Column(db.Integer, default=0)
+    views = db.Column(db.Integer, default=0)
+    is_featured = db.Column(db.Boolean, default=False)
+    is_active = db.Column(db.Boolean, default=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Relationships
+    author = db.relationship('User', backref='tutorials')
+
+class ArtTechnique(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    description = db.Column(db.Text)
+    category = db.Column(db.String(50))  # drawing, painting, digital, mixed_media
+    difficulty = db.Column(db.String(20), default='Beginner')
+    tools_required = db.Column(db.Text)  # JSON string of required tools
+    step_by_step = db.Column(db.Text)  # JSON string of steps
+    example_images = db.Column(db.Text)  # JSON string of image URLs
+    tips_and_tricks = db.Column(db.Text)
+    common_mistakes = db.Column(db.Text)
+    related_techniques = db.Column(db.Text)  # JSON string of related technique IDs
+    created_by = db.Column(db.Integer, db.ForeignKey('user.id'))
+    is_approved = db.Column(db.Boolean, default=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    creator = db.relationship('User', backref='art_techniques')
+
+class Achievement(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    description = db.Column(db.Text, nullable=False)
+    icon = db.Column(db.String(50), default='fas fa-trophy')
+    category = db.Column(db.String(50), default='General')
+    points = db.Column(db.Integer, default=10)
+    requirement_type = db.Column(db.String(50))  # 'artworks_count', 'streak', 'likes', etc.
+    requirement_value = db.Column(db.Integer)
+    is_active = db.Column(db.Boolean, default=True)
+    created_date = db.Column(db.DateTime, default=datetime.utcnow)
+
+class UserAchievement(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    achievement_id = db.Column(db.Integer, db.ForeignKey('achievement.id'), nullable=False)
+    earned_date = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    achievement = db.relationship('Achievement', backref='user_achievements')
+
+class SkillTree(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    description = db.Column(db.Text)
+    category = db.Column(db.String(50))  # 'drawing', 'painting', 'digital', etc.
+    level = db.Column(db.Integer, default=1)
+    experience_required = db.Column(db.Integer, default=100)
+    parent_skill_id = db.Column(db.Integer, db.ForeignKey('skill_tree.id'))
+    icon = db.Column(db.String(50), default='fas fa-star')
+    is_active = db.Column(db.Boolean, default=True)
+    
+    parent = db.relationship('SkillTree', remote_side=[id], backref='children')
+
+class UserSkill(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    skill_id = db.Column(db.Integer, db.ForeignKey('skill_tree.id'), nullable=False)
+    level = db.Column(db.Integer, default=1)
+    experience = db.Column(db.Integer, default=0)
+    unlocked_date = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    skill = db.relationship('SkillTree', backref='user_skills')
+
+class ArtBattle(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    title = db.Column(db.String(200), nullable=False)
+    theme = db.Column(db.String(100), nullable=False)
+    description = db.Column(db.Text)
+    start_date = db.Column(db.DateTime, default=datetime.utcnow)
+    end_date = db.Column(db.DateTime, nullable=False)
+    voting_end_date = db.Column(db.DateTime)
+    max_participants = db.Column(db.Integer, default=100)
+    entry_fee = db.Column(db.Integer, default=0)  # Experience points
+    prize_exp = db.Column(db.Integer, default=100)
+    status = db.Column(db.String(20), default='upcoming')  # upcoming, active, voting, completed
+    created_by = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    
+    creator = db.relationship('User', backref='created_battles')
+
+class BattleSubmission(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    battle_id = db.Column(db.Integer, db.ForeignKey('art_battle.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    artwork_id = db.Column(db.Integer, db.ForeignKey('artwork.id'), nullable=False)
+    submission_date = db.Column(db.DateTime, default=datetime.utcnow)
+    votes = db.Column(db.Integer, default=0)
+    
+    battle = db.relationship('ArtBattle', backref='submissions')
+
+class BattleVote(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    battle_id = db.Column(db.Integer, db.ForeignKey('art_battle.id'), nullable=False)
+    submission_id = db.Column(db.Integer, db.ForeignKey('battle_submission.id'), nullable=False)
+    voter_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    vote_date = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    battle = db.relationship('ArtBattle')
+    submission = db.relationship('BattleSubmission')
+
+class UserStats(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, unique=True)
+    daily_streak = db.Column(db.Integer, default=0)
+    longest_streak = db.Column(db.Integer, default=0)
+    last_activity_date = db.Column(db.Date)
+    total_artworks = db.Column(db.Integer, default=0)
+    total_likes_received = db.Column(db.Integer, default=0)
+    total_comments_made = db.Column(db.Integer, default=0)
+    battles_won = db.Column(db.Integer, default=0)
+    battles_participated = db.Column(db.Integer, default=0)
+    challenges_completed = db.Column(db.Integer, default=0)
+
+# Seed versions applied by the initialize_* functions
+class SeedVersion(db.Model):
+    name = db.Column(db.String(50), primary_key=True)
+    digest = db.Column(db.String(64), nullable=False)
+    applied_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+seeds = SeedEngine(db, SeedVersion)
+
+def loading_profile(view):
+    """Eager-loading options for the relationships a view's template walks"""
+    profiles = {
+        'index': (joinedload(Artwork.artist),),
+        'gallery': (joinedload(Artwork.artist),),
+        'forum': (joinedload(ForumPost.author), selectinload(ForumPost.comments)),
+        'challenge_detail': (joinedload(ChallengeSubmission.artwork), joinedload(ChallengeSubmission.user)),
+        'battle_detail': (joinedload(BattleSubmission.artwork), joinedload(BattleSubmission.user)),
+        'notifications': (joinedload(Notification.related_user),),
+        'activity_feed': (joinedload(ActivityFeed.user),),
+    }
+    return profiles[view]
+
+@login_manager.user_loader
+def load_user(user_id):
+    return User.query.get(int(user_id))
@@ -0,0 +1,87 @@
+"""
+Development-mode query budget auditor
+
+Counts the SQL statements issued while handling each request and records
+every relationship lazy load. Requests that go over the configured budget
+are logged together with the lazy loads that caused them, which points
+straight at the view that needs an eager-loading profile.
+"""
+
+from collections import Counter
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+
+class QueryBudgetAuditor:
+    """Flask extension that warns about requests exceeding a query budget"""
+
+    def __init__(self, app=None):
+        self.app = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        # QUERY_AUDIT defaults to following app.debug at request time
+        app.config.setdefault('QUERY_AUDIT', None)
+        app.config.setdefault('QUERY_BUDGET', 15)
+
+        self.app = app
+        app.before_request(self._start_request)
+        app.after_request(self._check_budget)
+        app.extensions['query_audit'] = self
+
+        if not event.contains(Engine, 'before_cursor_execute', _count_statement):
+            event.listen(Engine, 'before_cursor_execute', _count_statement)
+            event.listen(Session, 'do_orm_execute', _record_lazy_load)
+
+    def enabled(self):
+        setting = self.app.config['QUERY_AUDIT']
+        return self.app.debug if setting is None else bool(setting)
+
+    def _start_request(self):
+        if self.enabled():
+            g.query_audit = {'count': 0, 'lazy_loads': Counter()}
+
+    def _check_budget(self, response):
+        audit = g.pop('query_audit', None)
+        if audit is None:
+            return response
+
+        budget = self.app.config['QUERY_BUDGET']
+        if audit['count'] > budget:
+            lazy_loads = ', '.join(f"{name} x{count}" for name, count in audit['lazy_loads'].most_common())
+            self.app.logger.warning(
+                "Query budget exceeded on %s %s: %d queries (budget %d); lazy loads: %s",
+                request.method, request.full_path.rstrip('?'), audit['count'], budget, lazy_loads or 'none'
+            )
+        return response
+
+
+def _current_audit():
+    if not has_request_context():
+        return None
+    return g.get('query_audit')
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    audit = _current_audit()
+    if audit is not None:
+        audit['count'] += 1
+
+
+def _record_lazy_load(orm_execute_state):
+    audit = _current_audit()
+    if audit is None or not orm_execute_state.is_relationship_load:
+        return
+
+    state = orm_execute_state.lazy_loaded_from
+    if state is None:
+        return
+    path = orm_execute_state.loader_strategy_path
+    prop = getattr(path, 'prop', None)
+    attribute = prop.key if prop is not None else str(path)
+    audit['lazy_loads'][f"{state.class_.__name__}.{attribute}"] += 1
+
@@ -0,0 +1,205 @@
+"""
+Per-request profiler for ArtAI
+
+Records how long each request spends in SQL, template rendering and
+OpenCV, reports it to the browser through the Server-Timing header, and
+writes requests slower than SLOW_REQUEST_MS to a rolling JSON-lines log
+that the admin performance page reads back.
+"""
+
+import json
+import logging
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+
+from flask import g, has_request_context, request, template_rendered, before_render_template
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class RequestProfile:
+    """Timings collected while handling one request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.query_count = 0
+        self.sql_time = 0.0
+        self.statements = []
+        self.template_time = 0.0
+        self.sections = {}
+        self.template_starts = []
+
+    def add_statement(self, statement, duration):
+        self.query_count += 1
+        self.sql_time += duration
+        self.statements.append((duration, statement))
+
+    def add_section(self, name, duration):
+        self.sections[name] = self.sections.get(name, 0.0) + duration
+
+    def slowest_statements(self, limit):
+        slowest = sorted(self.statements, key=lambda item: item[0], reverse=True)[:limit]
+        return [{'ms': round(duration * 1000, 2), 'sql': ' '.join(statement.split())[:500]}
+                for duration, statement in slowest]
+
+
+class RequestProfiler:
+    """Flask extension that profiles every request"""
+
+    def __init__(self, app=None):
+        self.app = None
+        self.slow_log = None
+        self.recent_slow = deque(maxlen=100)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('PROFILER_ENABLED', True)
+        app.config.setdefault('PROFILER_TOP_STATEMENTS', 5)
+        app.config.setdefault('SLOW_REQUEST_MS', 500)
+        app.config.setdefault('SLOW_REQUEST_LOG', os.path.join('logs', 'slow_requests.log'))
+        app.config.setdefault('SLOW_REQUEST_LOG_MAX_BYTES', 5 * 1024 * 1024)
+        app.config.setdefault('SLOW_REQUEST_LOG_BACKUPS', 5)
+
+        self.app = app
+        self.slow_log = self._create_slow_log(app)
+
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        before_render_template.connect(self._template_started, app)
+        template_rendered.connect(self._template_finished, app)
+        app.extensions['request_profiler'] = self
+
+        if not event.contains(Engine, 'before_cursor_execute', _statement_started):
+            event.listen(Engine, 'before_cursor_execute', _statement_started)
+            event.listen(Engine, 'after_cursor_execute', _statement_finished)
+            event.listen(Engine, 'handle_error', _statement_failed)
+
+    def _create_slow_log(self, app):
+        path = app.config['SLOW_REQUEST_LOG']
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        logger = logging.getLogger('artai.slow_requests')
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        if not any(getattr(h, 'baseFilename', None) == os.path.abspath(path) for h in logger.handlers):
+            handler = RotatingFileHandler(path,
+                                          maxBytes=app.config['SLOW_REQUEST_LOG_MAX_BYTES'],
+                                          backupCount=app.config['SLOW_REQUEST_LOG_BACKUPS'])
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            logger.addHandler(handler)
+        return logger
+
+    def _start_request(self):
+        if self.app.config['PROFILER_ENABLED']:
+            g.request_profile = RequestProfile()
+
+    def _template_started(self, sender, template, context, **extra):
+        profile = current_profile()
+        if profile is not None:
+            profile.template_starts.append(time.perf_counter())
+
+    def _template_finished(self, sender, template, context, **extra):
+        profile = current_profile()
+        if profile is not None and profile.template_starts:
+            profile.template_time += time.perf_counter() - profile.template_starts.pop()
+
+    def _finish_request(self, response):
+        profile = g.pop('request_profile', None)
+        if profile is None:
+            return response
+
+        total = time.perf_counter() - profile.started
+        timings = [
+            f'db;dur={profile.sql_time * 1000:.1f};desc="{profile.query_count} queries"',
+            f'tpl;dur={profile.template_time * 1000:.1f};desc="templates"',
+        ]
+        for name, duration in profile.sections.items():
+            timings.append(f'{name};dur={duration * 1000:.1f}')
+        timings.append(f'total;dur={total * 1000:.1f}')
+        response.headers['Server-Timing'] = ', '.join(timings)
+
+        if total * 1000 >= self.app.config['SLOW_REQUEST_MS']:
+            self._log_slow_request(profile, total, response)
+        return response
+
+    def _log_slow_request(self, profile, total, response):
+        entry = {
+            'time': datetime.utcnow().isoformat(timespec='seconds'),
+            'pid': os.getpid(),
+            'method': request.method,
+            'path': request.full_path.rstrip('?'),
+            'endpoint': request.endpoint,
+            'status': response.status_code,
+            'total_ms': round(total * 1000, 1),
+            'sql_ms': round(profile.sql_time * 1000, 1),
+            'query_count': profile.query_count,
+            'template_ms': round(profile.template_time * 1000, 1),
+            'sections_ms': {name: round(d * 1000, 1) for name, d in profile.sections.items()},
+            'slowest_statements': profile.slowest_statements(self.app.config['PROFILER_TOP_STATEMENTS']),
+        }
+        self.recent_slow.append(entry)
+        self.slow_log.info(json.dumps(entry))
+
+    def read_slow_requests(self, limit=50):
+        """Return the newest slow requests from the shared log, newest first"""
+        path = self.app.config['SLOW_REQUEST_LOG']
+        try:
+            with open(path) as f:
+                lines = deque(f, maxlen=limit)
+        except OSError:
+            # Fall back to what this worker has seen
+            return list(reversed(self.recent_slow))[:limit]
+
+        entries = []
+        for line in reversed(lines):
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+        return entries
+
+
+def current_profile():
+    """Return the RequestProfile of the active request, if any"""
+    if not has_request_context():
+        return None
+    return g.get('request_profile')
+
+
+@contextmanager
+def profile_section(name):
+    """Time a block of code and attribute it to the current request"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile = current_profile()
+        if profile is not None:
+            profile.add_section(name, time.perf_counter() - started)
+
+
+def _statement_started(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('profiler_starts', []).append(time.perf_counter())
+
+
+def _statement_finished(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get('profiler_starts')
+    if not starts:
+        return
+    duration = time.perf_counter() - starts.pop()
+    profile = current_profile()
+    if profile is not None:
+        profile.add_statement(statement, duration)
+
+
+def _statement_failed(exception_context):
+    # A failed statement never reaches after_cursor_execute
+    connection = exception_context.connection
+    starts = connection.info.get('profiler_starts') if connection is not None else None
+    if starts:
+        starts.pop()
@@ -0,0 +1,84 @@
+"""
+Idempotent seeding for ArtAI's default data
+
+The initialize_* functions describe their default rows as lists of dicts.
+SeedEngine skips a seed entirely when its content hash matches the version
+recorded by the last run; otherwise it loads the existing natural keys of
+the table in one query and inserts all missing rows in one executemany
+statement, instead of a SELECT per row on every app start.
+"""
+
+import hashlib
+import json
+from datetime import datetime
+
+from sqlalchemy import insert, select
+
+
+def seed_digest(rows):
+    """Stable content hash of a seed definition"""
+    payload = json.dumps(rows, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(payload).hexdigest()
+
+
+class SeedEngine:
+    """Insert missing seed rows in bulk and remember which seed versions are applied"""
+
+    def __init__(self, db, version_model):
+        self.db = db
+        self.version_model = version_model
+
+    def is_current(self, name, rows):
+        """True if this exact seed definition was already applied"""
+        version = self.db.session.get(self.version_model, name)
+        return version is not None and version.digest == seed_digest(rows)
+
+    def mark_current(self, name, rows):
+        """Record the applied seed version; committed with the caller's transaction"""
+        version = self.db.session.get(self.version_model, name)
+        if version is None:
+            version = self.version_model(name=name)
+            self.db.session.add(version)
+        version.digest = seed_digest(rows)
+        version.applied_at = datetime.utcnow()
+
+    def existing_keys(self, model, key):
+        """All values of the natural-key column, in one query"""
+        return set(self.db.session.scalars(select(getattr(model, key))))
+
+    def insert_missing(self, model, key, rows):
+        """Insert rows whose key is not in the table yet; returns {key: id} of the inserted rows"""
+        existing = self.existing_keys(model, key)
+        missing = [row for row in rows if row[key] not in existing]
+        if not missing:
+            return {}
+
+        ids = self.insert_rows(model, missing)
+        return {row[key]: row_id for row, row_id in zip(missing, ids)}
+
+    def insert_rows(self, model, rows):
+        """Insert all rows in one executemany statement; returns their ids in order"""
+        statement = insert(model).returning(model.id, sort_by_parameter_order=True)
+        return list(self.db.session.scalars(statement, complete_rows(model, rows)))
+
+
+def complete_rows(model, rows):
+    """Give every row the same columns, as executemany requires
+
+    Columns a row leaves out get the column's Python default, the value the
+    ORM would have used for that row.
+    """
+    columns = set().union(*rows)
+    completed = []
+    for row in rows:
+        row = dict(row)
+        for name in columns - row.keys():
+            default = model.__table__.c[name].default
+            if default is None:
+                row[name] = None
+            elif default.is_callable:
+                row[name] = default.arg(None)
+            else:
+                row[name] = default.arg
+        completed.append(row)
+    return completed
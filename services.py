@@ -0,0 +1,142 @@
+"""
+User stats, achievements, notifications and the activity feed, shared by the blueprints
+"""
+
+from datetime import datetime, timedelta
+
+from extensions import db
+from models import (
+    User, Artwork, ForumPost, Notification, ActivityFeed, Achievement, UserAchievement, ArtBattle, UserStats
+)
+
+
+# Achievement and stats functions
+def update_user_stats(user_id, action_type, value=1):
+    """Update user statistics"""
+    stats = UserStats.query.filter_by(user_id=user_id).first()
+    if not stats:
+        stats = UserStats(user_id=user_id)
+        db.session.add(stats)
+    
+    # Ensure all stats values are not None before adding
+    if action_type == 'artwork_uploaded':
+        stats.total_artworks = (stats.total_artworks or 0) + value
+    elif action_type == 'likes_received':
+        stats.total_likes_received = (stats.total_likes_received or 0) + value
+    elif action_type == 'comment_made':
+        stats.total_comments_made = (stats.total_comments_made or 0) + value
+    elif action_type == 'battle_won':
+        stats.battles_won = (stats.battles_won or 0) + value
+    elif action_type == 'battle_participated':
+        stats.battles_participated = (stats.battles_participated or 0) + value
+    elif action_type == 'challenge_completed':
+        stats.challenges_completed = (stats.challenges_completed or 0) + value
+    
+    # Update streak
+    today = datetime.utcnow().date()
+    if stats.last_activity_date != today:
+        if stats.last_activity_date == today - timedelta(days=1):
+            stats.daily_streak = (stats.daily_streak or 0) + 1
+        else:
+            stats.daily_streak = 1
+        stats.last_activity_date = today
+        
+        # Update longest streak if needed
+        if stats.daily_streak > (stats.longest_streak or 0):
+            stats.longest_streak = stats.daily_streak
+    
+    db.session.commit()
+
+def check_achievements(user_id):
+    """Check and award achievements for user"""
+    user = User.query.get(user_id)
+    stats = UserStats.query.filter_by(user_id=user_id).first()
+    if not stats:
+        return
+    
+    achievements = Achievement.query.filter_by(is_active=True).all()
+    
+    for achievement in achievements:
+        # Check if user already has this achievement
+        existing = UserAchievement.query.filter_by(
+            user_id=user_id, 
+            achievement_id=achievement.id
+        ).first()
+        
+        if existing:
+            continue
+        
+        # Check if user meets requirements
+        earned = False
+        if achievement.requirement_type == 'artworks_count':
+            earned = stats.total_artworks >= achievement.requirement_value
+        elif achievement.requirement_type == 'streak':
+            earned = stats.daily_streak >= achievement.requirement_value
+        elif achievement.requirement_type == 'likes':
+            earned = stats.total_likes_received >= achievement.requirement_value
+        elif achievement.requirement_type == 'battles_participated':
+            earned = stats.battles_participated >= achievement.requirement_value
+        elif achievement.requirement_type == 'battles_won':
+            earned = stats.battles_won >= achievement.requirement_value
+        
+        if earned:
+            # Award achievement
+            user_achievement = UserAchievement(
+                user_id=user_id,
+                achievement_id=achievement.id
+            )
+            db.session.add(user_achievement)
+            
+            # Award experience points
+            user.experience += achievement.points
+            db.session.commit()
+            
+            print(f"🏆 User {user.username} earned achievement: {achievement.name}")
+
+def create_notification(user_id, type, title, message, url=None, related_user_id=None, related_post_id=None, related_artwork_id=None):
+    """Create a notification for a user"""
+    notification = Notification(
+        user_id=user_id,
+        type=type,
+        title=title,
+        message=message,
+        url=url,
+        related_user_id=related_user_id,
+        related_post_id=related_post_id,
+        related_artwork_id=related_artwork_id
+    )
+    db.session.add(notification)
+    db.session.flush()  # Get the ID without committing
+    return notification
+
+def create_activity(user_id, action_type, target_type=None, target_id=None, message=None):
+    """Create an activity feed entry"""
+    if not message:
+        user = User.query.get(user_id)
+        if action_type == 'upload' and target_type == 'artwork':
+            artwork = Artwork.query.get(target_id)
+            message = f"{user.username} uploaded a new artwork: {artwork.title}"
+        elif action_type == 'like' and target_type == 'artwork':
+            artwork = Artwork.query.get(target_id)
+            message = f"{user.username} liked {artwork.artist.username}'s artwork"
+        elif action_type == 'comment' and target_type == 'post':
+            post = ForumPost.query.get(target_id)
+            message = f"{user.username} commented on {post.title}"
+        elif action_type == 'follow' and target_type == 'user':
+            followed_user = User.query.get(target_id)
+            message = f"{user.username} started following {followed_user.username}"
+        elif action_type == 'battle_join':
+            battle = ArtBattle.query.get(target_id)
+            message = f"{user.username} joined the {battle.title} battle"
+        else:
+            message = f"{user.username} performed {action_type}"
+    
+    activity = ActivityFeed(
+        user_id=user_id,
+        action_type=action_type,
+        target_type=target_type,
+        target_id=target_id,
+        message=message
+    )
+    db.session.add(activity)
+    return activity
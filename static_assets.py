@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Static asset fingerprinting for ArtAI
+
+Adds a content hash to every url_for('static', ...) URL so browsers and
+nginx can cache static files and uploads forever, and provides the build
+step that writes the asset manifest and the nginx snippets used by deploy.sh.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from stat import S_ISREG
+
+from flask import current_app, request
+
+from metrics import record_cache_lookup
+
+MANIFEST_NAME = 'manifest.json'
+HASH_LENGTH = 12
+ONE_YEAR = 365 * 24 * 60 * 60
+# Uploads are stored under the SHA-256 of their content (image_ingest.py)
+CONTENT_ADDRESSED = re.compile(r'uploads/([0-9a-f]{64})\.\w+')
+
+NGINX_MAP_TEMPLATE = """# Generated by static_assets.py - do not edit by hand
+# Fingerprinted URLs (?v=<hash>) never change, everything else is revalidated hourly.
+map $arg_v $artai_static_cache_control {{
+    ""      "public, max-age=3600";
+    default "public, max-age={max_age}, immutable";
+}}
+"""
+
+NGINX_LOCATION_TEMPLATE = """# Generated by static_assets.py - do not edit by hand
+# Static files and uploads are served by nginx and never reach gunicorn.
+location /static/ {{
+    alias {static_root}/;
+    access_log off;
+    sendfile on;
+    tcp_nopush on;
+    open_file_cache max=10000 inactive=60s;
+    open_file_cache_valid 120s;
+    add_header Cache-Control $artai_static_cache_control;
+}}
+"""
+
+
+def file_digest(path):
+    """Return the short content hash of a file"""
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b''):
+            sha.update(chunk)
+    return sha.hexdigest()[:HASH_LENGTH]
+
+
+def build_manifest(static_folder):
+    """Hash every file below the static folder"""
+    assets = {}
+    for root, _, files in os.walk(static_folder):
+        for name in files:
+            if name == MANIFEST_NAME or name.startswith('.'):
+                continue
+            path = os.path.join(root, name)
+            rel_path = os.path.relpath(path, static_folder).replace(os.sep, '/')
+            assets[rel_path] = file_digest(path)
+    return {'version': 1, 'assets': dict(sorted(assets.items()))}
+
+
+def render_nginx_snippets(static_root, max_age=ONE_YEAR):
+    """Return the (http-level map, server-level location) nginx snippets"""
+    static_root = os.path.abspath(static_root).rstrip('/')
+    return (NGINX_MAP_TEMPLATE.format(max_age=max_age),
+            NGINX_LOCATION_TEMPLATE.format(static_root=static_root))
+
+
+class StaticAssets:
+    """Flask extension that fingerprints static URLs and sets cache headers"""
+
+    def __init__(self, app=None):
+        self.static_folder = None
+        self.manifest = {}
+        self.max_age = ONE_YEAR
+        self.runtime_cache_size = 4096
+        # path -> ((mtime, size), hash) of files hashed at runtime, least recently used first
+        self._runtime_hashes = OrderedDict()
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('ASSET_MANIFEST', os.path.join(app.static_folder, MANIFEST_NAME))
+        app.config.setdefault('ASSET_MAX_AGE', ONE_YEAR)
+        # Files outside the manifest whose hashes are kept (uploads, renders)
+        app.config.setdefault('ASSET_RUNTIME_CACHE_SIZE', 4096)
+
+        self.static_folder = app.static_folder
+        self.max_age = app.config['ASSET_MAX_AGE']
+        self.runtime_cache_size = app.config['ASSET_RUNTIME_CACHE_SIZE']
+        self.manifest = self._load_manifest(app.config['ASSET_MANIFEST'])
+
+        app.url_defaults(self._add_fingerprint)
+        app.after_request(self._set_cache_headers)
+        app.extensions['static_assets'] = self
+
+    def _load_manifest(self, manifest_path):
+        try:
+            with open(manifest_path) as f:
+                return json.load(f).get('assets', {})
+        except (OSError, ValueError):
+            return {}
+
+    def fingerprint(self, filename):
+        """Return the content hash for a static file, or None if it isn't a file"""
+        # In debug mode files change under us, so always hash from disk
+        if filename in self.manifest and not current_app.debug:
+            return self.manifest[filename]
+
+        # The name of a content-addressed upload already is its hash
+        content_addressed = CONTENT_ADDRESSED.fullmatch(filename)
+        if content_addressed:
+            return content_addressed.group(1)[:HASH_LENGTH]
+
+        # Uploads and derived images appear after the build step, so hash them
+        # on first use and keep the result until the file changes on disk or
+        # is one of the least recently used past runtime_cache_size.
+        path = os.path.join(self.static_folder, filename)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if not S_ISREG(stat.st_mode):
+            return None
+
+        key = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._runtime_hashes.get(path)
+            hit = bool(cached and cached[0] == key)
+            if hit:
+                self._runtime_hashes.move_to_end(path)
+        record_cache_lookup('static_fingerprint', hit)
+        if hit:
+            return cached[1]
+
+        digest = file_digest(path)
+        with self._lock:
+            self._runtime_hashes[path] = (key, digest)
+            self._runtime_hashes.move_to_end(path)
+            while len(self._runtime_hashes) > self.runtime_cache_size:
+                self._runtime_hashes.popitem(last=False)
+        return digest
+
+    def _add_fingerprint(self, endpoint, values):
+        if endpoint != 'static' or 'v' in values or not values.get('filename'):
+            return
+        digest = self.fingerprint(values['filename'])
+        if digest:
+            values['v'] = digest
+
+    def _set_cache_headers(self, response):
+        if request.endpoint != 'static' or response.status_code != 200:
+            return response
+
+        version = request.args.get('v')
+        filename = (request.view_args or {}).get('filename')
+        if version and filename and version == self.fingerprint(filename):
+            response.cache_control.no_cache = None
+            response.cache_control.public = True
+            response.cache_control.max_age = self.max_age
+            response.cache_control.immutable = True
+        return response
+
+
+def main():
+    """Build the asset manifest and nginx snippets"""
+    parser = argparse.ArgumentParser(description='ArtAI static asset build')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build = subparsers.add_parser('build', help='fingerprint static files and write nginx snippets')
+    build.add_argument('--static-folder', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static'))
+    build.add_argument('--static-root', help='path nginx serves static files from (defaults to --static-folder)')
+    build.add_argument('--nginx-map', help='write the http-level cache map snippet here')
+    build.add_argument('--nginx-location', help='write the server-level /static location snippet here')
+    args = parser.parse_args()
+
+    manifest = build_manifest(args.static_folder)
+    manifest_path = os.path.join(args.static_folder, MANIFEST_NAME)
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    print(f"✅ Fingerprinted {len(manifest['assets'])} static files -> {manifest_path}")
+
+    nginx_map, nginx_location = render_nginx_snippets(args.static_root or args.static_folder)
+    for path, content in ((args.nginx_map, nginx_map), (args.nginx_location, nginx_location)):
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(path, 'w') as f:
+                f.write(content)
+            print(f"✅ Wrote nginx snippet {path}")
+
+
+if __name__ == '__main__':
+    main()
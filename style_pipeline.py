@@ -0,0 +1,506 @@
+#!/usr/bin/env python3
+"""
+Runs the stage pipelines declared in styles.py
+
+Before a pipeline first runs, it is compiled once:
+- Adjacent HSV adjustments (saturate, brighten, lighten, shift_hue) are
+  merged into one stage with a single BGR->HSV->BGR round trip, and
+  compiled into a 256-entry table per channel applied with cv2.LUT.
+- The stages are split into segments. Whole-image stages (CLAHE, k-means,
+  the Dali wave) each form their own segment. So does the end of a
+  cached stage, and any output a later segment reads. A segment of local
+  stages runs over strips of the image (see image_tiles). Its halo is the
+  sum of its stages' radii, so it renders exactly as in one piece.
+
+Intermediate arrays come from the analyzer's BufferPool. Outputs of
+stages marked cache=True (the bilateral pre-pass Picasso and anime share)
+are kept in a StageCache keyed by the input image and the chain of
+stages that produced them. Pass a dict as `timings` to render() to get
+the seconds spent in each stage.
+
+    python style_pipeline.py path/to/image.jpg --style picasso anime
+"""
+
+import argparse
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+from image_buffers import BufferPool
+from image_tiles import map_strips, strip_rows
+from styles import REDRAW, STYLES
+
+# Color quantization fits its k-means centers on an evenly spread sample of this many pixels
+QUANTIZE_SAMPLE_PIXELS = 20000
+QUANTIZE_ATTEMPTS = 3
+# Seed for k-means' initial centers, so an image is always quantized the same way
+QUANTIZE_SEED = 0x5EED
+# Pixels assigned to centers at a time; bounds the float32 pixels and distances to about 1.5 MB
+# (with 8 centers) whatever the size of the image, outside the scratch budget of image_tiles
+QUANTIZE_CHUNK_PIXELS = 32 * 1024
+COLOR_SPACES = {'hsv': (cv2.COLOR_BGR2HSV, cv2.COLOR_HSV2BGR)}
+# Vignette masks are kept per image size, up to this many bytes
+VIGNETTE_CACHE_BYTES = 64 * 1024 * 1024
+# Fixed-point vignette masks: precision -> (dtype, value of a weight of 1)
+FIXED_POINT = {'uint8': (np.uint8, 255), 'uint16': (np.uint16, 65535)}
+
+logger = logging.getLogger(__name__)
+
+# Operation name -> {'run', 'kind', 'radius'}; kind is 'local' (works on
+# strips), 'global' (needs the whole image, returns an image), 'data'
+# (needs the whole image, returns something else) or a color space name
+# (adjusts an image already converted to that space, in place; each output
+# channel value must depend only on the same channel's input value, so
+# adjacent adjustments can be compiled into one lookup table)
+OPERATIONS = {}
+
+
+def operation(name, kind='local', radius=0):
+    """Register a stage operation; radius is the rows of context it reads around a pixel, or a function of its params"""
+    def register(run):
+        OPERATIONS[name] = {'run': run, 'kind': kind, 'radius': radius}
+        return run
+    return register
+
+
+@operation('gaussian_blur', radius=lambda params: params['size'] // 2)
+def gaussian_blur(ctx, image, size):
+    return cv2.GaussianBlur(image, (size, size), 0, dst=ctx.out(image.shape))
+
+
+@operation('bilateral', radius=lambda params: params['diameter'] // 2 * params.get('passes', 1))
+def bilateral(ctx, image, diameter, sigma, passes=1):
+    # The filter can't run in place, so passes alternate between two buffers
+    for index in range(passes):
+        dst = ctx.out(image.shape) if index == passes - 1 else ctx.scratch(f'pass{index % 2}', image.shape)
+        image = cv2.bilateralFilter(image, diameter, sigma, sigma, dst=dst)
+    return image
+
+
+@operation('edge_mask', radius=lambda params: params['block'] // 2)
+def edge_mask(ctx, image, block, offset):
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY, dst=ctx.scratch('gray', image.shape[:2]))
+    gray = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_MEAN_C, cv2.THRESH_BINARY, block, offset, dst=gray)
+    return cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR, dst=ctx.out(image.shape))
+
+
+@operation('mask')
+def mask(ctx, image, edges):
+    return cv2.bitwise_and(image, edges, dst=ctx.out(image.shape))
+
+
+@operation('blend')
+def blend(ctx, first, second, weights):
+    return cv2.addWeighted(first, weights[0], second, weights[1], 0, dst=ctx.out(first.shape))
+
+
+@operation('sharpen', radius=lambda params: len(params['kernel']) // 2)
+def sharpen(ctx, image, kernel):
+    return cv2.filter2D(image, -1, np.array(kernel), dst=ctx.out(image.shape))
+
+
+@operation('pencil_sketch', radius=lambda params: params['blur'] // 2)
+def pencil_sketch(ctx, image, blur):
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY, dst=ctx.scratch('gray', image.shape[:2]))
+    inverted = cv2.bitwise_not(gray, dst=ctx.scratch('inverted', image.shape[:2]))
+    blurred = cv2.GaussianBlur(inverted, (blur, blur), 0, dst=ctx.scratch('blurred', image.shape[:2]))
+    # Dodge: divide the image by its inverted blur
+    denominator = cv2.bitwise_not(blurred, dst=blurred)
+    sketch = cv2.divide(gray, denominator, scale=256, dst=denominator)
+    return cv2.cvtColor(sketch, cv2.COLOR_GRAY2BGR, dst=ctx.out(image.shape))
+
+
+@operation('lightness')
+def lightness(ctx, image):
+    lab = cv2.cvtColor(image, cv2.COLOR_BGR2LAB, dst=ctx.scratch('lab', image.shape))
+    return cv2.extractChannel(lab, 0, dst=ctx.out(image.shape[:2]))
+
+
+@operation('clahe', kind='global')
+def clahe(ctx, plane, clip_limit, grid):
+    # CLAHE's tiles span the whole image, so it can't run on strips
+    equalizer = cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=(grid, grid))
+    return equalizer.apply(plane, dst=ctx.out(plane.shape))
+
+
+@operation('replace_lightness')
+def replace_lightness(ctx, image, plane):
+    lab = cv2.cvtColor(image, cv2.COLOR_BGR2LAB, dst=ctx.scratch('lab', image.shape))
+    lab[:, :, 0] = plane
+    return cv2.cvtColor(lab, cv2.COLOR_LAB2BGR, dst=ctx.out(image.shape))
+
+
+@operation('vignette')
+def vignette(ctx, image, precision='float'):
+    mask, _ = VIGNETTE_MASKS.get_or_compute((ctx.shape[:2], precision),
+                                            lambda: vignette_mask(ctx.shape[:2], precision))
+    mask = mask[ctx.top:ctx.top + len(image)]
+    if precision == 'float':
+        # The float64 products are truncated to uint8 as they are written, no float copy of the image
+        result = ctx.out(image.shape)
+        if result is None:
+            result = np.empty_like(image)
+        return np.multiply(image, mask[:, :, None], out=result, casting='unsafe')
+    return cv2.multiply(image, mask, scale=1 / FIXED_POINT[precision][1], dtype=cv2.CV_8U, dst=ctx.out(image.shape))
+
+
+@operation('wave_distort', kind='global')
+def wave_distort(ctx, image, amplitude, wavelength):
+    # The maps hold absolute source coordinates, so the wave is drawn on the whole image
+    rows, cols = image.shape[:2]
+    map_x = np.zeros((rows, cols), dtype=np.float32)
+    map_y = np.zeros((rows, cols), dtype=np.float32)
+
+    for i in range(rows):
+        for j in range(cols):
+            map_x[i, j] = j + amplitude * np.sin(i / wavelength)
+            map_y[i, j] = i + amplitude * np.cos(j / wavelength)
+
+    return cv2.remap(image, map_x, map_y, cv2.INTER_LINEAR, dst=ctx.out(image.shape))
+
+
+@operation('cluster_colors', kind='data')
+def cluster_colors_stage(ctx, image, clusters):
+    return cluster_colors(image, clusters)
+
+
+@operation('quantize')
+def quantize(ctx, image, centers):
+    # Every pixel takes the color of its nearest center, a chunk of pixels at a time
+    flat = image.reshape((-1, 3))
+    quantized = ctx.out(flat.shape)
+    if quantized is None:
+        quantized = np.empty(flat.shape, np.uint8)
+    colors = np.uint8(centers)
+    chunk = min(len(flat), QUANTIZE_CHUNK_PIXELS)
+    pixels = ctx.scratch('pixels', (chunk, 3), np.float32)
+    scores = ctx.scratch('scores', (chunk, len(centers)), np.float32)
+    for start in range(0, len(flat), chunk):
+        count = min(chunk, len(flat) - start)
+        pixels[:count] = flat[start:start + count]
+        labels = nearest_center(pixels[:count], centers, scores[:count])
+        np.take(colors, labels, axis=0, out=quantized[start:start + count])
+    return quantized.reshape(image.shape)
+
+
+@operation('saturate', kind='hsv')
+def saturate(hsv, factor):
+    cv2.multiply(hsv, (1, factor, 1, 0), dst=hsv)
+
+
+@operation('brighten', kind='hsv')
+def brighten(hsv, factor):
+    cv2.multiply(hsv, (1, 1, factor, 0), dst=hsv)
+
+
+@operation('lighten', kind='hsv')
+def lighten(hsv, amount):
+    cv2.add(hsv, (0, 0, amount, 0), dst=hsv)
+
+
+@operation('shift_hue', kind='hsv')
+def shift_hue(hsv, amount):
+    cv2.add(hsv, (amount, 0, 0, 0), dst=hsv)
+
+
+def cluster_colors(image, clusters):
+    """k-means color centers (float32 BGR) of an image, fitted on a sample of its pixels; the same on every call"""
+    # An evenly spread sample finds the same colors as every pixel, in milliseconds instead of seconds.
+    # It is a grid over rows and columns: a stride over the flattened pixels can land on a few columns.
+    rows, cols = image.shape[:2]
+    step = max(1, int(np.sqrt(rows * cols / QUANTIZE_SAMPLE_PIXELS)))
+    data = np.float32(image[step // 2::step, step // 2::step].reshape((-1, 3)))
+    criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 8, 1.0)
+    cv2.setRNGSeed(QUANTIZE_SEED)
+    _, _, centers = cv2.kmeans(data, clusters, None, criteria, QUANTIZE_ATTEMPTS, cv2.KMEANS_PP_CENTERS)
+    return centers
+
+
+def vignette_mask(shape, precision='float'):
+    """Vignette weights for an image size: a Gaussian across the rows times one across the columns, peaking at 1
+
+    'float' gives float64 weights of shape (rows, cols). 'uint8' and
+    'uint16' give fixed-point weights repeated for each of the 3 channels,
+    which OpenCV multiplies with a BGR image in one call (rounding the
+    result, where the float weights truncate it, so pixels can differ by 1).
+    """
+    rows, cols = shape
+    kernel_x = cv2.getGaussianKernel(cols, cols/4)
+    kernel_y = cv2.getGaussianKernel(rows, rows/4)
+    mask = kernel_y * kernel_x.T
+    mask /= kernel_y.max() * kernel_x.max()
+    if precision == 'float':
+        return mask
+    dtype, scale = FIXED_POINT[precision]
+    return cv2.merge([np.round(mask * scale).astype(dtype)] * 3)
+
+
+def nearest_center(pixels, centers, scores=None):
+    """Index of the closest center for each row of a float32 (N, 3) pixel array"""
+    # |p - c|^2 = |p|^2 - 2 p.c + |c|^2, and |p|^2 is the same for every center
+    scores = np.matmul(pixels, -2 * centers.T, out=scores)
+    scores += np.square(centers).sum(axis=1)
+    return scores.argmin(axis=1)
+
+
+class StageContext:
+    """What an operation gets besides its inputs: buffers, and where its strip lies in the image"""
+
+    def __init__(self, pool, prefix, shape, top, fresh):
+        self.pool = pool
+        self.prefix = prefix
+        self.shape = shape
+        self.top = top
+        self.fresh = fresh
+
+    def scratch(self, name, shape, dtype=np.uint8):
+        """A pooled array for a temporary result"""
+        return self.pool.get(f'{self.prefix}.{name}', shape, dtype)
+
+    def out(self, shape, dtype=np.uint8):
+        """Destination for the stage's output: pooled, or None (let OpenCV allocate) if it outlives the render"""
+        return None if self.fresh else self.pool.get(f'{self.prefix}.out', shape, dtype)
+
+
+class StageCache:
+    """Outputs of expensive stages, shared by a process's threads, dropped least recently used first"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.pending = {}
+        self.lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        """Return (value, hit); a thread asking for a value another thread is computing waits for it"""
+        while True:
+            with self.lock:
+                if key in self.entries:
+                    self.entries.move_to_end(key)
+                    return self.entries[key], True
+                waiting = self.pending.get(key)
+                if waiting is None:
+                    self.pending[key] = threading.Event()
+                    break
+            waiting.wait()
+
+        try:
+            value = compute()
+            # Later stages read the cached array, none may change it
+            value.flags.writeable = False
+            with self.lock:
+                if value.nbytes <= self.capacity:
+                    self.entries[key] = value
+                    total = sum(entry.nbytes for entry in self.entries.values())
+                    while total > self.capacity:
+                        total -= self.entries.popitem(last=False)[1].nbytes
+            return value, False
+        finally:
+            with self.lock:
+                self.pending.pop(key).set()
+
+
+# Shared by every pipeline in the process; the masks only depend on the image size
+VIGNETTE_MASKS = StageCache(VIGNETTE_CACHE_BYTES)
+
+
+class StylePipelines:
+    """Renders the styles and the redraw chain declared in styles.py"""
+
+    def __init__(self, memory_budget, buffers=None, cache=None, color_tables=True):
+        self.memory_budget = memory_budget
+        self.buffers = buffers if buffers is not None else BufferPool(memory_budget)
+        self.cache = cache if cache is not None else StageCache(memory_budget // 4)
+        self.pipelines = {style['id']: style['stages'] for style in STYLES}
+        self.pipelines['redraw'] = REDRAW
+        self.plans = {name: compile_pipeline(stages, color_tables) for name, stages in self.pipelines.items()}
+
+    def render(self, image, name, timings=None):
+        """Render pipeline `name` on a BGR image; fills `timings` with seconds per stage if given"""
+        timings = {} if timings is None else timings
+        values = {'image': image}
+        planes = {'image'}
+        signatures = {}
+        result = self.plans[name][-1]['steps'][-1]['output']
+
+        for index, segment in enumerate(self.plans[name]):
+            last = segment['steps'][-1]
+            if last['cache']:
+                key = self._signature(last['output'], self.pipelines[name], values, signatures)
+                value, hit = self.cache.get_or_compute(
+                    key, lambda: self._run_segment(segment, index, values, planes, image.shape, True, timings))
+                if hit:
+                    timings[f"{last['output']} (cached)"] = 0.0
+            else:
+                value = self._run_segment(segment, index, values, planes, image.shape,
+                                          last['output'] == result, timings)
+            values[last['output']] = value
+            if last['kind'] != 'data':
+                planes.add(last['output'])
+
+        logger.debug('%s rendered: %s', name, ', '.join(f'{stage} {seconds * 1000:.1f} ms'
+                                                       for stage, seconds in timings.items()))
+        return values[result]
+
+    def _run_segment(self, segment, index, values, planes, shape, fresh, timings):
+        steps = segment['steps']
+        if steps[0]['kind'] != 'local':
+            step = steps[0]
+            ctx = StageContext(self.buffers, f'{index}.0', shape, 0, fresh)
+            started = time.perf_counter()
+            value = step['run'](ctx, *(values[name] for name in step['inputs']), **step['params'])
+            timings[step['name']] = timings.get(step['name'], 0.0) + time.perf_counter() - started
+            return value
+
+        inputs = segment['inputs']
+        primary = values[next(name for name in inputs if name in planes)]
+
+        def chain(part, top):
+            local = {name: values[name][top:top + len(part)] if name in planes else values[name] for name in inputs}
+            for position, step in enumerate(steps):
+                ctx = StageContext(self.buffers, f'{index}.{position}', shape, top,
+                                   fresh and step is steps[-1])
+                started = time.perf_counter()
+                local[step['output']] = step['run'](ctx, *(local[name] for name in step['inputs']), **step['params'])
+                timings[step['name']] = timings.get(step['name'], 0.0) + time.perf_counter() - started
+            return local[steps[-1]['output']]
+
+        rows = strip_rows(primary.shape, self.memory_budget, segment['halo'])
+        return map_strips(primary, chain, segment['halo'], rows)
+
+    def _signature(self, name, stages, values, signatures):
+        """Cache key of a value: the input image's digest and every stage that led to it"""
+        if name not in signatures:
+            if name == 'image':
+                image = np.ascontiguousarray(values['image'])
+                signatures[name] = ('image', image.shape, hashlib.blake2b(image.data, digest_size=16).hexdigest())
+            else:
+                stage = next(stage for stage in stages if stage['output'] == name)
+                signatures[name] = (stage['operation'], tuple(sorted(stage['params'].items())),
+                                    tuple(self._signature(source, stages, values, signatures)
+                                          for source in stage['inputs']))
+        return signatures[name]
+
+
+def compile_pipeline(stages, color_tables=True):
+    """Merge adjacent color-space adjustments and split the stages into segments
+
+    With color_tables, each run of merged adjustments is compiled into a
+    lookup table applied with one cv2.LUT call.
+    """
+    steps = []
+    for stage in stages:
+        spec = OPERATIONS[stage['operation']]
+        kind = spec['kind']
+        previous = steps[-1] if steps else None
+        if kind in COLOR_SPACES:
+            if (previous is not None and previous.get('space') == kind and stage['inputs'] == (previous['output'],)
+                    and not previous['cache']
+                    and [other for other in stages if previous['output'] in other['inputs']] == [stage]):
+                # Adjust the previous stage's color-space image instead of converting back and forth
+                previous['adjustments'].append((spec['run'], stage['params']))
+                previous['output'] = stage['output']
+                previous['name'] += '+' + stage['output']
+                previous['cache'] = stage['cache']
+                continue
+            steps.append({'output': stage['output'], 'name': stage['output'], 'inputs': stage['inputs'],
+                          'params': {}, 'kind': 'local', 'space': kind, 'radius': 0, 'cache': stage['cache'],
+                          'adjustments': [(spec['run'], stage['params'])]})
+            continue
+        radius = spec['radius'](stage['params']) if callable(spec['radius']) else spec['radius']
+        steps.append({'output': stage['output'], 'name': stage['output'], 'inputs': stage['inputs'],
+                      'params': stage['params'], 'kind': kind, 'radius': radius, 'cache': stage['cache'],
+                      'run': spec['run']})
+
+    for step in steps:
+        if 'space' in step:
+            step['run'] = color_adjustment(step, color_tables)
+
+    # Segment boundaries: around whole-image stages, after cached stages, and
+    # after any output read by a later segment (which needs it whole)
+    ends = {len(steps) - 1}
+    for position, step in enumerate(steps):
+        if step['kind'] != 'local':
+            ends.update({position - 1, position})
+        elif step['cache']:
+            ends.add(position)
+    changed = True
+    while changed:
+        changed = False
+        for position, step in enumerate(steps):
+            end = min(end for end in ends if end >= position)
+            later = [steps.index(other) for other in steps if step['output'] in other['inputs']]
+            if any(consumer > end for consumer in later) and position not in ends:
+                ends.add(position)
+                changed = True
+
+    segments, start = [], 0
+    for end in sorted(ends):
+        if end < start:
+            continue
+        part = steps[start:end + 1]
+        produced = {step['output'] for step in part}
+        inputs = []
+        for step in part:
+            inputs += [name for name in step['inputs'] if name not in produced and name not in inputs]
+        segments.append({'steps': part, 'inputs': inputs, 'halo': sum(step['radius'] for step in part)})
+        start = end + 1
+    return segments
+
+
+def color_adjustment(step, color_tables=True):
+    """Stage function for merged color-space adjustments: one conversion in, the adjustments, one conversion out"""
+    to_space, from_space = COLOR_SPACES[step['space']]
+    table = None
+    if color_tables:
+        # The adjustments map each channel value on its own, so running them
+        # over every possible value gives the table they amount to
+        table = np.repeat(np.arange(256, dtype=np.uint8), 3).reshape(256, 1, 3)
+        for adjust, params in step['adjustments']:
+            adjust(table, **params)
+
+    def run(ctx, image):
+        converted = cv2.cvtColor(image, to_space, dst=ctx.scratch(step['space'], image.shape))
+        if table is not None:
+            cv2.LUT(converted, table, dst=converted)
+        else:
+            for adjust, params in step['adjustments']:
+                adjust(converted, **params)
+        return cv2.cvtColor(converted, from_space, dst=ctx.out(image.shape))
+    return run
+
+
+def main():
+    """Print the time each stage of the chosen styles takes on an image"""
+    parser = argparse.ArgumentParser(description='Per-stage timings of the style pipelines')
+    parser.add_argument('image')
+    parser.add_argument('--style', nargs='+', help='styles to render, or "redraw" (default: all styles)')
+    parser.add_argument('--max-side', type=int, help='scale the image down first, like a preview')
+    parser.add_argument('--no-color-tables', action='store_true', help='apply HSV adjustments one by one, not as a table')
+    args = parser.parse_args()
+
+    from ai_analyzer import AIAnalyzer
+    analyzer = AIAnalyzer()
+    if args.no_color_tables:
+        analyzer.pipelines = StylePipelines(analyzer.memory_budget, analyzer.buffers, color_tables=False)
+    image = analyzer._load_image(args.image, args.max_side)
+    if image is None:
+        raise SystemExit(f"❌ Unable to load {args.image}")
+
+    print(f"🎨 {args.image}: {image.shape[1]}x{image.shape[0]}")
+    for name in args.style or list(analyzer.pipelines.pipelines):
+        timings = {}
+        started = time.perf_counter()
+        analyzer.pipelines.render(image, name, timings)
+        print(f"\n{name}: {(time.perf_counter() - started) * 1000:.1f} ms")
+        for stage, seconds in timings.items():
+            print(f"  {stage:<28} {seconds * 1000:>9.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Artistic styles and the redraw filter chain, declared as stage pipelines
+
+Each style is a list of stages. A stage names its output, the operation
+that produces it (see style_pipeline.OPERATIONS), the earlier outputs it
+reads ('image' is the input image) and the operation's parameters. The
+last stage's output is the rendered image. style_pipeline.StylePipelines
+runs them: it merges adjacent HSV adjustments into one color conversion,
+splits the work into strips around whole-image stages, caches stages
+marked cache=True and times every stage.
+
+This module only holds data, so the web workers can list the styles
+without importing OpenCV.
+"""
+
+SHARPEN = ((-1, -1, -1), (-1, 9, -1), (-1, -1, -1))
+SHARPEN_SOFT = ((0, -1, 0), (-1, 5, -1), (0, -1, 0))
+
+
+def stage(output, operation, *inputs, cache=False, **params):
+    """One pipeline stage: output = operation(*inputs, **params)"""
+    return {'output': output, 'operation': operation, 'inputs': inputs, 'params': params, 'cache': cache}
+
+
+STYLES = [
+    {'id': 'van_gogh', 'name': 'Van Gogh', 'description': 'Swirling brushstrokes and vivid colors',
+     'icon': 'fa-swatchbook text-warning', 'stages': [
+         stage('blurred', 'gaussian_blur', 'image', size=3),
+         stage('edges', 'edge_mask', 'blurred', block=7, offset=7),
+         stage('saturated', 'saturate', 'blurred', factor=1.3),
+         stage('enhanced', 'brighten', 'saturated', factor=1.1),
+         stage('strokes', 'mask', 'enhanced', 'edges'),
+         stage('result', 'blend', 'enhanced', 'strokes', weights=(0.8, 0.2)),
+     ]},
+    {'id': 'picasso', 'name': 'Picasso', 'description': 'Cubist geometric abstraction',
+     'icon': 'fa-shapes text-info', 'stages': [
+         stage('cartoon', 'bilateral', 'image', diameter=15, sigma=80, cache=True),
+         stage('colors', 'cluster_colors', 'cartoon', clusters=8),
+         stage('edges', 'edge_mask', 'cartoon', block=9, offset=9),
+         stage('quantized', 'quantize', 'cartoon', 'colors'),
+         stage('strokes', 'mask', 'quantized', 'edges'),
+         stage('result', 'blend', 'quantized', 'strokes', weights=(0.9, 0.1)),
+     ]},
+    {'id': 'monet', 'name': 'Monet', 'description': 'Soft impressionist lighting',
+     'icon': 'fa-cloud text-primary', 'stages': [
+         stage('soft', 'gaussian_blur', 'image', size=5),
+         stage('saturated', 'saturate', 'soft', factor=1.2),
+         stage('enhanced', 'lighten', 'saturated', amount=20),
+         stage('sharpened', 'sharpen', 'enhanced', kernel=SHARPEN),
+         stage('result', 'blend', 'enhanced', 'sharpened', weights=(0.7, 0.3)),
+     ]},
+    {'id': 'dali', 'name': 'Salvador Dalí', 'description': 'Surrealist dream-like distortions',
+     'icon': 'fa-eye text-danger', 'stages': [
+         stage('distorted', 'wave_distort', 'image', amplitude=10, wavelength=20.0),
+         stage('shifted', 'shift_hue', 'distorted', amount=20),
+         stage('result', 'saturate', 'shifted', factor=1.4),
+     ]},
+    {'id': 'watercolor', 'name': 'Watercolor', 'description': 'Soft watercolor painting effect',
+     'icon': 'fa-tint text-success', 'stages': [
+         stage('washed', 'bilateral', 'image', diameter=9, sigma=200, passes=3),
+         stage('edges', 'edge_mask', 'washed', block=7, offset=7),
+         stage('strokes', 'mask', 'washed', 'edges'),
+         stage('result', 'blend', 'washed', 'strokes', weights=(0.85, 0.15)),
+     ]},
+    {'id': 'oil_painting', 'name': 'Oil Painting', 'description': 'Rich oil painting texture',
+     'icon': 'fa-brush text-dark', 'stages': [
+         stage('smoothed', 'bilateral', 'image', diameter=9, sigma=100, passes=2),
+         stage('textured', 'sharpen', 'smoothed', kernel=SHARPEN_SOFT),
+         stage('result', 'blend', 'smoothed', 'textured', weights=(0.8, 0.2)),
+     ]},
+    {'id': 'sketch', 'name': 'Pencil Sketch', 'description': 'Classic pencil drawing style',
+     'icon': 'fa-pencil-alt text-secondary', 'stages': [
+         stage('result', 'pencil_sketch', 'image', blur=25),
+     ]},
+    {'id': 'anime', 'name': 'Anime Style', 'description': 'Japanese animation art style',
+     'icon': 'fa-star text-pink', 'stages': [
+         stage('cartoon', 'bilateral', 'image', diameter=15, sigma=80, cache=True),
+         stage('saturated', 'saturate', 'cartoon', factor=1.3),
+         stage('enhanced', 'brighten', 'saturated', factor=1.1),
+         stage('sharpened', 'sharpen', 'enhanced', kernel=SHARPEN),
+         stage('result', 'blend', 'enhanced', 'sharpened', weights=(0.7, 0.3)),
+     ]},
+]
+
+# AI Redraw: contrast, a painterly blur, saturation and a vignette
+REDRAW = [
+    stage('lightness', 'lightness', 'image'),
+    stage('equalized', 'clahe', 'lightness', clip_limit=2.0, grid=8),
+    stage('contrasted', 'replace_lightness', 'image', 'equalized'),
+    stage('blurred', 'gaussian_blur', 'contrasted', size=3),
+    stage('saturated', 'saturate', 'blurred', factor=1.2),
+    stage('result', 'vignette', 'saturated', precision='uint8'),
+]
+
+STYLE_IDS = [style['id'] for style in STYLES]
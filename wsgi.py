@@ -0,0 +1,60 @@
+"""
+Production entry point for gunicorn
+
+gunicorn.conf.py preloads this module in the master process. Everything
+built here - the app, its SQLAlchemy mappers, compiled templates and, for
+an image pool running OpenCV itself (no IMAGE_SERVICE_SOCKET), AIAnalyzer -
+is created once before fork and shared copy-on-write by every worker. The
+garbage collector is kept out of the way while warming up, and the warmed
+heap is frozen so that collections in the workers don't touch (and so
+copy) the shared pages.
+
+Each pool registers only the blueprints it serves (POOL_BLUEPRINTS); the
+image pool gets the upload and AI routes plus the account pages.
+ARTAI_BLUEPRINTS overrides the choice with a comma-separated list, or
+"all".
+"""
+
+import gc
+import os
+
+gc.disable()
+
+from sqlalchemy.orm import configure_mappers
+
+from application import create_app
+from extensions import ai_analyzer, ai_guide_generator
+
+POOL = os.environ.get('ARTAI_POOL', 'web')
+
+# None registers every blueprint
+POOL_BLUEPRINTS = {
+    'web': None,
+    'image': ['main', 'gallery', 'ai', 'battles'],
+}
+
+
+def pool_blueprints(pool):
+    """Blueprint names the pool registers, None for all of them"""
+    override = os.environ.get('ARTAI_BLUEPRINTS')
+    if override:
+        return None if override == 'all' else [name.strip() for name in override.split(',')]
+    return POOL_BLUEPRINTS[pool]
+
+
+def warm_up(flask_app, pool):
+    """Build the read-only state workers would otherwise each build on first use"""
+    configure_mappers()
+    for name in flask_app.jinja_env.list_templates(extensions=['html']):
+        flask_app.jinja_env.get_template(name)
+    ai_guide_generator.load()
+    # With an image service the OpenCV work happens there, not in gunicorn
+    if pool == 'image' and not flask_app.config['IMAGE_SERVICE_SOCKET']:
+        ai_analyzer.load()
+
+
+application = create_app(pool_blueprints(POOL))
+warm_up(application, POOL)
+
+gc.freeze()
+gc.enable()